@@ -64,7 +64,7 @@ def handle_login_api(request):
             db_user = db.get_user(email=user.email)
             if db_user is None:
                 logger.info("Creating new user from login: %s", user.email)
-                session_key = utils.md5(value=f"{user.email}{utils.now_us()}")
+                session_key = utils.new_session_key(email=user.email)
                 db.create_user(
                     name=user.get_full_name() or user.username,
                     email=user.email,
@@ -83,7 +83,7 @@ def handle_login_api(request):
         db_user = db.get_user(email=request.user.email)
         if db_user is None:
             logger.info("Creating new user: %s", request.user.email)
-            session_key = utils.md5(value=f"{request.user.email}{utils.now_us()}")
+            session_key = utils.new_session_key(email=request.user.email)
             db_user = db.create_user(
                 name=request.user.get_full_name(),
                 email=request.user.email,
@@ -110,7 +110,7 @@ def handle_development_login_api(request):
     )
     if db_user is None:
         logger.info("Creating new development user: %s", dev_email)
-        session_key = utils.md5(value=f"{dev_email}{utils.now_us()}")
+        session_key = utils.new_session_key(email=dev_email)
         db_user = db.create_user(
             name=dev_email, email=dev_email, session_key=session_key
         )
@@ -194,7 +194,7 @@ def handle_register_api(request):
         user = dj_User.objects.create_user(username=username, password=password, email=f"{username}@local")
         
         # Create database user
-        session_key = utils.md5(value=f"{user.email}{utils.now_us()}")
+        session_key = utils.new_session_key(email=user.email)
         db.create_user(name=username, email=user.email, session_key=session_key)
         
         logger.info("New user registered: %s", username)
@@ -13,6 +13,7 @@ import hashlib
 import os
 import re
 import time
+from functools import lru_cache
 from typing import Any, List, Optional, Union
 
 import pytz
@@ -22,7 +23,9 @@ from tools import settings
 # Constants
 TIMEZONE = "Asia/Seoul"
 MILLISECONDS_PER_SECOND = 1000
-MICROSECONDS_PER_SECOND = 1_000_000
+MILLISECONDS_PER_MINUTE = 60 * MILLISECONDS_PER_SECOND
+NANOSECONDS_PER_MILLISECOND = 1_000_000
+NANOSECONDS_PER_MICROSECOND = 1000
 DEFAULT_FILE_PERMISSIONS = 0o777
 NOT_AVAILABLE = "N/A"
 
@@ -60,7 +63,7 @@ def get_timestamp_ms() -> int:
     Returns:
         Current Unix timestamp in milliseconds.
     """
-    return int(round(time.time() * MILLISECONDS_PER_SECOND))
+    return time.time_ns() // NANOSECONDS_PER_MILLISECOND
 
 
 def calculate_day_number(join_timestamp: int) -> int:
@@ -102,8 +105,23 @@ def timestamp_to_readable_string(timestamp_ms: Optional[int]) -> str:
     if timestamp_ms is None or timestamp_ms == 0:
         return NOT_AVAILABLE
 
+    # the format has minute resolution, so timestamps are formatted per minute
+    return _minute_to_readable_string(timestamp_ms // MILLISECONDS_PER_MINUTE)
+
+
+@lru_cache(maxsize=2048)
+def _minute_to_readable_string(minute: int) -> str:
+    """
+    Format a minute since the epoch (see `timestamp_to_readable_string`).
+
+    Args:
+        minute: Minutes since the epoch.
+
+    Returns:
+        Formatted string like "12/25 (Mon), 03:30 PM".
+    """
     return datetime.datetime.fromtimestamp(
-        float(timestamp_ms) / MILLISECONDS_PER_SECOND,
+        minute * 60,
         tz=pytz.timezone(TIMEZONE),
     ).strftime("%m/%d (%a), %I:%M %p")
 
@@ -195,7 +213,7 @@ def now_us() -> int:
     Returns:
         Current Unix timestamp in microseconds.
     """
-    return int(time.time() * MICROSECONDS_PER_SECOND)
+    return time.time_ns() // NANOSECONDS_PER_MICROSECOND
 
 
 def md5(value: str) -> str:
@@ -209,3 +227,22 @@ def md5(value: str) -> str:
         Hexadecimal MD5 hash digest.
     """
     return hashlib.md5(value.encode()).hexdigest()
+
+
+def new_session_key(email: str) -> str:
+    """
+    Generate a session key for a user.
+
+    The key is a 128-bit BLAKE2b digest of the email address and the current
+    time, as long as the MD5 based keys issued before, and matches the keys
+    issued by the gRPC server.
+
+    Args:
+        email: The user's email address.
+
+    Returns:
+        Hexadecimal session key.
+    """
+    hasher = hashlib.blake2b(email.encode(), digest_size=16)
+    hasher.update(time.time_ns().to_bytes(8, "little"))
+    return hasher.hexdigest()
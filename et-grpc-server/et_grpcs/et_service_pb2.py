@@ -17,7 +17,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
     package="",
     syntax="proto3",
     serialized_options=b"\n\022inha.nsl.easytrack",
-    serialized_pb=b'\n\x10\x65t_service.proto"u\n\x08Register\x1a;\n\x07Request\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x10\n\x08password\x18\x03 \x01(\t\x1a,\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t"\x96\x01\n\x05Login\x1a-\n\x07Request\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\x1a^\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0e\n\x06userId\x18\x03 \x01(\x05\x12\x0c\n\x04name\x18\x04 \x01(\t\x12\x12\n\nsessionKey\x18\x05 \x01(\t"n\n\x0fLoginWithGoogle\x1a\x1a\n\x07Request\x12\x0f\n\x07idToken\x18\x01 \x01(\t\x1a?\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0e\n\x06userId\x18\x02 \x01(\x05\x12\x12\n\nsessionKey\x18\x03 \x01(\t"a\n\x06SetTag\x1a:\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x0b\n\x03tag\x18\x03 \x01(\t\x1a\x1b\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08"a\n\x06GetTag\x1a-\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x1a(\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0b\n\x03tag\x18\x02 \x01(\t"\xb0\x01\n\x12\x42indUserToCampaign\x1a\x41\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x1aW\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1a\n\x12isFirstTimeBinding\x18\x02 \x01(\x08\x12\x1e\n\x16\x63\x61mpaignStartTimestamp\x18\x03 \x01(\x03"\xa3\x01\n\x14RetrieveParticipants\x1a\x41\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x1aH\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0e\n\x06userId\x18\x02 \x03(\x05\x12\r\n\x05\x65mail\x18\x03 \x03(\t\x12\x0c\n\x04name\x18\x04 \x03(\t"\xf7\x02\n\x18RetrieveParticipantStats\x1a\\\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x13\n\x0btargetEmail\x18\x03 \x01(\t\x12\x18\n\x10targetCampaignId\x18\x04 \x01(\x05\x1a\xfc\x01\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1d\n\x15\x63\x61mpaignJoinTimestamp\x18\x02 \x01(\x03\x12\x19\n\x11lastSyncTimestamp\x18\x03 \x01(\x03\x12\x1e\n\x16lastHeartbeatTimestamp\x18\x04 \x01(\x03\x12$\n\x1c\x61mountOfSubmittedDataSamples\x18\x05 \x01(\x05\x12\x14\n\x0c\x64\x61taSourceId\x18\x06 \x03(\x05\x12!\n\x19perDataSourceAmountOfData\x18\x07 \x03(\x05\x12&\n\x1eperDataSourceLastSyncTimestamp\x18\x08 \x03(\x03"\xe6\x01\n\x10RegisterCampaign\x1a\xa0\x01\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x12\x0c\n\x04name\x18\x04 \x01(\t\x12\r\n\x05notes\x18\x05 \x01(\t\x12\x12\n\nconfigJson\x18\x06 \x01(\t\x12\x16\n\x0estartTimestamp\x18\x07 \x01(\x03\x12\x14\n\x0c\x65ndTimestamp\x18\x08 \x01(\x03\x1a/\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\ncampaignId\x18\x02 \x01(\x05"p\n\x0e\x44\x65leteCampaign\x1a\x41\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x1a\x1b\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08"\x9c\x02\n\x11RetrieveCampaigns\x1a\x46\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x17\n\x0fmyCampaignsOnly\x18\x03 \x01(\x08\x1a\xbe\x01\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\ncampaignId\x18\x02 \x03(\x05\x12\x0c\n\x04name\x18\x03 \x03(\t\x12\r\n\x05notes\x18\x04 \x03(\t\x12\x16\n\x0estartTimestamp\x18\x05 \x03(\x03\x12\x14\n\x0c\x65ndTimestamp\x18\x06 \x03(\x03\x12\x14\n\x0c\x63reatorEmail\x18\x07 \x03(\t\x12\x12\n\nconfigJson\x18\x08 \x03(\t\x12\x18\n\x10participantCount\x18\t \x03(\x05"\x82\x02\n\x10RetrieveCampaign\x1a\x41\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x1a\xaa\x01\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05notes\x18\x03 \x01(\t\x12\x16\n\x0estartTimestamp\x18\x04 \x01(\x03\x12\x14\n\x0c\x65ndTimestamp\x18\x05 \x01(\x03\x12\x14\n\x0c\x63reatorEmail\x18\x06 \x01(\t\x12\x12\n\nconfigJson\x18\x07 \x01(\t\x12\x18\n\x10participantCount\x18\x08 \x01(\x05"\x94\x01\n\x10\x43reateDataSource\x1aM\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\x10\n\x08iconName\x18\x04 \x01(\t\x1a\x31\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x14\n\x0c\x64\x61taSourceId\x18\x03 \x01(\x05"\xad\x01\n\x13RetrieveDataSources\x1a-\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x1ag\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x14\n\x0c\x64\x61taSourceId\x18\x02 \x03(\x05\x12\x0c\n\x04name\x18\x03 \x03(\t\x12\x14\n\x0c\x63reatorEmail\x18\x04 \x03(\t\x12\x10\n\x08iconName\x18\x05 \x03(\t"\xbb\x01\n\x10SubmitDataRecord\x1a\x89\x01\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x12\x11\n\ttimestamp\x18\x04 \x01(\x03\x12\x12\n\ndataSource\x18\x05 \x01(\x05\x12\x10\n\x08\x61\x63\x63uracy\x18\x06 \x01(\x02\x12\r\n\x05value\x18\x07 \x01(\x0c\x1a\x1b\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08"\xbc\x01\n\x11SubmitDataRecords\x1a\x89\x01\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x12\x11\n\ttimestamp\x18\x04 \x03(\x03\x12\x12\n\ndataSource\x18\x05 \x03(\x05\x12\x10\n\x08\x61\x63\x63uracy\x18\x06 \x03(\x02\x12\r\n\x05value\x18\x07 \x03(\x0c\x1a\x1b\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08"\xf6\x01\n\x18RetrieveKNextDataRecords\x1a\x9a\x01\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x13\n\x0btargetEmail\x18\x03 \x01(\t\x12\x18\n\x10targetCampaignId\x18\x04 \x01(\x05\x12\x1a\n\x12targetDataSourceId\x18\x05 \x01(\x05\x12\t\n\x01k\x18\x06 \x01(\x05\x12\x15\n\rfromTimestamp\x18\x07 \x01(\x05\x1a=\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\ttimestamp\x18\x02 \x03(\x03\x12\r\n\x05value\x18\x04 \x03(\x0c"\xb5\x02\n\x1bRetrieveFilteredDataRecords\x1a\xc2\x01\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x13\n\x0btargetEmail\x18\x03 \x01(\t\x12\x18\n\x10targetCampaignId\x18\x04 \x01(\x05\x12\x1a\n\x12targetDataSourceId\x18\x05 \x01(\x05\x12\x15\n\rfromTimestamp\x18\x06 \x01(\x03\x12\x15\n\rtillTimestamp\x18\x07 \x01(\x03\x12\x1a\n\x12simplifyIfTooLarge\x18\x08 \x01(\x08\x1aQ\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\ttimestamp\x18\x02 \x03(\x03\x12\x12\n\ndataSource\x18\x03 \x03(\x05\x12\r\n\x05value\x18\x04 \x03(\x0c"\x95\x01\n\x10\x44ownloadDumpfile\x1aV\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x12\x13\n\x0btargetEmail\x18\x04 \x01(\t\x1a)\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0c\n\x04\x64ump\x18\x02 \x01(\x0c"q\n\x0fSubmitHeartbeat\x1a\x41\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x1a\x1b\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08"\xa4\x01\n\x13SubmitDirectMessage\x1a\x64\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x13\n\x0btargetEmail\x18\x03 \x01(\t\x12\x0f\n\x07subject\x18\x04 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x05 \x01(\t\x1a\'\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\n\n\x02id\x18\x02 \x01(\x05"\xd5\x01\n\x1cRetrieveUnreadDirectMessages\x1a-\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x1a\x85\x01\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\n\n\x02id\x18\x02 \x03(\x05\x12\x12\n\ncampaignId\x18\x03 \x03(\x05\x12\x13\n\x0bsourceEmail\x18\x04 \x03(\t\x12\x11\n\ttimestamp\x18\x05 \x03(\x03\x12\x0f\n\x07subject\x18\x06 \x03(\t\x12\x0f\n\x07\x63ontent\x18\x07 \x03(\t"\xb5\x01\n\x12SubmitNotification\x1av\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x12\x11\n\ttimestamp\x18\x04 \x01(\x03\x12\x0f\n\x07subject\x18\x05 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x06 \x01(\t\x1a\'\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\n\n\x02id\x18\x02 \x01(\x05"\xbe\x01\n\x1bRetrieveUnreadNotifications\x1a-\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x1ap\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\n\n\x02id\x18\x02 \x03(\x05\x12\x12\n\ncampaignId\x18\x03 \x03(\x05\x12\x11\n\ttimestamp\x18\x04 \x03(\x03\x12\x0f\n\x07subject\x18\x05 \x03(\t\x12\x0f\n\x07\x63ontent\x18\x06 \x03(\t2\x88\x0f\n\tETService\x12\x33\n\x08register\x12\x11.Register.Request\x1a\x12.Register.Response"\x00\x12*\n\x05login\x12\x0e.Login.Request\x1a\x0f.Login.Response"\x00\x12H\n\x0floginWithGoogle\x12\x18.LoginWithGoogle.Request\x1a\x19.LoginWithGoogle.Response"\x00\x12-\n\x06setTag\x12\x0f.SetTag.Request\x1a\x10.SetTag.Response"\x00\x12-\n\x06getTag\x12\x0f.GetTag.Request\x1a\x10.GetTag.Response"\x00\x12Q\n\x12\x62indUserToCampaign\x12\x1b.BindUserToCampaign.Request\x1a\x1c.BindUserToCampaign.Response"\x00\x12W\n\x14retrieveParticipants\x12\x1d.RetrieveParticipants.Request\x1a\x1e.RetrieveParticipants.Response"\x00\x12\x63\n\x18retrieveParticipantStats\x12!.RetrieveParticipantStats.Request\x1a".RetrieveParticipantStats.Response"\x00\x12K\n\x10registerCampaign\x12\x19.RegisterCampaign.Request\x1a\x1a.RegisterCampaign.Response"\x00\x12\x45\n\x0e\x64\x65leteCampaign\x12\x17.DeleteCampaign.Request\x1a\x18.DeleteCampaign.Response"\x00\x12N\n\x11retrieveCampaigns\x12\x1a.RetrieveCampaigns.Request\x1a\x1b.RetrieveCampaigns.Response"\x00\x12K\n\x10retrieveCampaign\x12\x19.RetrieveCampaign.Request\x1a\x1a.RetrieveCampaign.Response"\x00\x12K\n\x10\x63reateDataSource\x12\x19.CreateDataSource.Request\x1a\x1a.CreateDataSource.Response"\x00\x12T\n\x13retrieveDataSources\x12\x1c.RetrieveDataSources.Request\x1a\x1d.RetrieveDataSources.Response"\x00\x12K\n\x10submitDataRecord\x12\x19.SubmitDataRecord.Request\x1a\x1a.SubmitDataRecord.Response"\x00\x12N\n\x11submitDataRecords\x12\x1a.SubmitDataRecords.Request\x1a\x1b.SubmitDataRecords.Response"\x00\x12\x63\n\x18retrieveKNextDataRecords\x12!.RetrieveKNextDataRecords.Request\x1a".RetrieveKNextDataRecords.Response"\x00\x12l\n\x1bretrieveFilteredDataRecords\x12$.RetrieveFilteredDataRecords.Request\x1a%.RetrieveFilteredDataRecords.Response"\x00\x12K\n\x10\x64ownloadDumpfile\x12\x19.DownloadDumpfile.Request\x1a\x1a.DownloadDumpfile.Response"\x00\x12H\n\x0fsubmitHeartbeat\x12\x18.SubmitHeartbeat.Request\x1a\x19.SubmitHeartbeat.Response"\x00\x12T\n\x13submitDirectMessage\x12\x1c.SubmitDirectMessage.Request\x1a\x1d.SubmitDirectMessage.Response"\x00\x12o\n\x1cretrieveUnreadDirectMessages\x12%.RetrieveUnreadDirectMessages.Request\x1a&.RetrieveUnreadDirectMessages.Response"\x00\x12Q\n\x12submitNotification\x12\x1b.SubmitNotification.Request\x1a\x1c.SubmitNotification.Response"\x00\x12l\n\x1bretrieveUnreadNotifications\x12$.RetrieveUnreadNotifications.Request\x1a%.RetrieveUnreadNotifications.Response"\x00\x42\x14\n\x12inha.nsl.easytrackb\x06proto3',
+    serialized_pb=b'\n\x10\x65t_service.proto"u\n\x08Register\x1a;\n\x07Request\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x10\n\x08password\x18\x03 \x01(\t\x1a,\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t"\x96\x01\n\x05Login\x1a-\n\x07Request\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\x1a^\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0e\n\x06userId\x18\x03 \x01(\x05\x12\x0c\n\x04name\x18\x04 \x01(\t\x12\x12\n\nsessionKey\x18\x05 \x01(\t"n\n\x0fLoginWithGoogle\x1a\x1a\n\x07Request\x12\x0f\n\x07idToken\x18\x01 \x01(\t\x1a?\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0e\n\x06userId\x18\x02 \x01(\x05\x12\x12\n\nsessionKey\x18\x03 \x01(\t"a\n\x06SetTag\x1a:\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x0b\n\x03tag\x18\x03 \x01(\t\x1a\x1b\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08"a\n\x06GetTag\x1a-\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x1a(\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0b\n\x03tag\x18\x02 \x01(\t"\xb0\x01\n\x12\x42indUserToCampaign\x1a\x41\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x1aW\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1a\n\x12isFirstTimeBinding\x18\x02 \x01(\x08\x12\x1e\n\x16\x63\x61mpaignStartTimestamp\x18\x03 \x01(\x03"\xa3\x01\n\x14RetrieveParticipants\x1a\x41\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x1aH\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0e\n\x06userId\x18\x02 \x03(\x05\x12\r\n\x05\x65mail\x18\x03 \x03(\t\x12\x0c\n\x04name\x18\x04 \x03(\t"\xf7\x02\n\x18RetrieveParticipantStats\x1a\\\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x13\n\x0btargetEmail\x18\x03 \x01(\t\x12\x18\n\x10targetCampaignId\x18\x04 \x01(\x05\x1a\xfc\x01\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1d\n\x15\x63\x61mpaignJoinTimestamp\x18\x02 \x01(\x03\x12\x19\n\x11lastSyncTimestamp\x18\x03 \x01(\x03\x12\x1e\n\x16lastHeartbeatTimestamp\x18\x04 \x01(\x03\x12$\n\x1c\x61mountOfSubmittedDataSamples\x18\x05 \x01(\x05\x12\x14\n\x0c\x64\x61taSourceId\x18\x06 \x03(\x05\x12!\n\x19perDataSourceAmountOfData\x18\x07 \x03(\x05\x12&\n\x1eperDataSourceLastSyncTimestamp\x18\x08 \x03(\x03"\xe6\x01\n\x10RegisterCampaign\x1a\xa0\x01\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x12\x0c\n\x04name\x18\x04 \x01(\t\x12\r\n\x05notes\x18\x05 \x01(\t\x12\x12\n\nconfigJson\x18\x06 \x01(\t\x12\x16\n\x0estartTimestamp\x18\x07 \x01(\x03\x12\x14\n\x0c\x65ndTimestamp\x18\x08 \x01(\x03\x1a/\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\ncampaignId\x18\x02 \x01(\x05"p\n\x0e\x44\x65leteCampaign\x1a\x41\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x1a\x1b\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08"\x9c\x02\n\x11RetrieveCampaigns\x1a\x46\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x17\n\x0fmyCampaignsOnly\x18\x03 \x01(\x08\x1a\xbe\x01\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\ncampaignId\x18\x02 \x03(\x05\x12\x0c\n\x04name\x18\x03 \x03(\t\x12\r\n\x05notes\x18\x04 \x03(\t\x12\x16\n\x0estartTimestamp\x18\x05 \x03(\x03\x12\x14\n\x0c\x65ndTimestamp\x18\x06 \x03(\x03\x12\x14\n\x0c\x63reatorEmail\x18\x07 \x03(\t\x12\x12\n\nconfigJson\x18\x08 \x03(\t\x12\x18\n\x10participantCount\x18\t \x03(\x05"\x82\x02\n\x10RetrieveCampaign\x1a\x41\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x1a\xaa\x01\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05notes\x18\x03 \x01(\t\x12\x16\n\x0estartTimestamp\x18\x04 \x01(\x03\x12\x14\n\x0c\x65ndTimestamp\x18\x05 \x01(\x03\x12\x14\n\x0c\x63reatorEmail\x18\x06 \x01(\t\x12\x12\n\nconfigJson\x18\x07 \x01(\t\x12\x18\n\x10participantCount\x18\x08 \x01(\x05"\x94\x01\n\x10\x43reateDataSource\x1aM\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\x10\n\x08iconName\x18\x04 \x01(\t\x1a\x31\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x14\n\x0c\x64\x61taSourceId\x18\x03 \x01(\x05"\xad\x01\n\x13RetrieveDataSources\x1a-\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x1ag\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x14\n\x0c\x64\x61taSourceId\x18\x02 \x03(\x05\x12\x0c\n\x04name\x18\x03 \x03(\t\x12\x14\n\x0c\x63reatorEmail\x18\x04 \x03(\t\x12\x10\n\x08iconName\x18\x05 \x03(\t"\xbb\x01\n\x10SubmitDataRecord\x1a\x89\x01\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x12\x11\n\ttimestamp\x18\x04 \x01(\x03\x12\x12\n\ndataSource\x18\x05 \x01(\x05\x12\x10\n\x08\x61\x63\x63uracy\x18\x06 \x01(\x02\x12\r\n\x05value\x18\x07 \x01(\x0c\x1a\x1b\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08"\xbc\x01\n\x11SubmitDataRecords\x1a\x89\x01\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x12\x11\n\ttimestamp\x18\x04 \x03(\x03\x12\x12\n\ndataSource\x18\x05 \x03(\x05\x12\x10\n\x08\x61\x63\x63uracy\x18\x06 \x03(\x02\x12\r\n\x05value\x18\x07 \x03(\x0c\x1a\x1b\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08"\xf6\x01\n\x18RetrieveKNextDataRecords\x1a\x9a\x01\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x13\n\x0btargetEmail\x18\x03 \x01(\t\x12\x18\n\x10targetCampaignId\x18\x04 \x01(\x05\x12\x1a\n\x12targetDataSourceId\x18\x05 \x01(\x05\x12\t\n\x01k\x18\x06 \x01(\x05\x12\x15\n\rfromTimestamp\x18\x07 \x01(\x05\x1a=\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\ttimestamp\x18\x02 \x03(\x03\x12\r\n\x05value\x18\x04 \x03(\x0c"\xb5\x02\n\x1bRetrieveFilteredDataRecords\x1a\xc2\x01\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x13\n\x0btargetEmail\x18\x03 \x01(\t\x12\x18\n\x10targetCampaignId\x18\x04 \x01(\x05\x12\x1a\n\x12targetDataSourceId\x18\x05 \x01(\x05\x12\x15\n\rfromTimestamp\x18\x06 \x01(\x03\x12\x15\n\rtillTimestamp\x18\x07 \x01(\x03\x12\x1a\n\x12simplifyIfTooLarge\x18\x08 \x01(\x08\x1aQ\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\ttimestamp\x18\x02 \x03(\x03\x12\x12\n\ndataSource\x18\x03 \x03(\x05\x12\r\n\x05value\x18\x04 \x03(\x0c"\x95\x01\n\x10\x44ownloadDumpfile\x1aV\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x12\x13\n\x0btargetEmail\x18\x04 \x01(\t\x1a)\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0c\n\x04\x64ump\x18\x02 \x01(\x0c"q\n\x0fSubmitHeartbeat\x1a\x41\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x1a\x1b\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08"\xa4\x01\n\x13SubmitDirectMessage\x1a\x64\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x13\n\x0btargetEmail\x18\x03 \x01(\t\x12\x0f\n\x07subject\x18\x04 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x05 \x01(\t\x1a\'\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\n\n\x02id\x18\x02 \x01(\x05"\xd5\x01\n\x1cRetrieveUnreadDirectMessages\x1a-\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x1a\x85\x01\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\n\n\x02id\x18\x02 \x03(\x05\x12\x12\n\ncampaignId\x18\x03 \x03(\x05\x12\x13\n\x0bsourceEmail\x18\x04 \x03(\t\x12\x11\n\ttimestamp\x18\x05 \x03(\x03\x12\x0f\n\x07subject\x18\x06 \x03(\t\x12\x0f\n\x07\x63ontent\x18\x07 \x03(\t"\xb5\x01\n\x12SubmitNotification\x1av\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x12\x12\n\ncampaignId\x18\x03 \x01(\x05\x12\x11\n\ttimestamp\x18\x04 \x01(\x03\x12\x0f\n\x07subject\x18\x05 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x06 \x01(\t\x1a\'\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\n\n\x02id\x18\x02 \x01(\x05"\xbe\x01\n\x1bRetrieveUnreadNotifications\x1a-\n\x07Request\x12\x0e\n\x06userId\x18\x01 \x01(\x05\x12\x12\n\nsessionKey\x18\x02 \x01(\t\x1ap\n\x08Response\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\n\n\x02id\x18\x02 \x03(\x05\x12\x12\n\ncampaignId\x18\x03 \x03(\x05\x12\x11\n\ttimestamp\x18\x04 \x03(\x03\x12\x0f\n\x07subject\x18\x05 \x03(\t\x12\x0f\n\x07\x63ontent\x18\x06 \x03(\t2\xcc\x11\n\tETService\x12\x33\n\x08register\x12\x11.Register.Request\x1a\x12.Register.Response"\x00\x12*\n\x05login\x12\x0e.Login.Request\x1a\x0f.Login.Response"\x00\x12H\n\x0floginWithGoogle\x12\x18.LoginWithGoogle.Request\x1a\x19.LoginWithGoogle.Response"\x00\x12-\n\x06setTag\x12\x0f.SetTag.Request\x1a\x10.SetTag.Response"\x00\x12-\n\x06getTag\x12\x0f.GetTag.Request\x1a\x10.GetTag.Response"\x00\x12Q\n\x12\x62indUserToCampaign\x12\x1b.BindUserToCampaign.Request\x1a\x1c.BindUserToCampaign.Response"\x00\x12W\n\x14retrieveParticipants\x12\x1d.RetrieveParticipants.Request\x1a\x1e.RetrieveParticipants.Response"\x00\x12\x63\n\x18retrieveParticipantStats\x12!.RetrieveParticipantStats.Request\x1a".RetrieveParticipantStats.Response"\x00\x12K\n\x10registerCampaign\x12\x19.RegisterCampaign.Request\x1a\x1a.RegisterCampaign.Response"\x00\x12\x45\n\x0e\x64\x65leteCampaign\x12\x17.DeleteCampaign.Request\x1a\x18.DeleteCampaign.Response"\x00\x12N\n\x11retrieveCampaigns\x12\x1a.RetrieveCampaigns.Request\x1a\x1b.RetrieveCampaigns.Response"\x00\x12K\n\x10retrieveCampaign\x12\x19.RetrieveCampaign.Request\x1a\x1a.RetrieveCampaign.Response"\x00\x12K\n\x10\x63reateDataSource\x12\x19.CreateDataSource.Request\x1a\x1a.CreateDataSource.Response"\x00\x12T\n\x13retrieveDataSources\x12\x1c.RetrieveDataSources.Request\x1a\x1d.RetrieveDataSources.Response"\x00\x12K\n\x10submitDataRecord\x12\x19.SubmitDataRecord.Request\x1a\x1a.SubmitDataRecord.Response"\x00\x12N\n\x11submitDataRecords\x12\x1a.SubmitDataRecords.Request\x1a\x1b.SubmitDataRecords.Response"\x00\x12\x63\n\x18retrieveKNextDataRecords\x12!.RetrieveKNextDataRecords.Request\x1a".RetrieveKNextDataRecords.Response"\x00\x12l\n\x1bretrieveFilteredDataRecords\x12$.RetrieveFilteredDataRecords.Request\x1a%.RetrieveFilteredDataRecords.Response"\x00\x12K\n\x10\x64ownloadDumpfile\x12\x19.DownloadDumpfile.Request\x1a\x1a.DownloadDumpfile.Response"\x00\x12H\n\x0fsubmitHeartbeat\x12\x18.SubmitHeartbeat.Request\x1a\x19.SubmitHeartbeat.Response"\x00\x12T\n\x13submitDirectMessage\x12\x1c.SubmitDirectMessage.Request\x1a\x1d.SubmitDirectMessage.Response"\x00\x12o\n\x1cretrieveUnreadDirectMessages\x12%.RetrieveUnreadDirectMessages.Request\x1a&.RetrieveUnreadDirectMessages.Response"\x00\x12Q\n\x12submitNotification\x12\x1b.SubmitNotification.Request\x1a\x1c.SubmitNotification.Response"\x00\x12l\n\x1bretrieveUnreadNotifications\x12$.RetrieveUnreadNotifications.Request\x1a%.RetrieveUnreadNotifications.Response"\x00\x12w\n"retrieveUnreadDirectMessagesStream\x12%.RetrieveUnreadDirectMessages.Request\x1a&.RetrieveUnreadDirectMessages.Response"\x00\x30\x01\x12t\n!retrieveUnreadNotificationsStream\x12$.RetrieveUnreadNotifications.Request\x1a%.RetrieveUnreadNotifications.Response"\x00\x30\x01\x12S\n\x16\x64ownloadDumpfileStream\x12\x19.DownloadDumpfile.Request\x1a\x1a.DownloadDumpfile.Response"\x00\x30\x01\x42\x14\n\x12inha.nsl.easytrackb\x06proto3',
 )
 
 
@@ -5588,7 +5588,7 @@ _ETSERVICE = _descriptor.ServiceDescriptor(
     index=0,
     serialized_options=None,
     serialized_start=4517,
-    serialized_end=6445,
+    serialized_end=6769,
     methods=[
         _descriptor.MethodDescriptor(
             name="register",
@@ -5806,6 +5806,33 @@ _ETSERVICE = _descriptor.ServiceDescriptor(
             output_type=_RETRIEVEUNREADNOTIFICATIONS_RESPONSE,
             serialized_options=None,
         ),
+        _descriptor.MethodDescriptor(
+            name="retrieveUnreadDirectMessagesStream",
+            full_name="ETService.retrieveUnreadDirectMessagesStream",
+            index=24,
+            containing_service=None,
+            input_type=_RETRIEVEUNREADDIRECTMESSAGES_REQUEST,
+            output_type=_RETRIEVEUNREADDIRECTMESSAGES_RESPONSE,
+            serialized_options=None,
+        ),
+        _descriptor.MethodDescriptor(
+            name="retrieveUnreadNotificationsStream",
+            full_name="ETService.retrieveUnreadNotificationsStream",
+            index=25,
+            containing_service=None,
+            input_type=_RETRIEVEUNREADNOTIFICATIONS_REQUEST,
+            output_type=_RETRIEVEUNREADNOTIFICATIONS_RESPONSE,
+            serialized_options=None,
+        ),
+        _descriptor.MethodDescriptor(
+            name="downloadDumpfileStream",
+            full_name="ETService.downloadDumpfileStream",
+            index=26,
+            containing_service=None,
+            input_type=_DOWNLOADDUMPFILE_REQUEST,
+            output_type=_DOWNLOADDUMPFILE_RESPONSE,
+            serialized_options=None,
+        ),
     ],
 )
 _sym_db.RegisterServiceDescriptor(_ETSERVICE)
@@ -134,6 +134,21 @@ class ETServiceStub(object):
             request_serializer=et__service__pb2.RetrieveUnreadNotifications.Request.SerializeToString,
             response_deserializer=et__service__pb2.RetrieveUnreadNotifications.Response.FromString,
         )
+        self.retrieveUnreadDirectMessagesStream = channel.unary_stream(
+            "/ETService/retrieveUnreadDirectMessagesStream",
+            request_serializer=et__service__pb2.RetrieveUnreadDirectMessages.Request.SerializeToString,
+            response_deserializer=et__service__pb2.RetrieveUnreadDirectMessages.Response.FromString,
+        )
+        self.retrieveUnreadNotificationsStream = channel.unary_stream(
+            "/ETService/retrieveUnreadNotificationsStream",
+            request_serializer=et__service__pb2.RetrieveUnreadNotifications.Request.SerializeToString,
+            response_deserializer=et__service__pb2.RetrieveUnreadNotifications.Response.FromString,
+        )
+        self.downloadDumpfileStream = channel.unary_stream(
+            "/ETService/downloadDumpfileStream",
+            request_serializer=et__service__pb2.DownloadDumpfile.Request.SerializeToString,
+            response_deserializer=et__service__pb2.DownloadDumpfile.Response.FromString,
+        )
 
 
 class ETServiceServicer(object):
@@ -302,6 +317,27 @@ class ETServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def retrieveUnreadDirectMessagesStream(self, request, context):
+        # missing associated documentation comment in .proto file
+        pass
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def retrieveUnreadNotificationsStream(self, request, context):
+        # missing associated documentation comment in .proto file
+        pass
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def downloadDumpfileStream(self, request, context):
+        # missing associated documentation comment in .proto file
+        pass
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_ETServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -425,6 +461,21 @@ def add_ETServiceServicer_to_server(servicer, server):
             request_deserializer=et__service__pb2.RetrieveUnreadNotifications.Request.FromString,
             response_serializer=et__service__pb2.RetrieveUnreadNotifications.Response.SerializeToString,
         ),
+        "retrieveUnreadDirectMessagesStream": grpc.unary_stream_rpc_method_handler(
+            servicer.retrieveUnreadDirectMessagesStream,
+            request_deserializer=et__service__pb2.RetrieveUnreadDirectMessages.Request.FromString,
+            response_serializer=et__service__pb2.RetrieveUnreadDirectMessages.Response.SerializeToString,
+        ),
+        "retrieveUnreadNotificationsStream": grpc.unary_stream_rpc_method_handler(
+            servicer.retrieveUnreadNotificationsStream,
+            request_deserializer=et__service__pb2.RetrieveUnreadNotifications.Request.FromString,
+            response_serializer=et__service__pb2.RetrieveUnreadNotifications.Response.SerializeToString,
+        ),
+        "downloadDumpfileStream": grpc.unary_stream_rpc_method_handler(
+            servicer.downloadDumpfileStream,
+            request_deserializer=et__service__pb2.DownloadDumpfile.Request.FromString,
+            response_serializer=et__service__pb2.DownloadDumpfile.Response.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "ETService", rpc_method_handlers
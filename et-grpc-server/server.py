@@ -5,27 +5,177 @@ This module implements the main gRPC server for the EasyTrack platform,
 providing services for user management, campaign management, data source
 management, data submission/retrieval, statistics, and communication.
 """
+import asyncio
+import inspect
+import itertools
 import logging
+import multiprocessing
 import os
+import queue
+import random
+import signal
 import time
 from concurrent import futures
-from typing import Any
+from typing import Any, Dict, Iterator, List, NoReturn, Optional, Tuple
 
 import grpc
 from cassandra import UnresolvableContactPoints
 from cassandra.cluster import NoHostAvailable
+from google.protobuf.internal import api_implementation
 
 from et_grpcs import et_service_pb2, et_service_pb2_grpc
 from tools import db_mgr as db
-from tools import settings, utils
+from tools import record_writer, schema_stmts, settings, utils
 
-# Configure logging
+# Configure logging; per-RPC logs are emitted at DEBUG level only
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
 
+#: gRPC server channel options
+GRPC_OPTIONS = (
+    ("grpc.so_reuseport", 1),
+    ("grpc.max_send_message_length", settings.MAX_MESSAGE_LENGTH),
+    ("grpc.max_receive_message_length", settings.MAX_MESSAGE_LENGTH),
+    ("grpc.keepalive_time_ms", settings.GRPC_KEEPALIVE_TIME_MS),
+    ("grpc.keepalive_timeout_ms", settings.GRPC_KEEPALIVE_TIMEOUT_MS),
+    ("grpc.keepalive_permit_without_calls", True),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.http2.min_time_between_pings_ms", settings.GRPC_KEEPALIVE_TIME_MS),
+    (
+        "grpc.http2.min_ping_interval_without_data_ms",
+        settings.GRPC_MIN_PING_INTERVAL_MS,
+    ),
+)
+
+#: Shared heartbeat responses; never mutated, since they are returned to every caller
+HEARTBEAT_OK_RESPONSE = et_service_pb2.SubmitHeartbeat.Response(success=True)
+HEARTBEAT_FAIL_RESPONSE = et_service_pb2.SubmitHeartbeat.Response(success=False)
+
+#: Shared failure response of downloadDumpfile and downloadDumpfileStream
+DOWNLOAD_DUMPFILE_FAIL_RESPONSE = et_service_pb2.DownloadDumpfile.Response(
+    success=False
+)
+
+#: Validation error messages of register() and login()
+USERNAME_TOO_SHORT_MESSAGE = (
+    f"Username must be minimum {settings.MIN_USERNAME_LENGTH} characters long"
+)
+PASSWORD_TOO_SHORT_MESSAGE = (
+    f"Password must be minimum {settings.MIN_PASSWORD_LENGTH} characters long"
+)
+
+#: Shared validation error responses; never mutated, like the heartbeat responses
+REGISTER_USERNAME_ERROR_RESPONSE = et_service_pb2.Register.Response(
+    success=False, message=USERNAME_TOO_SHORT_MESSAGE
+)
+REGISTER_PASSWORD_ERROR_RESPONSE = et_service_pb2.Register.Response(
+    success=False, message=PASSWORD_TOO_SHORT_MESSAGE
+)
+LOGIN_USERNAME_ERROR_RESPONSE = et_service_pb2.Login.Response(
+    success=False, message=USERNAME_TOO_SHORT_MESSAGE
+)
+LOGIN_PASSWORD_ERROR_RESPONSE = et_service_pb2.Login.Response(
+    success=False, message=PASSWORD_TOO_SHORT_MESSAGE
+)
+
+#: Hot ingestion RPCs that are not logged per call
+UNLOGGED_METHODS = frozenset(
+    ["submitDataRecord", "submitDataRecords", "submitHeartbeat"]
+)
+
+
+class RpcAborted(Exception):
+    """
+    Raised right after `context.abort()` in blocking handlers.
+
+    `abort()` is expected to raise by itself, but that is not guaranteed for
+    handlers run on the migration thread pool of grpc.aio; raising again makes
+    sure that no handler code runs past a rejected call.
+    """
+
+
+def abort_rpc(
+    context: grpc.ServicerContext, code: grpc.StatusCode, details: str
+) -> NoReturn:
+    """
+    Fail the RPC and stop the calling handler.
+
+    Args:
+        context: gRPC context.
+        code: Status code of the failure.
+        details: Status details of the failure.
+
+    Raises:
+        RpcAborted: Always, unless `context.abort()` raised already.
+    """
+    context.abort(code, details)
+    raise RpcAborted(details)
+
+
+class LoggingInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Logs the outcome and duration of each unary RPC at DEBUG level.
+    """
+
+    async def intercept_service(
+        self, continuation: Any, handler_call_details: grpc.HandlerCallDetails
+    ) -> Any:
+        """
+        Wrap unary-unary handlers with timing and a single log line.
+
+        Args:
+            continuation: Coroutine function resolving the next handler.
+            handler_call_details: Details of the incoming RPC.
+
+        Returns:
+            RPC method handler (wrapped if the call should be logged).
+        """
+        handler = await continuation(handler_call_details)
+        if not logger.isEnabledFor(logging.DEBUG):
+            # no per-call logging, so skip the wrapper and its timing entirely
+            return handler
+        method_name = handler_call_details.method.rsplit("/", 1)[-1]
+        if (
+            handler is None
+            or handler.unary_unary is None
+            or method_name in UNLOGGED_METHODS
+        ):
+            return handler
+
+        behavior = handler.unary_unary
+
+        def log_call(response: Any, start_ns: int) -> None:
+            logger.debug(
+                "%s() - success = %s (%.2f ms)",
+                method_name,
+                getattr(response, "success", None),
+                (time.perf_counter_ns() - start_ns) / 1e6,
+            )
+
+        if inspect.iscoroutinefunction(behavior):
+            async def logged_behavior(request: Any, context: Any) -> Any:
+                start_ns = time.perf_counter_ns()
+                response = await behavior(request, context)
+                log_call(response, start_ns)
+                return response
+
+        else:
+            # blocking handlers keep running on the migration thread pool
+            def logged_behavior(request: Any, context: Any) -> Any:
+                start_ns = time.perf_counter_ns()
+                response = behavior(request, context)
+                log_call(response, start_ns)
+                return response
+
+        return grpc.unary_unary_rpc_method_handler(
+            logged_behavior,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+
 
 class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
     """
@@ -36,6 +186,31 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
     and communication between users.
     """
 
+    def _authenticate(self, request: Any, context: grpc.ServicerContext) -> Any:
+        """
+        Authenticate the requester, aborting the RPC if that fails.
+
+        Failing with UNAUTHENTICATED skips building and serializing a
+        response message for rejected calls.
+
+        Args:
+            request: Request carrying `userId` and `sessionKey`.
+            context: gRPC context.
+
+        Returns:
+            User database object; never None.
+
+        Raises:
+            RpcAborted: If the session is invalid (unless `context.abort()`
+                raised already).
+        """
+        db_user = db.authenticate(
+            user_id=request.userId, session_key=request.sessionKey
+        )
+        if db_user is None:
+            abort_rpc(context, grpc.StatusCode.UNAUTHENTICATED, "invalid session")
+        return db_user
+
     # ==========================================================================
     # User Management Module
     # ==========================================================================
@@ -53,52 +228,32 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Register response indicating success or failure.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: register()", timestamp)
-
-        grpc_response = et_service_pb2.Register.Response()
-        grpc_response.success = False
-
-        # Validate username length
+        # Validate username and password length
         if len(request.username) < settings.MIN_USERNAME_LENGTH:
-            logger.warning("%s: register() - invalid username", timestamp)
-            grpc_response.message = (
-                f"Username must be minimum {settings.MIN_USERNAME_LENGTH} characters long"
-            )
-            return grpc_response
-
-        # Validate password length
+            logger.warning("register() - invalid username")
+            return REGISTER_USERNAME_ERROR_RESPONSE
         if len(request.password) < settings.MIN_PASSWORD_LENGTH:
-            logger.warning("%s: register() - invalid password", timestamp)
-            grpc_response.message = (
-                f"Password must be minimum {settings.MIN_PASSWORD_LENGTH} characters long"
-            )
-            return grpc_response
+            logger.warning("register() - invalid password")
+            return REGISTER_PASSWORD_ERROR_RESPONSE
+
+        grpc_response = et_service_pb2.Register.Response()
 
-        db_user = db.get_user(email=f"{request.username}@easytrack.com")
+        email = request.username + settings.USERNAME_EMAIL_SUFFIX
+        db_user = db.get_user(email=email)
         if db_user is None:
             # New user
             logger.info("Creating new user: %s", request.username)
-            new_email = f"{request.username}@easytrack.com"
             db.create_user(
                 name=request.name,
-                email=new_email,
+                email=email,
                 session_key=request.password,
             )
-            db_user = db.get_user(email=new_email)
-            if db_user is not None:
-                grpc_response.success = True
-            else:
-                grpc_response.message = (
-                    "Failed to create user (contact backend developer)"
-                )
-                logger.error("%s: register() - failed to create user", timestamp)
+            grpc_response.success = True
         else:
             # User already exists
             grpc_response.message = "Username already exists"
-            logger.warning("%s: register() - username already exists", timestamp)
+            logger.warning("register() - username already exists")
 
-        logger.info("%s: register() - success = %s", timestamp, grpc_response.success)
         return grpc_response
 
     def login(
@@ -112,39 +267,29 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
             context: gRPC context.
 
         Returns:
-            Login response with user info if successful.
+            Login response with user info; the RPC fails with UNAUTHENTICATED
+            if the credentials are wrong.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: login()", timestamp)
-
-        grpc_response = et_service_pb2.Login.Response()
-        grpc_response.success = False
-
-        # Validate username length
+        # Validate username and password length
         if len(request.username) < settings.MIN_USERNAME_LENGTH:
-            logger.warning("%s: login() - invalid username", timestamp)
-            grpc_response.message = (
-                f"Username must be minimum {settings.MIN_USERNAME_LENGTH} characters long"
-            )
-            return grpc_response
-
-        # Validate password length
+            logger.warning("login() - invalid username")
+            return LOGIN_USERNAME_ERROR_RESPONSE
         if len(request.password) < settings.MIN_PASSWORD_LENGTH:
-            logger.warning("%s: login() - invalid password", timestamp)
-            grpc_response.message = (
-                f"Password must be minimum {settings.MIN_PASSWORD_LENGTH} characters long"
-            )
-            return grpc_response
+            logger.warning("login() - invalid password")
+            return LOGIN_PASSWORD_ERROR_RESPONSE
 
-        email = f"{request.username}@easytrack.com"
+        email = request.username + settings.USERNAME_EMAIL_SUFFIX
         db_user = db.get_user(email=email)
-        if db_user is not None and db_user.sessionKey == request.password:
-            grpc_response.success = True
-            grpc_response.userId = db_user.id
-            grpc_response.name = db_user.name
-            grpc_response.sessionKey = db_user.sessionKey
+        if db_user is None or db_user.sessionKey != request.password:
+            abort_rpc(
+                context, grpc.StatusCode.UNAUTHENTICATED, "invalid username or password"
+            )
 
-        logger.info("%s: login() - success = %s", timestamp, grpc_response.success)
+        grpc_response = et_service_pb2.Login.Response()
+        grpc_response.success = True
+        grpc_response.userId = db_user.id
+        grpc_response.name = db_user.name
+        grpc_response.sessionKey = db_user.sessionKey
         return grpc_response
 
     def loginWithGoogle(
@@ -160,32 +305,26 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             LoginWithGoogle response with user info if successful.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: loginWithGoogle()", timestamp)
-
         grpc_response = et_service_pb2.LoginWithGoogle.Response()
-        grpc_response.success = False
 
         google_profile = utils.load_google_profile(id_token=request.idToken)
         if google_profile is None:
             return grpc_response
 
-        session_key = utils.md5(value=f'{google_profile["email"]}{utils.now_us()}')
+        session_key = utils.new_session_key(email=google_profile["email"])
         db_user = db.get_user(email=google_profile["email"])
 
         if db_user is None:
             # New user
             logger.info("Creating new Google user: %s", google_profile["email"])
-            db.create_user(
+            db_user = db.create_user(
                 name=google_profile["name"],
                 email=google_profile["email"],
                 session_key=session_key,
             )
-            db_user = db.get_user(email=google_profile["email"])
-            if db_user is not None:
-                grpc_response.userId = db_user.id
-                grpc_response.sessionKey = session_key
-                grpc_response.success = True
+            grpc_response.userId = db_user.id
+            grpc_response.sessionKey = session_key
+            grpc_response.success = True
         else:
             # Existing user - update session key
             db.update_session_key(db_user=db_user, session_key=session_key)
@@ -193,9 +332,6 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
             grpc_response.sessionKey = session_key
             grpc_response.success = True
 
-        logger.info(
-            "%s: loginWithGoogle() - success = %s", timestamp, grpc_response.success
-        )
         return grpc_response
 
     def setTag(
@@ -211,18 +347,13 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response indicating success or failure.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: setTag()", timestamp)
-
         grpc_response = et_service_pb2.BindUserToCampaign.Response()
-        grpc_response.success = False
 
         db_user = db.get_user(user_id=request.userId)
         if db_user is not None:
             db.set_user_tag(db_user=db_user, tag=request.tag)
             grpc_response.success = True
 
-        logger.info("%s: setTag() - success = %s", timestamp, grpc_response.success)
         return grpc_response
 
     def getTag(
@@ -238,18 +369,13 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response containing the user's tag.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: getTag()", timestamp)
-
         grpc_response = et_service_pb2.BindUserToCampaign.Response()
-        grpc_response.success = False
 
         db_user = db.get_user(user_id=request.userId)
         if db_user is not None:
             grpc_response.tag = db_user.tag
             grpc_response.success = True
 
-        logger.info("%s: getTag() - success = %s", timestamp, grpc_response.success)
         return grpc_response
 
     def bindUserToCampaign(
@@ -265,27 +391,20 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response with binding status and campaign start timestamp.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: bindUserToCampaign()", timestamp)
-
         grpc_response = et_service_pb2.BindUserToCampaign.Response()
-        grpc_response.success = False
 
         db_user = db.get_user(user_id=request.userId)
         db_campaign = db.get_campaign(campaign_id=request.campaignId)
 
-        if None not in [db_user, db_campaign]:
+        if db_user is not None and db_campaign is not None:
             grpc_response.isFirstTimeBinding = db.bind_participant_to_campaign(
                 db_user=db_user, db_campaign=db_campaign
             )
             grpc_response.campaignStartTimestamp = db_campaign.startTimestamp
             grpc_response.success = True
 
-        logger.info(
-            "%s: bindUserToCampaign(newBinding=%s) - success = %s",
-            timestamp,
-            grpc_response.isFirstTimeBinding,
-            grpc_response.success,
+        logger.debug(
+            "bindUserToCampaign(newBinding=%s)", grpc_response.isFirstTimeBinding
         )
         return grpc_response
 
@@ -302,30 +421,20 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response containing participant information.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: retrieveParticipants()", timestamp)
-
         grpc_response = et_service_pb2.RetrieveParticipants.Response()
-        grpc_response.success = False
 
-        db_user = db.get_user(user_id=request.userId)
+        db_user = self._authenticate(request, context)
         db_campaign = db.get_campaign(
             campaign_id=request.campaignId, db_researcher_user=db_user
         )
 
-        if (
-            None not in [db_user, db_campaign]
-            and db_user.sessionKey == request.sessionKey
-        ):
-            for row in db.get_campaign_participants(db_campaign=db_campaign):
-                grpc_response.userId.extend([row.id])
-                grpc_response.name.extend([row.name])
-                grpc_response.email.extend([row.email])
+        if db_campaign is not None:
+            db_participants = db.get_campaign_participants(db_campaign=db_campaign)
+            grpc_response.userId.extend(row.id for row in db_participants)
+            grpc_response.name.extend(row.name for row in db_participants)
+            grpc_response.email.extend(row.email for row in db_participants)
             grpc_response.success = True
 
-        logger.info(
-            "%s: retrieveParticipants() - success = %s", timestamp, grpc_response.success
-        )
         return grpc_response
 
     # ==========================================================================
@@ -345,20 +454,12 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response indicating success or failure.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: registerCampaign()", timestamp)
-
         grpc_response = et_service_pb2.RegisterCampaign.Response()
-        grpc_response.success = False
 
-        db_user = db.get_user(user_id=request.userId)
+        db_user = self._authenticate(request, context)
         db_campaign = db.get_campaign(campaign_id=request.campaignId)
 
-        if (
-            db_user is not None
-            and db_user.sessionKey == request.sessionKey
-            and (db_campaign is None or db_campaign.creatorId == db_user.id)
-        ):
+        if db_campaign is None or db_campaign.creatorId == db_user.id:
             db.create_or_update_campaign(
                 db_creator_user=db_user,
                 db_campaign=db_campaign,
@@ -370,9 +471,6 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
             )
             grpc_response.success = True
 
-        logger.info(
-            "%s: registerCampaign() - success = %s", timestamp, grpc_response.success
-        )
         return grpc_response
 
     def deleteCampaign(
@@ -388,27 +486,17 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response indicating success or failure.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: deleteCampaign()", timestamp)
-
         grpc_response = et_service_pb2.DeleteCampaign.Response()
-        grpc_response.success = False
 
-        db_user = db.get_user(user_id=request.userId)
+        db_user = self._authenticate(request, context)
         db_campaign = db.get_campaign(
             campaign_id=request.campaignId, db_researcher_user=db_user
         )
 
-        if (
-            None not in [db_user, db_campaign]
-            and db_user.sessionKey == request.sessionKey
-        ):
+        if db_campaign is not None:
             db.delete_campaign(db_campaign=db_campaign)
             grpc_response.success = True
 
-        logger.info(
-            "%s: deleteCampaign() - success = %s", timestamp, grpc_response.success
-        )
         return grpc_response
 
     def retrieveCampaigns(
@@ -424,36 +512,28 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response containing campaign information.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: retrieveCampaigns()", timestamp)
-
         grpc_response = et_service_pb2.RetrieveCampaigns.Response()
-        grpc_response.success = False
 
-        db_user = db.get_user(user_id=request.userId)
+        db_user = self._authenticate(request, context)
 
-        if db_user is not None and db_user.sessionKey == request.sessionKey:
-            db_campaigns = (
-                db.get_campaigns(db_creator_user=db_user)
-                if request.myCampaignsOnly
-                else db.get_campaigns()
-            )
-            for db_campaign in db_campaigns:
-                grpc_response.campaignId.extend([db_campaign.id])
-                grpc_response.creatorEmail.extend([db_user.email])
-                grpc_response.name.extend([db_campaign.name])
-                grpc_response.notes.extend([db_campaign.notes])
-                grpc_response.configJson.extend([db_campaign.configJson])
-                grpc_response.startTimestamp.extend([db_campaign.startTimestamp])
-                grpc_response.endTimestamp.extend([db_campaign.endTimestamp])
-                grpc_response.participantCount.extend(
-                    [db.get_campaign_participants_count(db_campaign=db_campaign)]
-                )
-            grpc_response.success = True
-
-        logger.info(
-            "%s: retrieveCampaigns() - success = %s", timestamp, grpc_response.success
+        db_campaigns = (
+            db.get_campaigns(db_creator_user=db_user)
+            if request.myCampaignsOnly
+            else db.get_campaigns()
+        )
+        grpc_response.campaignId.extend(c.id for c in db_campaigns)
+        grpc_response.creatorEmail.extend([db_user.email] * len(db_campaigns))
+        grpc_response.name.extend(c.name for c in db_campaigns)
+        grpc_response.notes.extend(c.notes for c in db_campaigns)
+        grpc_response.configJson.extend(c.configJson for c in db_campaigns)
+        grpc_response.startTimestamp.extend(c.startTimestamp for c in db_campaigns)
+        grpc_response.endTimestamp.extend(c.endTimestamp for c in db_campaigns)
+        participant_counts = db.get_participants_counts([c.id for c in db_campaigns])
+        grpc_response.participantCount.extend(
+            participant_counts[c.id] for c in db_campaigns
         )
+        grpc_response.success = True
+
         return grpc_response
 
     def retrieveCampaign(
@@ -469,24 +549,17 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response containing campaign details.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: retrieveCampaign()", timestamp)
-
         grpc_response = et_service_pb2.RetrieveCampaign.Response()
-        grpc_response.success = False
 
-        db_user = db.get_user(user_id=request.userId)
+        db_user = self._authenticate(request, context)
         db_campaign = db.get_campaign(campaign_id=request.campaignId)
 
-        if db_user is None or db_campaign is None:
+        if db_campaign is None:
             return grpc_response
 
-        session_key_valid = db_user.sessionKey == request.sessionKey
-        user_matches = db_user.id == db_campaign.creatorId or db.user_is_bound_to_campaign(
+        if db_user.id == db_campaign.creatorId or db.user_is_bound_to_campaign(
             db_user=db_user, db_campaign=db_campaign
-        )
-
-        if session_key_valid and user_matches:
+        ):
             grpc_response.name = db_campaign.name
             grpc_response.notes = db_campaign.notes
             grpc_response.creatorEmail = (
@@ -502,9 +575,6 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
             )
             grpc_response.success = True
 
-        logger.info(
-            "%s: retrieveCampaign() - success = %s", timestamp, grpc_response.success
-        )
         return grpc_response
 
     # ==========================================================================
@@ -524,30 +594,22 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response with created data source ID.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: createDataSource()", timestamp)
-
         grpc_response = et_service_pb2.CreateDataSource.Response()
-        grpc_response.success = True
 
-        db_user = db.get_user(user_id=request.userId)
+        db_user = self._authenticate(request, context)
 
-        if db_user is not None and db_user.sessionKey == request.sessionKey:
+        db_data_source = db.get_data_source(data_source_name=request.name)
+        if db_data_source is None:
+            logger.info("Creating new data source: %s", request.name)
+            db.create_data_source(
+                db_creator_user=db_user,
+                name=request.name,
+                icon_name=request.iconName,
+            )
             db_data_source = db.get_data_source(data_source_name=request.name)
-            if db_data_source is None:
-                logger.info("Creating new data source: %s", request.name)
-                db.create_data_source(
-                    db_creator_user=db_user,
-                    name=request.name,
-                    icon_name=request.iconName,
-                )
-                db_data_source = db.get_data_source(data_source_name=request.name)
-            grpc_response.dataSourceId = db_data_source.id
-            grpc_response.success = True
+        grpc_response.dataSourceId = db_data_source.id
+        grpc_response.success = True
 
-        logger.info(
-            "%s: createDataSource() - success = %s", timestamp, grpc_response.success
-        )
         return grpc_response
 
     def retrieveDataSources(
@@ -563,41 +625,31 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response containing data source information.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: retrieveDataSources()", timestamp)
-
         grpc_response = et_service_pb2.RetrieveDataSources.Response()
-        grpc_response.success = False
-
-        db_user = db.get_user(user_id=request.userId)
 
-        if db_user is not None and db_user.sessionKey == request.sessionKey:
-            for data_source in db.get_all_data_sources():
-                grpc_response.dataSourceId.extend([data_source.id])
-                grpc_response.creatorEmail.extend(
-                    [
-                        (
-                            db.get_user(user_id=data_source.creatorId).email
-                            if data_source.creatorId is not None
-                            else "N/A"
-                        )
-                    ]
-                )
-                grpc_response.name.extend([data_source.name])
-                grpc_response.iconName.extend([data_source.iconName])
-            grpc_response.success = True
+        self._authenticate(request, context)
 
-        logger.info(
-            "%s: retrieveDataSources() - success = %s", timestamp, grpc_response.success
+        db_data_sources = db.get_all_data_sources()
+        db_creators = db.get_users(
+            [ds.creatorId for ds in db_data_sources if ds.creatorId is not None]
         )
+        grpc_response.dataSourceId.extend(ds.id for ds in db_data_sources)
+        grpc_response.creatorEmail.extend(
+            (db_creators[ds.creatorId].email if ds.creatorId is not None else "N/A")
+            for ds in db_data_sources
+        )
+        grpc_response.name.extend(ds.name for ds in db_data_sources)
+        grpc_response.iconName.extend(ds.iconName for ds in db_data_sources)
+        grpc_response.success = True
+
         return grpc_response
 
     # ==========================================================================
     # Data Management Module
     # ==========================================================================
 
-    def submitDataRecord(
-        self, request: Any, context: grpc.ServicerContext
+    async def submitDataRecord(
+        self, request: Any, context: grpc.aio.ServicerContext
     ) -> et_service_pb2.SubmitDataRecord.Response:
         """
         Submit a single data record.
@@ -610,23 +662,29 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
             Response indicating success or failure.
         """
         grpc_response = et_service_pb2.SubmitDataRecord.Response()
-        grpc_response.success = False
-
-        db_user = db.get_user(user_id=request.userId)
-        db_campaign = db.get_campaign(campaign_id=request.campaignId)
-        db_data_source = db.get_data_source(data_source_id=request.dataSource)
 
-        if (
-            None not in [db_user, db_campaign, db_data_source]
-            and db.user_is_bound_to_campaign(db_user=db_user, db_campaign=db_campaign)
-        ):
-            db.store_data_record(
-                db_user=db_user,
-                db_campaign=db_campaign,
-                db_data_source=db_data_source,
-                timestamp=request.timestamp,
-                value=request.value,
-            )
+        data_source_future = db.get_data_source_async(data_source_id=request.dataSource)
+        authorized, db_user, db_campaign = await db.authorize_participant_async(
+            user_id=request.userId, campaign_id=request.campaignId
+        )
+        db_data_source = await data_source_future.result_async()
+
+        if authorized and db_data_source is not None:
+            # written asynchronously, coalesced with other records of the source;
+            # blocking on a full queue would stall the event loop, so shed load
+            try:
+                record_writer.get_writer_pool().submit(
+                    campaign_id=db_campaign.id,
+                    user_id=db_user.id,
+                    data_source_id=db_data_source.id,
+                    timestamp=request.timestamp,
+                    value=request.value,
+                    block=False,
+                )
+            except queue.Full:
+                await context.abort(
+                    grpc.StatusCode.RESOURCE_EXHAUSTED, "data record queue is full"
+                )
             grpc_response.success = True
 
         return grpc_response
@@ -645,16 +703,12 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
             Response indicating success or failure.
         """
         grpc_response = et_service_pb2.SubmitDataRecords.Response()
-        grpc_response.success = False
 
-        db_user = db.get_user(user_id=request.userId)
-        db_campaign = db.get_campaign(campaign_id=request.campaignId)
+        authorized, db_user, db_campaign = db.authorize_participant(
+            user_id=request.userId, campaign_id=request.campaignId
+        )
 
-        if (
-            None not in [db_user, db_campaign]
-            and db.user_is_bound_to_campaign(db_user=db_user, db_campaign=db_campaign)
-            and len(request.timestamp) > 0
-        ):
+        if authorized and len(request.timestamp) > 0:
             db.store_data_records(
                 db_user=db_user,
                 db_campaign=db_campaign,
@@ -679,20 +733,25 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response containing data records.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: retrieveKNextDataRecords()", timestamp)
-
         grpc_response = et_service_pb2.RetrieveKNextDataRecords.Response()
-        grpc_response.success = False
 
-        db_user = db.get_user(user_id=request.userId)
-        db_target_user = db.get_user(email=request.targetEmail)
-        db_target_campaign = db.get_campaign(campaign_id=request.targetCampaignId)
-        db_data_source = db.get_data_source(data_source_id=request.targetDataSourceId)
+        # target lookups run while the requester is authenticated
+        target_user_future = db.get_user_async(email=request.targetEmail)
+        target_campaign_future = db.get_campaign_async(
+            campaign_id=request.targetCampaignId
+        )
+        data_source_future = db.get_data_source_async(
+            data_source_id=request.targetDataSourceId
+        )
+        db_user = self._authenticate(request, context)
+        db_target_user = target_user_future.result()
+        db_target_campaign = target_campaign_future.result()
+        db_data_source = data_source_future.result()
 
         if (
-            None not in [db_user, db_target_user, db_target_campaign, db_data_source]
-            and db_user.sessionKey == request.sessionKey
+            db_target_user is not None
+            and db_target_campaign is not None
+            and db_data_source is not None
             and request.k <= settings.MAX_K_RECORDS
             and (
                 db_user.id == db_target_campaign.creatorId
@@ -714,16 +773,10 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
                 from_timestamp=request.fromTimestamp,
                 k=request.k,
             )
-            for data_record in data_records:
-                grpc_response.timestamp.extend([data_record.timestamp])
-                grpc_response.value.extend([data_record.value])
+            grpc_response.timestamp.extend(r.timestamp for r in data_records)
+            grpc_response.value.extend(r.value for r in data_records)
             grpc_response.success = True
 
-        logger.info(
-            "%s: retrieveKNextDataRecords() - success = %s",
-            timestamp,
-            grpc_response.success,
-        )
         return grpc_response
 
     def retrieveFilteredDataRecords(
@@ -739,21 +792,28 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response containing filtered data records.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: retrieveFilteredDataRecords()", timestamp)
-
         grpc_response = et_service_pb2.RetrieveFilteredDataRecords.Response()
-        grpc_response.success = False
 
-        db_user = db.get_user(user_id=request.userId)
-        db_target_user = db.get_user(email=request.targetEmail)
-        db_target_campaign = db.get_campaign(campaign_id=request.targetCampaignId)
-        db_data_source = db.get_data_source(data_source_id=request.targetDataSourceId)
+        user_future = db.get_user_async(user_id=request.userId)
+        target_user_future = db.get_user_async(email=request.targetEmail)
+        target_campaign_future = db.get_campaign_async(
+            campaign_id=request.targetCampaignId
+        )
+        data_source_future = db.get_data_source_async(
+            data_source_id=request.targetDataSourceId
+        )
+        db_user = user_future.result()
+        db_target_user = target_user_future.result()
+        db_target_campaign = target_campaign_future.result()
+        db_data_source = data_source_future.result()
         from_timestamp = request.fromTimestamp
         till_timestamp = request.tillTimestamp
 
         if (
-            None not in [db_user, db_target_user, db_target_campaign, db_data_source]
+            db_user is not None
+            and db_target_user is not None
+            and db_target_campaign is not None
+            and db_data_source is not None
             and db.user_is_bound_to_campaign(
                 db_user=db_target_user, db_campaign=db_target_campaign
             )
@@ -765,70 +825,124 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
                 from_timestamp=from_timestamp,
                 till_timestamp=till_timestamp,
             )
+            data_source_ids, timestamps, values = [], [], []
             for data_record in data_records:
-                grpc_response.dataSource.extend([data_record.dataSourceId])
-                grpc_response.timestamp.extend([data_record.timestamp])
-                value = data_record.value
-                if request.simplifyIfTooLarge and len(value) > 500:
-                    value = bytes(f"[{len(value)}] bytes", "utf8")
-                grpc_response.value.extend([value])
+                data_source_ids.append(data_record.dataSourceId)
+                timestamps.append(data_record.timestamp)
+                values.append(data_record.value)
+            grpc_response.dataSource.extend(data_source_ids)
+            grpc_response.timestamp.extend(timestamps)
+            max_size = settings.MAX_SIMPLIFIED_VALUE_SIZE
+            if request.simplifyIfTooLarge and any(len(v) > max_size for v in values):
+                values = [
+                    b"[%d] bytes" % len(v) if len(v) > max_size else v for v in values
+                ]
+            grpc_response.value.extend(values)
             grpc_response.success = True
 
-        logger.info(
-            "%s: retrieveFilteredDataRecords() - success = %s",
-            timestamp,
-            grpc_response.success,
-        )
         return grpc_response
 
     def downloadDumpfile(
         self, request: Any, context: grpc.ServicerContext
     ) -> et_service_pb2.DownloadDumpfile.Response:
         """
-        Download a data dump file for a user.
+        Download a data dump file of a user in a single response.
 
         Args:
             request: DownloadDumpfile request.
             context: gRPC context.
 
         Returns:
-            Response containing the dump file data.
+            Response containing the whole dump file, or an unsuccessful
+            response if access is denied to an authenticated user.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: downloadDumpfile()", timestamp)
+        file_path = self._dump_data(request, context)
+        if file_path is None:
+            return DOWNLOAD_DUMPFILE_FAIL_RESPONSE
 
-        grpc_response = et_service_pb2.DownloadDumpfile.Response()
-        grpc_response.success = False
+        try:
+            with open(file_path, "rb") as dump_file:
+                return et_service_pb2.DownloadDumpfile.Response(
+                    success=True, dump=dump_file.read()
+                )
+        finally:
+            os.remove(file_path)
 
-        db_user = db.get_user(user_id=request.userId)
-        db_campaign = db.get_campaign(campaign_id=request.campaignId)
-        db_target_user = db.get_user(email=request.targetEmail)
+    def downloadDumpfileStream(
+        self, request: Any, context: grpc.ServicerContext
+    ) -> Iterator[et_service_pb2.DownloadDumpfile.Response]:
+        """
+        Stream a data dump file of a user in chunks.
 
-        if (
-            None not in [db_user, db_campaign, db_target_user]
-            and db_user.sessionKey == request.sessionKey
+        Args:
+            request: DownloadDumpfile request.
+            context: gRPC context.
+
+        Yields:
+            Responses each carrying a chunk of at most `settings.DUMP_CHUNK_SIZE`
+            bytes, or a single unsuccessful response if access is denied
+            to an authenticated user.
+        """
+        file_path = self._dump_data(request, context)
+        if file_path is None:
+            yield DOWNLOAD_DUMPFILE_FAIL_RESPONSE
+            return
+
+        try:
+            with open(file_path, "rb") as dump_file:
+                # an empty dump still gets one (empty) successful response
+                chunk = dump_file.read(settings.DUMP_CHUNK_SIZE)
+                while True:
+                    yield et_service_pb2.DownloadDumpfile.Response(
+                        success=True, dump=chunk
+                    )
+                    chunk = dump_file.read(settings.DUMP_CHUNK_SIZE)
+                    if not chunk:
+                        break
+        finally:
+            os.remove(file_path)
+
+    def _dump_data(
+        self, request: Any, context: grpc.ServicerContext
+    ) -> Optional[str]:
+        """
+        Authenticate the user and dump the requested data into a file.
+
+        Shared by the unary and the streaming RPCs. The caller removes the
+        file once it has been sent.
+
+        Args:
+            request: DownloadDumpfile request.
+            context: gRPC context.
+
+        Returns:
+            Path of the dump file, or None if access is denied.
+        """
+        # target lookups run while the requester is authenticated
+        campaign_future = db.get_campaign_async(campaign_id=request.campaignId)
+        target_user_future = db.get_user_async(email=request.targetEmail)
+        db_user = self._authenticate(request, context)
+        db_campaign = campaign_future.result()
+        db_target_user = target_user_future.result()
+
+        if not (
+            db_campaign is not None
+            and db_target_user is not None
             and db_campaign.creatorId == db_user.id
             and db.user_is_bound_to_campaign(
                 db_user=db_target_user, db_campaign=db_campaign
             )
         ):
-            file_path = db.dump_data(db_campaign=db_campaign, db_user=db_target_user)
-            with open(file_path, "rb") as dump_file:
-                grpc_response.dump = bytes(dump_file.read())
-            os.remove(file_path)
-            grpc_response.success = True
+            return None
 
-        logger.info(
-            "%s: downloadDumpfile() - success = %s", timestamp, grpc_response.success
-        )
-        return grpc_response
+        return db.dump_data(db_campaign=db_campaign, db_user=db_target_user)
 
     # ==========================================================================
     # Statistics Module
     # ==========================================================================
 
-    def submitHeartbeat(
-        self, request: Any, context: grpc.ServicerContext
+    async def submitHeartbeat(
+        self, request: Any, context: grpc.aio.ServicerContext
     ) -> et_service_pb2.SubmitHeartbeat.Response:
         """
         Submit a heartbeat from a participant.
@@ -840,20 +954,14 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response indicating success or failure.
         """
-        grpc_response = et_service_pb2.SubmitHeartbeat.Response()
-        grpc_response.success = False
-
-        db_user = db.get_user(user_id=request.userId)
-        db_campaign = db.get_campaign(campaign_id=request.campaignId)
+        authorized, db_user, db_campaign = await db.authorize_participant_async(
+            user_id=request.userId, campaign_id=request.campaignId
+        )
 
-        if (
-            None not in [db_user, db_campaign]
-            and db.user_is_bound_to_campaign(db_user=db_user, db_campaign=db_campaign)
-        ):
+        if authorized:
             db.update_user_heartbeat_timestamp(db_user=db_user, db_campaign=db_campaign)
-            grpc_response.success = True
-
-        return grpc_response
+            return HEARTBEAT_OK_RESPONSE
+        return HEARTBEAT_FAIL_RESPONSE
 
     def retrieveParticipantStats(
         self, request: Any, context: grpc.ServicerContext
@@ -868,57 +976,43 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response containing participant statistics.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: retrieveParticipantStats()", timestamp)
-
         grpc_response = et_service_pb2.RetrieveParticipantStats.Response()
-        grpc_response.success = False
-
-        db_user = db.get_user(user_id=request.userId)
-        db_target_campaign = db.get_campaign(campaign_id=request.targetCampaignId)
-        db_target_user = db.get_user(email=request.targetEmail)
 
-        if (
-            None not in [db_user, db_target_user, db_target_campaign]
-            and db_user.sessionKey == request.sessionKey
-            and db.user_is_bound_to_campaign(
-                db_user=db_target_user, db_campaign=db_target_campaign
-            )
-        ):
-            grpc_response.campaignJoinTimestamp = db.get_participant_join_timestamp(
-                db_user=db_target_user, db_campaign=db_target_campaign
-            )
-            grpc_response.lastSyncTimestamp = db.get_participant_last_sync_timestamp(
+        # target lookups run while the requester is authenticated
+        target_campaign_future = db.get_campaign_async(
+            campaign_id=request.targetCampaignId
+        )
+        target_user_future = db.get_user_async(email=request.targetEmail)
+        self._authenticate(request, context)
+        db_target_campaign = target_campaign_future.result()
+        db_target_user = target_user_future.result()
+
+        if db_target_user is not None and db_target_campaign is not None:
+            # None if the target user is not bound to the campaign
+            participant_stats = db.get_participant_stats(
                 db_user=db_target_user, db_campaign=db_target_campaign
             )
+        else:
+            participant_stats = None
+
+        if participant_stats is not None:
+            grpc_response.campaignJoinTimestamp = participant_stats.join_timestamp
+            grpc_response.lastSyncTimestamp = participant_stats.last_sync_timestamp
             grpc_response.lastHeartbeatTimestamp = (
-                db.get_participant_heartbeat_timestamp(
-                    db_user=db_target_user, db_campaign=db_target_campaign
-                )
+                participant_stats.last_heartbeat_timestamp
             )
             grpc_response.amountOfSubmittedDataSamples = (
-                db.get_participants_amount_of_data(
-                    db_user=db_target_user, db_campaign=db_target_campaign
-                )
+                participant_stats.amount_of_data
+            )
+            grpc_response.dataSourceId.extend(participant_stats.data_source_ids)
+            grpc_response.perDataSourceAmountOfData.extend(
+                participant_stats.amounts_of_samples
+            )
+            grpc_response.perDataSourceLastSyncTimestamp.extend(
+                participant_stats.sync_timestamps
             )
-
-            for (
-                data_source,
-                amount_of_data,
-                last_sync_time,
-            ) in db.get_participants_per_data_source_stats(
-                db_user=db_target_user, db_campaign=db_target_campaign
-            ):
-                grpc_response.dataSourceId.extend([data_source.id])
-                grpc_response.perDataSourceAmountOfData.extend([amount_of_data])
-                grpc_response.perDataSourceLastSyncTimestamp.extend([last_sync_time])
             grpc_response.success = True
 
-        logger.info(
-            "%s: retrieveParticipantStats() - success = %s",
-            timestamp,
-            grpc_response.success,
-        )
         return grpc_response
 
     # ==========================================================================
@@ -938,19 +1032,14 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response with message ID if successful.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: submitDirectMessage()", timestamp)
-
         grpc_response = et_service_pb2.SubmitDirectMessage.Response()
-        grpc_response.success = False
 
-        db_source_user = db.get_user(user_id=request.userId)
-        db_target_user = db.get_user(email=request.targetEmail)
+        # the target lookup runs while the sender is authenticated
+        target_user_future = db.get_user_async(email=request.targetEmail)
+        db_source_user = self._authenticate(request, context)
+        db_target_user = target_user_future.result()
 
-        if (
-            None not in [db_source_user, db_target_user]
-            and db_source_user.sessionKey == request.sessionKey
-        ):
+        if db_target_user is not None:
             db_direct_message = db.create_direct_message(
                 db_source_user=db_source_user,
                 db_target_user=db_target_user,
@@ -960,9 +1049,6 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
             grpc_response.success = True
             grpc_response.id = db_direct_message.id
 
-        logger.info(
-            "%s: submitDirectMessage() - success = %s", timestamp, grpc_response.success
-        )
         return grpc_response
 
     def retrieveUnreadDirectMessages(
@@ -978,31 +1064,85 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response containing unread messages.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: retrieveUnreadDirectMessages()", timestamp)
-
         grpc_response = et_service_pb2.RetrieveUnreadDirectMessages.Response()
-        grpc_response.success = False
 
-        db_user = db.get_user(user_id=request.userId)
+        for db_direct_messages, db_senders in self._unread_direct_message_chunks(
+            request, context
+        ):
+            # one extend per repeated field and chunk instead of one per message
+            grpc_response.id.extend(
+                db_direct_message.id for db_direct_message in db_direct_messages
+            )
+            grpc_response.sourceEmail.extend(
+                db_senders[db_direct_message.sourceUserId].email
+                for db_direct_message in db_direct_messages
+            )
+            grpc_response.timestamp.extend(
+                db_direct_message.timestamp for db_direct_message in db_direct_messages
+            )
+            grpc_response.subject.extend(
+                db_direct_message.subject for db_direct_message in db_direct_messages
+            )
+            grpc_response.content.extend(
+                db_direct_message.content for db_direct_message in db_direct_messages
+            )
+        grpc_response.success = True
+
+        return grpc_response
+
+    def retrieveUnreadDirectMessagesStream(
+        self, request: Any, context: grpc.ServicerContext
+    ) -> Iterator[et_service_pb2.RetrieveUnreadDirectMessages.Response]:
+        """
+        Stream unread direct messages for a user, one message per response.
 
-        if db_user is not None and db_user.sessionKey == request.sessionKey:
-            for db_direct_message in db.get_unread_direct_messages(db_user=db_user):
-                grpc_response.id.extend([db_direct_message.id])
-                grpc_response.sourceEmail.extend(
-                    [db.get_user(user_id=db_direct_message.sourceUserId).email]
+        Args:
+            request: RetrieveUnreadDirectMessages request.
+            context: gRPC context.
+
+        Yields:
+            Responses each carrying a single unread message.
+        """
+        for db_direct_messages, db_senders in self._unread_direct_message_chunks(
+            request, context
+        ):
+            for db_direct_message in db_direct_messages:
+                yield et_service_pb2.RetrieveUnreadDirectMessages.Response(
+                    success=True,
+                    id=[db_direct_message.id],
+                    sourceEmail=[db_senders[db_direct_message.sourceUserId].email],
+                    timestamp=[db_direct_message.timestamp],
+                    subject=[db_direct_message.subject],
+                    content=[db_direct_message.content],
                 )
-                grpc_response.timestamp.extend([db_direct_message.timestamp])
-                grpc_response.subject.extend([db_direct_message.subject])
-                grpc_response.content.extend([db_direct_message.content])
-            grpc_response.success = True
 
-        logger.info(
-            "%s: retrieveUnreadDirectMessages() - success = %s",
-            timestamp,
-            grpc_response.success,
-        )
-        return grpc_response
+    def _unread_direct_message_chunks(
+        self, request: Any, context: grpc.ServicerContext
+    ) -> Iterator[Tuple[List[Any], Dict[int, Any]]]:
+        """
+        Authenticate the user and read their unread direct messages in chunks.
+
+        Shared by the unary and the streaming RPCs. Each chunk holds up to
+        `settings.DB_FETCH_SIZE` messages, whose senders are looked up with
+        a single query, and is handed on as soon as it has been read.
+
+        Args:
+            request: RetrieveUnreadDirectMessages request.
+            context: gRPC context.
+
+        Yields:
+            Tuples of (messages, senders by user ID).
+        """
+        db_user = self._authenticate(request, context)
+
+        db_direct_messages = db.get_unread_direct_messages(db_user=db_user)
+        while True:
+            chunk = list(itertools.islice(db_direct_messages, settings.DB_FETCH_SIZE))
+            if not chunk:
+                return
+            yield chunk, db.get_users(
+                [db_direct_message.sourceUserId for db_direct_message in chunk]
+            )
 
     def submitNotification(
         self, request: Any, context: grpc.ServicerContext
@@ -1035,30 +1175,76 @@ class ETServiceServicer(et_service_pb2_grpc.ETServiceServicer):
         Returns:
             Response containing unread notifications.
         """
-        timestamp = int(time.time() * 1000)
-        logger.info("%s: retrieveUnreadNotifications()", timestamp)
-
         grpc_response = et_service_pb2.RetrieveUnreadNotifications.Response()
-        grpc_response.success = False
 
-        db_user = db.get_user(user_id=request.userId)
-
-        if db_user is not None and db_user.sessionKey == request.sessionKey:
-            for notification in db.get_unread_notifications(db_user=db_user):
-                grpc_response.id.extend([notification.id])
-                grpc_response.campaignId.extend([notification.campaignId])
-                grpc_response.timestamp.extend([notification.timestamp])
-                grpc_response.subject.extend([notification.subject])
-                grpc_response.content.extend([notification.content])
-            grpc_response.success = True
+        for notifications in self._unread_notification_chunks(request, context):
+            # one extend per repeated field and chunk instead of one per notification
+            grpc_response.id.extend(notification.id for notification in notifications)
+            grpc_response.campaignId.extend(
+                notification.campaignId for notification in notifications
+            )
+            grpc_response.timestamp.extend(
+                notification.timestamp for notification in notifications
+            )
+            grpc_response.subject.extend(
+                notification.subject for notification in notifications
+            )
+            grpc_response.content.extend(
+                notification.content for notification in notifications
+            )
+        grpc_response.success = True
 
-        logger.info(
-            "%s: retrieveUnreadNotifications() - success = %s",
-            timestamp,
-            grpc_response.success,
-        )
         return grpc_response
 
+    def retrieveUnreadNotificationsStream(
+        self, request: Any, context: grpc.ServicerContext
+    ) -> Iterator[et_service_pb2.RetrieveUnreadNotifications.Response]:
+        """
+        Stream unread notifications for a user, one notification per response.
+
+        Args:
+            request: RetrieveUnreadNotifications request.
+            context: gRPC context.
+
+        Yields:
+            Responses each carrying a single unread notification.
+        """
+        for notifications in self._unread_notification_chunks(request, context):
+            for notification in notifications:
+                yield et_service_pb2.RetrieveUnreadNotifications.Response(
+                    success=True,
+                    id=[notification.id],
+                    campaignId=[notification.campaignId],
+                    timestamp=[notification.timestamp],
+                    subject=[notification.subject],
+                    content=[notification.content],
+                )
+
+    def _unread_notification_chunks(
+        self, request: Any, context: grpc.ServicerContext
+    ) -> Iterator[List[Any]]:
+        """
+        Authenticate the user and read their unread notifications in chunks.
+
+        Shared by the unary and the streaming RPCs. Each chunk holds up to
+        `settings.DB_FETCH_SIZE` notifications and is handed on as soon as
+        it has been read.
+
+        Args:
+            request: RetrieveUnreadNotifications request.
+            context: gRPC context.
+
+        Yields:
+            Lists of notifications.
+        """
+        db_user = self._authenticate(request, context)
+
+        notifications = db.get_unread_notifications(db_user=db_user)
+        while True:
+            chunk = list(itertools.islice(notifications, settings.DB_FETCH_SIZE))
+            if not chunk:
+                return
+            yield chunk
 
 def main() -> None:
     """
@@ -1067,38 +1253,46 @@ def main() -> None:
     Initializes the database connection, creates the gRPC server,
     and starts listening for requests.
     """
-    # Wait for database to be ready
-    wait_db = True
-    while wait_db:
+    # Wait for database to be ready, backing off exponentially (with jitter, so
+    # that servers restarted together do not retry in lockstep)
+    delay = settings.DB_CONNECT_INITIAL_DELAY_SECONDS
+    while True:
         try:
             session = db.get_cassandra_session()
-            if session is None:
-                time.sleep(5)
-                logger.info("Waiting for DB to boot up...")
-                continue
-
-            wait_db = False
-            res = session.execute(
-                "select count(*) from system_schema.keyspaces where keyspace_name='et';"
-            )
-            init_necessary = res.one()[0] == 0
-
-            if init_necessary:
-                logger.info("DB initialization necessary, initializing now...")
-                with open("assets/schema.cql", "r", encoding="utf-8") as schema_file:
-                    cql = schema_file.read()
-
-                for stmt in cql.split(";"):
-                    stmt = stmt.strip()
-                    if stmt:
-                        session.execute(stmt)
-
+            num_tables = session.execute(
+                "select count(*) from system_schema.tables "
+                "where keyspace_name in ('et', 'stats');"
+            ).one()[0]
+            num_indexes = session.execute(
+                "select count(*) from system_schema.indexes "
+                "where keyspace_name in ('et', 'stats');"
+            ).one()[0]
+            break
         except (UnresolvableContactPoints, NoHostAvailable):
-            time.sleep(5)
             logger.info("Waiting for DB to boot up...")
+            time.sleep(random.uniform(delay / 2, delay))
+            delay = min(delay * 2, settings.DB_CONNECT_MAX_DELAY_SECONDS)
+
+    # the schema is idempotent, so a partially created or older one is completed
+    if num_tables < sum(
+        stmt.startswith("create table") for stmt in schema_stmts.STATEMENTS
+    ) or num_indexes < sum(
+        stmt.startswith("create index") for stmt in schema_stmts.STATEMENTS
+    ):
+        logger.info("DB initialization necessary, initializing now...")
+        db.create_schema(schema_stmts.STATEMENTS)
 
     logger.info("DB is ready! Booting server now...")
 
+    protobuf_implementation = api_implementation.Type()
+    if protobuf_implementation == "python":
+        logger.warning(
+            "Pure-Python protobuf runtime in use, set "
+            "PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION=cpp for faster encoding"
+        )
+    else:
+        logger.info("Protobuf runtime: %s", protobuf_implementation)
+
     # Ensure download directory exists
     if not os.path.exists(settings.download_dir):
         os.mkdir(settings.download_dir)
@@ -1109,44 +1303,103 @@ def main() -> None:
         settings.download_dir,
     )
 
-    # Configure gRPC server options
-    grpc_options = [
-        ("grpc.max_send_message_length", settings.MAX_MESSAGE_LENGTH),
-        ("grpc.max_receive_message_length", settings.MAX_MESSAGE_LENGTH),
-        ("grpc.keepalive_time_ms", settings.GRPC_KEEPALIVE_TIME_MS),
-        ("grpc.keepalive_timeout_ms", settings.GRPC_KEEPALIVE_TIMEOUT_MS),
-        ("grpc.keepalive_permit_without_calls", True),
-        ("grpc.http2.max_pings_without_data", 0),
-        ("grpc.http2.min_time_between_pings_ms", settings.GRPC_KEEPALIVE_TIME_MS),
-        (
-            "grpc.http2.min_ping_interval_without_data_ms",
-            settings.GRPC_MIN_PING_INTERVAL_MS,
-        ),
+    # Each process opens its own Cassandra connection after forking
+    db.end()
+
+    workers = [
+        multiprocessing.Process(target=serve)
+        for _ in range(settings.GRPC_SERVER_PROCESSES)
     ]
+    for worker in workers:
+        worker.start()
+    logger.info(
+        "Started %d gRPC server processes on port %d.",
+        len(workers),
+        settings.GRPC_SERVER_PORT,
+    )
+
+    # Pass SIGTERM (e.g. from `docker stop`) on to the workers, which then
+    # shut down gracefully; installed after forking so workers keep their own
+    def terminate_workers(signum: int, frame: Any) -> None:
+        for worker in workers:
+            worker.terminate()
+
+    signal.signal(signal.SIGTERM, terminate_workers)
 
+    # Keep server running until the workers have exited
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.join()
+    logger.info("Server has stopped.")
+
+
+def serve() -> None:
+    """
+    Run a single gRPC server process.
+
+    Several processes bind the same port with SO_REUSEPORT and the kernel
+    load-balances incoming connections between them, so request handling
+    is not bound to a single interpreter's GIL.
+    """
+    try:
+        asyncio.run(serve_async())
+    except KeyboardInterrupt:
+        pass
+
+
+async def serve_async() -> None:
+    """
+    Run the asyncio gRPC server until it is terminated.
+
+    The hot ingestion handlers are coroutines awaiting Cassandra futures on
+    the event loop; the remaining, blocking handlers run on the migration
+    thread pool.
+    """
     # Create gRPC server
-    server = grpc.server(
-        futures.ThreadPoolExecutor(max_workers=settings.MAX_GRPC_WORKERS),
-        options=grpc_options,
+    server = grpc.aio.server(
+        migration_thread_pool=futures.ThreadPoolExecutor(
+            max_workers=settings.MAX_GRPC_WORKERS
+        ),
+        options=GRPC_OPTIONS,
+        interceptors=[LoggingInterceptor()],
+        maximum_concurrent_rpcs=settings.MAX_CONCURRENT_RPCS,
+        compression=grpc.Compression.Gzip,
     )
 
     # Add service to server
     et_service_pb2_grpc.add_ETServiceServicer_to_server(ETServiceServicer(), server)
+    db.prepare_hot_queries()
 
     # Start server
-    server_port = 50051
-    logger.info("Starting gRPC server on port %d.", server_port)
-    server.add_insecure_port(f"0.0.0.0:{server_port}")
-    server.start()
+    logger.info(
+        "Starting gRPC server on port %d (pid %d).",
+        settings.GRPC_SERVER_PORT,
+        os.getpid(),
+    )
+    server.add_insecure_port(f"0.0.0.0:{settings.GRPC_SERVER_PORT}")
+    await server.start()
+
+    # On SIGTERM stop accepting RPCs and let in-flight ones finish; this ends
+    # wait_for_termination() below, so that queued records are still flushed
+    asyncio.get_running_loop().add_signal_handler(
+        signal.SIGTERM,
+        lambda: asyncio.ensure_future(
+            server.stop(settings.GRPC_SHUTDOWN_GRACE_SECONDS)
+        ),
+    )
 
     # Keep server running
     try:
-        while True:
-            time.sleep(86400)
-    except KeyboardInterrupt:
-        server.stop(0)
+        await server.wait_for_termination()
+    finally:
+        await server.stop(0)
+        utils.stop_credentials_refresher()
+        record_writer.get_writer_pool().flush()
+        db.close_data_files()
         db.end()
-        logger.info("Server has stopped.")
 
 
 if __name__ == "__main__":
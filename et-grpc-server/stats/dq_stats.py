@@ -4,28 +4,54 @@ Data Quality Statistics Module.
 This module provides background jobs for monitoring and updating
 data quality statistics for campaigns.
 """
-import json
 import logging
 import os
-import subprocess
 import threading
 import time
-from typing import Any, Dict, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from cassandra.query import BatchStatement, BatchType
 
 from tools import db_mgr as db
-from tools import utils
 
 # Configure module logger
 logger = logging.getLogger(__name__)
 
-# Thread tracking dictionaries
-campaign_stats_threads: Dict[int, threading.Thread] = {}
-campaign_backup_threads: Dict[int, threading.Thread] = {}
+# Background work tracking, keyed by campaign ID
+campaign_backup_jobs: Dict[int, "Future[None]"] = {}
+
+# Set to stop the background routines
+_stop = threading.Event()
 
 # Constants
 STATS_CHECK_INTERVAL_SECONDS: int = 10
 BACKUP_INTERVAL_SECONDS: int = 2 * 60
 QUERY_TIMEOUT_SECONDS: float = 300.0
+BACKUP_DIR: str = "/root/EasyTrack_Platform/data"
+BACKUP_FETCH_SIZE: int = 10000
+BACKUP_BUFFER_SIZE: int = 1 << 20
+BACKUP_WORKERS: int = 4
+
+# Runs the campaign backups, at most BACKUP_WORKERS at a time
+_backup_pool = ThreadPoolExecutor(
+    max_workers=BACKUP_WORKERS, thread_name_prefix="dq-backup"
+)
+
+#: Statements of the amounts of data routine, prepared on first use
+CQL_CAMPAIGN_STATS_KEYS = (
+    'select "userId", "dataSourceId" from "stats"."perDataSourceStats" '
+    'where "campaignId"=?;'
+)
+CQL_INSERT_DATA_SOURCE_STATS = (
+    'insert into "stats"."perDataSourceStats"("campaignId", "userId", "dataSourceId") '
+    "values (?,?,?);"
+)
+CQL_UPDATE_DATA_SOURCE_STATS = (
+    'update "stats"."perDataSourceStats" '
+    'set "syncTimestamp" = ?, "amountOfSamples" = ? '
+    'where "campaignId"=? and "userId"=? and "dataSourceId"=?;'
+)
 
 
 def start_background_jobs() -> None:
@@ -35,10 +61,53 @@ def start_background_jobs() -> None:
     Starts threads for:
     - Amount of data routine (checks data submission stats)
     """
+    _stop.clear()
     threading.Thread(target=amounts_of_data_routine, daemon=True).start()
     logger.info("Background data quality jobs started")
 
 
+def stop_background_jobs() -> None:
+    """
+    Ask the background routines to stop once their current cycle is done.
+    """
+    _stop.set()
+
+
+def _wait_for_next_cycle(deadline: float, interval: float) -> Optional[float]:
+    """
+    Wait until the next cycle of a periodic routine is due.
+
+    Cycles are scheduled at fixed intervals from the previous deadline, so
+    the time spent doing the work does not stretch the period. A cycle that
+    overran its interval starts the next one right away, rescheduled from
+    now.
+
+    Args:
+        deadline: Monotonic time at which the current cycle was due.
+        interval: Period of the routine, in seconds.
+
+    Returns:
+        Monotonic time at which the next cycle is due, or None if the
+        routines are being stopped.
+    """
+    deadline = max(deadline + interval, time.monotonic())
+    if _stop.wait(max(0.0, deadline - time.monotonic())):
+        return None
+    return deadline
+
+
+def _log_backup_error(backup_job: "Future[None]") -> None:
+    """
+    Log the exception of a failed campaign backup, if any.
+
+    Args:
+        backup_job: Completed backup job.
+    """
+    exc = backup_job.exception()
+    if exc is not None:
+        logger.error("DQ: Campaign backup failed", exc_info=exc)
+
+
 def amounts_of_data_routine() -> None:
     """
     Background routine to update data amount statistics.
@@ -49,108 +118,132 @@ def amounts_of_data_routine() -> None:
     logger.info("Starting amounts_of_data_routine...")
 
     def _update_campaign_stats(
+        session: Any,
         db_campaign: Any,
         db_participants: List[Any],
         db_data_sources: List[Any],
     ) -> None:
         """Update statistics for a single campaign."""
-        session = db.get_cassandra_session(maintenance=True)
-
-        for db_user in db_participants:
-            if db_user is None:
-                continue
-
-            for db_data_source in db_data_sources:
-                if db_data_source is None:
-                    continue
-
-                # Check if stats record exists
-                exists = (
-                    session.execute(
-                        'select count(*) from "stats"."perDataSourceStats" '
-                        'where "campaignId"=%s and "userId"=%s and "dataSourceId"=%s '
-                        "allow filtering;",
-                        (db_campaign.id, db_user.id, db_data_source.id),
-                        timeout=QUERY_TIMEOUT_SECONDS,
-                    ).one()[0]
-                    > 0
-                )
+        data_source_ids = tuple(
+            db_data_source.id
+            for db_data_source in db_data_sources
+            if db_data_source is not None
+        )
+        if not data_source_ids:
+            return
+        insert_statement = db.prepare(CQL_INSERT_DATA_SOURCE_STATS)
+        update_statement = db.prepare(CQL_UPDATE_DATA_SOURCE_STATS)
+
+        # Existing stats records of the whole campaign, in one query
+        existing_stats = {
+            (row.userId, row.dataSourceId)
+            for row in session.execute(
+                db.prepare(CQL_CAMPAIGN_STATS_KEYS),
+                (db_campaign.id,),
+                timeout=QUERY_TIMEOUT_SECONDS,
+            )
+        }
 
+        # Sample count and last timestamp per data source, aggregated by
+        # Cassandra with one query per participant; all queries are in flight
+        # at once, and data sources without samples have no row
+        db_users = [db_user for db_user in db_participants if db_user is not None]
+        amount_futures = [
+            session.execute_async(
+                db.prepare_data_query(
+                    db.CQL_AMOUNTS_PER_DATA_SOURCE, db_campaign.id, db_user.id
+                ),
+                (list(data_source_ids),),
+                timeout=QUERY_TIMEOUT_SECONDS,
+            )
+            for db_user in db_users
+        ]
+
+        batch_futures = []
+        for db_user, amount_future in zip(db_users, amount_futures):
+            amounts_per_data_source = {
+                row.dataSourceId: (row.amount, row.lastTimestamp)
+                for row in amount_future.result()
+            }
+
+            # All statements target the campaign's stats partition
+            batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+            for data_source_id in data_source_ids:
                 # Create stats record if needed
-                if not exists:
-                    session.execute(
-                        'insert into "stats"."perDataSourceStats"'
-                        '("campaignId", "userId", "dataSourceId") '
-                        "values (%s,%s,%s);",
-                        (db_campaign.id, db_user.id, db_data_source.id),
+                if (db_user.id, data_source_id) not in existing_stats:
+                    batch.add(
+                        insert_statement, (db_campaign.id, db_user.id, data_source_id)
                     )
 
-                # Get all timestamps for this data source
-                timestamps = session.execute(
-                    f'select "timestamp" from "data"."cmp{db_campaign.id}_usr{db_user.id}" '
-                    'where "dataSourceId"=%s allow filtering;',
-                    (db_data_source.id,),
-                    timeout=QUERY_TIMEOUT_SECONDS,
-                ).all()
-
-                total_amount_of_samples = len(timestamps)
-                last_sync_timestamp = (
-                    0
-                    if total_amount_of_samples == 0
-                    else max(timestamps, key=lambda x: x.timestamp).timestamp
+                amount, last_timestamp = amounts_per_data_source.get(
+                    data_source_id, (0, 0)
                 )
-
-                # Update stats
-                session.execute(
-                    'update "stats"."perDataSourceStats" '
-                    'set "syncTimestamp" = %s, "amountOfSamples" = %s '
-                    'where "campaignId"=%s and "userId"=%s and "dataSourceId"=%s;',
+                batch.add(
+                    update_statement,
                     (
-                        last_sync_timestamp,
-                        total_amount_of_samples,
+                        last_timestamp,
+                        amount,
                         db_campaign.id,
                         db_user.id,
-                        db_data_source.id,
+                        data_source_id,
                     ),
                 )
+            batch_futures.append(session.execute_async(batch))
+
+        for batch_future in batch_futures:
+            batch_future.result()
 
         logger.info(
-            "%s: DQ - Campaign %s amount of data check completed successfully",
-            utils.get_timestamp_ms(),
+            "DQ - Campaign %s amount of data check completed successfully",
             db_campaign.id,
         )
 
-    while True:
+    deadline = time.monotonic()
+    while deadline is not None:
         db_campaigns = db.get_campaigns(active_only=True)
 
-        # Pre-fetch participants and data sources for all campaigns
-        all_db_participants = {
-            db_campaign.id: db.get_campaign_participants(db_campaign=db_campaign)
+        # Participants and data sources of all campaigns, fetched in bulk
+        all_db_participants = db.get_campaigns_participants(
+            [db_campaign.id for db_campaign in db_campaigns]
+        )
+        # Data source IDs of each campaign
+        all_data_source_ids = {
+            db_campaign.id: db.get_config_data_source_ids(db_campaign.configJson)
             for db_campaign in db_campaigns
         }
+        # Data sources shared by several campaigns are read only once
+        db_data_sources_by_id = db.get_data_sources(
+            [
+                data_source_id
+                for data_source_ids in all_data_source_ids.values()
+                for data_source_id in data_source_ids
+            ]
+        )
         all_db_data_sources = {
-            db_campaign.id: [
-                db.get_data_source(data_source_id=config_json["data_source_id"])
-                for config_json in json.loads(s=db_campaign.configJson)
+            campaign_id: [
+                db_data_sources_by_id.get(data_source_id)
+                for data_source_id in data_source_ids
             ]
-            for db_campaign in db_campaigns
+            for campaign_id, data_source_ids in all_data_source_ids.items()
         }
 
-        # Process each campaign
+        # Process each campaign; the per-participant aggregations run on the
+        # analytics session, away from the RPC traffic
+        session = db.get_analytics_session()
         for db_campaign in db_campaigns:
             _update_campaign_stats(
+                session=session,
                 db_campaign=db_campaign,
                 db_participants=all_db_participants[db_campaign.id],
                 db_data_sources=all_db_data_sources[db_campaign.id],
             )
 
-        campaign_ids = ", ".join(str(c.id) for c in db_campaigns)
-        logger.info(
-            "%s: DQ - Checking amounts of data for campaigns: %s",
-            utils.get_timestamp_ms(),
-            campaign_ids,
-        )
-        time.sleep(STATS_CHECK_INTERVAL_SECONDS)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "DQ - Checking amounts of data for campaigns: %s",
+                ", ".join(str(db_campaign.id) for db_campaign in db_campaigns),
+            )
+        deadline = _wait_for_next_cycle(deadline, STATS_CHECK_INTERVAL_SECONDS)
 
 
 def backup_routine() -> None:
@@ -158,7 +251,7 @@ def backup_routine() -> None:
     Background routine to backup campaign data.
 
     Continuously backs up data for active campaigns by exporting
-    tables to CSV files. Runs every BACKUP_INTERVAL_SECONDS.
+    tables to CSV files through the driver. Runs every BACKUP_INTERVAL_SECONDS.
     """
     logger.info("Starting backup_routine...")
 
@@ -174,20 +267,40 @@ def backup_routine() -> None:
                 db_user.id,
             )
 
+            # Rows are streamed page by page into a temporary file, which
+            # replaces the previous backup once complete. The table is read
+            # one partition (data source) at a time, so that each query is
+            # routed straight to a replica holding it.
             table = f"cmp{db_campaign.id}_usr{db_user.id}"
-            filepath = f"/root/EasyTrack_Platform/data/{table}.csv"
-            query = f'copy "data"."{table}" to \'{filepath}\';'
-            query_path = "/root/EasyTrack_Platform/data/query.cqlsh"
-
-            with open(query_path, "w") as query_file:
-                query_file.write(query)
-
-            with open(os.devnull, "wb") as devnull:
-                subprocess.check_call(
-                    ["cqlsh", "-f", query_path],
-                    stdout=devnull,
-                    stderr=subprocess.STDOUT,
+            file_path = os.path.join(BACKUP_DIR, f"{table}.csv")
+            data_source_ids = [
+                row.dataSourceId
+                for row in db.execute_paged(
+                    f'select distinct "dataSourceId" from "data"."{table}";', ()
                 )
+            ]
+            with open(
+                f"{file_path}.tmp", "w", newline="", buffering=BACKUP_BUFFER_SIZE
+            ) as backup_file:
+                # Lines are collected and written a page at a time
+                lines: List[str] = []
+                for data_source_id in data_source_ids:
+                    for row in db.execute_paged(
+                        'select "dataSourceId", "timestamp", "value" '
+                        f'from "data"."{table}" where "dataSourceId"=?;',
+                        (data_source_id,),
+                        fetch_size=BACKUP_FETCH_SIZE,
+                    ):
+                        # same layout as cqlsh COPY TO: blobs as 0x-prefixed
+                        # hex, nulls as empty fields; none of the fields can
+                        # contain a delimiter, so no quoting is needed
+                        value = "" if row.value is None else "0x" + row.value.hex()
+                        lines.append(f"{row.dataSourceId},{row.timestamp},{value}\n")
+                        if len(lines) >= BACKUP_FETCH_SIZE:
+                            backup_file.write("".join(lines))
+                            lines.clear()
+                backup_file.write("".join(lines))
+            os.replace(f"{file_path}.tmp", file_path)
 
             logger.info(
                 "DQ: Campaign %s participant %s backup completed successfully",
@@ -195,40 +308,34 @@ def backup_routine() -> None:
                 db_user.id,
             )
 
-        logger.info(
-            "%s: DQ - Campaign %s backup completed successfully",
-            utils.get_timestamp_ms(),
-            db_campaign.id,
-        )
+        logger.info("DQ - Campaign %s backup completed successfully", db_campaign.id)
 
-    while True:
+    deadline = time.monotonic()
+    while deadline is not None:
         db_campaigns = db.get_campaigns(active_only=True)
 
-        all_db_participants = {
-            db_campaign.id: db.get_campaign_participants(db_campaign=db_campaign)
-            for db_campaign in db_campaigns
-        }
+        all_db_participants = db.get_campaigns_participants(
+            [db_campaign.id for db_campaign in db_campaigns]
+        )
 
         for db_campaign in db_campaigns:
             db_participants = all_db_participants[db_campaign.id]
 
-            # Skip if backup thread is already running
-            if (
-                db_campaign.id in campaign_backup_threads
-                and campaign_backup_threads[db_campaign.id].is_alive()
-            ):
+            # Skip if the previous backup is still queued or running
+            backup_job = campaign_backup_jobs.get(db_campaign.id)
+            if backup_job is not None and not backup_job.done():
                 continue
 
-            # Start new backup thread
-            campaign_backup_threads[db_campaign.id] = threading.Thread(
-                target=_backup_campaign, args=(db_campaign, db_participants)
+            backup_job = _backup_pool.submit(
+                _backup_campaign, db_campaign, db_participants
             )
-            campaign_backup_threads[db_campaign.id].start()
+            # unlike a thread, a failed job would otherwise fail silently
+            backup_job.add_done_callback(_log_backup_error)
+            campaign_backup_jobs[db_campaign.id] = backup_job
 
-        campaign_ids = ", ".join(str(c.id) for c in db_campaigns)
-        logger.info(
-            "%s: DQ - Backing up campaigns: %s",
-            utils.get_timestamp_ms(),
-            campaign_ids,
-        )
-        time.sleep(BACKUP_INTERVAL_SECONDS)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "DQ - Backing up campaigns: %s",
+                ", ".join(str(db_campaign.id) for db_campaign in db_campaigns),
+            )
+        deadline = _wait_for_next_cycle(deadline, BACKUP_INTERVAL_SECONDS)
@@ -5,10 +5,20 @@ This package provides utility functions and database management
 for the EasyTrack platform.
 
 Modules:
+    db_cache: In-process caches of frequently read database rows.
     db_mgr: Database management functions for Cassandra.
+    record_writer: Coalescing writer for single data records.
+    schema_stmts: Database schema statements (generated).
     utils: General utility functions.
     settings: Application configuration and settings.
 """
-from . import db_mgr, settings, utils
+from . import db_cache, db_mgr, record_writer, schema_stmts, settings, utils
 
-__all__ = ["db_mgr", "settings", "utils"]
+__all__ = [
+    "db_cache",
+    "db_mgr",
+    "record_writer",
+    "schema_stmts",
+    "settings",
+    "utils",
+]
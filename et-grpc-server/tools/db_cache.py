@@ -0,0 +1,274 @@
+"""
+In-process caches of frequently read database rows.
+
+Users, campaigns and data sources are looked up by almost every RPC and by
+the statistics routine, but rarely change; participant counts are listed
+with every campaign.
+Cached rows expire after `settings.DB_CACHE_TTL_SECONDS` and are dropped
+right away by the `db_mgr` functions that modify them. Invalidation is
+local to the process, so with several server processes another process
+may serve a stale row until it expires.
+"""
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from cachetools import TTLCache
+
+from tools import settings
+
+#: Users keyed by ID
+USER_BY_ID: TTLCache = TTLCache(
+    maxsize=settings.DB_CACHE_MAX_SIZE, ttl=settings.DB_CACHE_TTL_SECONDS
+)
+
+#: Users keyed by email address
+USER_BY_EMAIL: TTLCache = TTLCache(
+    maxsize=settings.DB_CACHE_MAX_SIZE, ttl=settings.DB_CACHE_TTL_SECONDS
+)
+
+#: Campaigns keyed by ID
+CAMPAIGN_BY_ID: TTLCache = TTLCache(
+    maxsize=settings.DB_CACHE_MAX_SIZE, ttl=settings.DB_CACHE_TTL_SECONDS
+)
+
+#: Data sources keyed by ID
+DATA_SOURCE_BY_ID: TTLCache = TTLCache(
+    maxsize=settings.DB_CACHE_MAX_SIZE, ttl=settings.DB_CACHE_TTL_SECONDS
+)
+
+#: Data sources keyed by name
+DATA_SOURCE_BY_NAME: TTLCache = TTLCache(
+    maxsize=settings.DB_CACHE_MAX_SIZE, ttl=settings.DB_CACHE_TTL_SECONDS
+)
+
+#: Participant counts keyed by campaign ID
+PARTICIPANT_COUNT_BY_CAMPAIGN_ID: TTLCache = TTLCache(
+    maxsize=settings.DB_CACHE_MAX_SIZE, ttl=settings.DB_CACHE_TTL_SECONDS
+)
+
+#: IDs of users whose session key has been verified, keyed by session key
+USER_ID_BY_SESSION_KEY: TTLCache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+# TTLCache is not thread-safe, and handlers run on a thread pool
+_lock = threading.Lock()
+
+
+def get_user(
+    user_id: Optional[int] = None, email: Optional[str] = None
+) -> Optional[Any]:
+    """
+    Get a cached user.
+
+    Args:
+        user_id: User's ID. Optional.
+        email: User's email address. Optional.
+
+    Returns:
+        Cached user record, or None on a cache miss.
+    """
+    with _lock:
+        if user_id is not None:
+            db_user = USER_BY_ID.get(user_id)
+            if db_user is not None and email is not None and db_user.email != email:
+                return None
+            return db_user
+        if email is not None:
+            return USER_BY_EMAIL.get(email)
+    return None
+
+
+def put_user(db_user: Optional[Any]) -> None:
+    """
+    Cache a user record.
+
+    Args:
+        db_user: User database object. None is ignored.
+    """
+    if db_user is None:
+        return
+    with _lock:
+        USER_BY_ID[db_user.id] = db_user
+        USER_BY_EMAIL[db_user.email] = db_user
+
+
+def invalidate_user(db_user: Any) -> None:
+    """
+    Drop a user from the cache.
+
+    Args:
+        db_user: User database object.
+    """
+    with _lock:
+        USER_BY_ID.pop(db_user.id, None)
+        USER_BY_EMAIL.pop(db_user.email, None)
+
+
+def get_campaign(campaign_id: int) -> Optional[Any]:
+    """
+    Get a cached campaign.
+
+    Args:
+        campaign_id: Campaign ID.
+
+    Returns:
+        Cached campaign record, or None on a cache miss.
+    """
+    with _lock:
+        return CAMPAIGN_BY_ID.get(campaign_id)
+
+
+def put_campaign(db_campaign: Optional[Any]) -> None:
+    """
+    Cache a campaign record.
+
+    Args:
+        db_campaign: Campaign database object. None is ignored.
+    """
+    if db_campaign is None:
+        return
+    with _lock:
+        CAMPAIGN_BY_ID[db_campaign.id] = db_campaign
+
+
+def invalidate_campaign(campaign_id: int) -> None:
+    """
+    Drop a campaign from the cache.
+
+    Args:
+        campaign_id: Campaign ID.
+    """
+    with _lock:
+        CAMPAIGN_BY_ID.pop(campaign_id, None)
+
+
+def get_data_source(
+    data_source_id: Optional[int] = None, name: Optional[str] = None
+) -> Optional[Any]:
+    """
+    Get a cached data source.
+
+    Args:
+        data_source_id: Data source ID. Optional.
+        name: Data source name. Optional.
+
+    Returns:
+        Cached data source record, or None on a cache miss.
+    """
+    with _lock:
+        if data_source_id is not None:
+            db_data_source = DATA_SOURCE_BY_ID.get(data_source_id)
+            if (
+                db_data_source is not None
+                and name is not None
+                and db_data_source.name != name
+            ):
+                return None
+            return db_data_source
+        if name is not None:
+            return DATA_SOURCE_BY_NAME.get(name)
+    return None
+
+
+def put_data_source(db_data_source: Optional[Any]) -> None:
+    """
+    Cache a data source record.
+
+    Args:
+        db_data_source: Data source database object. None is ignored.
+    """
+    if db_data_source is None:
+        return
+    with _lock:
+        DATA_SOURCE_BY_ID[db_data_source.id] = db_data_source
+        DATA_SOURCE_BY_NAME[db_data_source.name] = db_data_source
+
+
+def invalidate_data_source(db_data_source: Any) -> None:
+    """
+    Drop a data source from the cache.
+
+    Args:
+        db_data_source: Data source database object.
+    """
+    with _lock:
+        DATA_SOURCE_BY_ID.pop(db_data_source.id, None)
+        DATA_SOURCE_BY_NAME.pop(db_data_source.name, None)
+
+
+def get_participant_counts(campaign_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Get cached participant counts.
+
+    Args:
+        campaign_ids: Campaign IDs.
+
+    Returns:
+        Participant counts keyed by campaign ID, for the cached campaigns only.
+    """
+    with _lock:
+        return {
+            campaign_id: PARTICIPANT_COUNT_BY_CAMPAIGN_ID[campaign_id]
+            for campaign_id in campaign_ids
+            if campaign_id in PARTICIPANT_COUNT_BY_CAMPAIGN_ID
+        }
+
+
+def put_participant_counts(counts: Dict[int, int]) -> None:
+    """
+    Cache participant counts.
+
+    Args:
+        counts: Participant counts keyed by campaign ID.
+    """
+    with _lock:
+        PARTICIPANT_COUNT_BY_CAMPAIGN_ID.update(counts)
+
+
+def invalidate_participant_count(campaign_id: int) -> None:
+    """
+    Drop a campaign's participant count from the cache.
+
+    Args:
+        campaign_id: Campaign ID.
+    """
+    with _lock:
+        PARTICIPANT_COUNT_BY_CAMPAIGN_ID.pop(campaign_id, None)
+
+
+def get_session_user_id(session_key: str) -> Optional[int]:
+    """
+    Get the ID of the user a session key was verified for.
+
+    Args:
+        session_key: Session key.
+
+    Returns:
+        User ID, or None if the session key has not been verified recently.
+    """
+    with _lock:
+        return USER_ID_BY_SESSION_KEY.get(session_key)
+
+
+def put_session(session_key: str, user_id: int) -> None:
+    """
+    Remember that a session key belongs to a user.
+
+    Args:
+        session_key: Session key.
+        user_id: User's ID.
+    """
+    with _lock:
+        USER_ID_BY_SESSION_KEY[session_key] = user_id
+
+
+def invalidate_session(session_key: str) -> None:
+    """
+    Forget a session key.
+
+    Args:
+        session_key: Session key.
+    """
+    with _lock:
+        USER_ID_BY_SESSION_KEY.pop(session_key, None)
@@ -5,81 +5,563 @@ This module provides functions for interacting with the Cassandra database,
 including user management, campaign management, data source management,
 data storage, communication, and statistics.
 """
+import asyncio
 import json
 import logging
 import os
-import time
-from os.path import exists
-from typing import Any, List, Optional, Tuple
-
-from cassandra.auth import PlainTextAuthProvider
-from cassandra.cluster import Cluster
+import threading
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from cassandra.cluster import EXEC_PROFILE_DEFAULT, Cluster, ExecutionProfile
+from cassandra.concurrent import execute_concurrent, execute_concurrent_with_args
+from cassandra.policies import (
+    DCAwareRoundRobinPolicy,
+    ExponentialReconnectionPolicy,
+    TokenAwarePolicy,
+)
+from cassandra.query import BatchStatement, BatchType
 from dotenv import load_dotenv
 
-from tools import settings, utils
+try:
+    # libev event loop, available when the driver was built with libev
+    from cassandra.io.libevreactor import LibevConnection as DEFAULT_CONNECTION_CLASS
+except ImportError:
+    DEFAULT_CONNECTION_CLASS = None  # driver default
+
+from tools import db_cache, settings, utils
 
 # Load environment variables
 load_dotenv()
 
 # Configure module logger
 DEFAULT_CONTACT_POINTS = os.getenv("CASSANDRA_HOST", "127.0.0.1").split(",")
+# Local datacenter of the load balancing policy; if unset, the driver takes
+# the datacenter of the first contact point it connects to
+DEFAULT_LOCAL_DC = os.getenv("CASSANDRA_LOCAL_DC") or None
 logger = logging.getLogger(__name__)
 
+#: Execution profile of the long-running counts over participants' data tables
+EXEC_PROFILE_ANALYTICS = "analytics"
+
+#: Queries run by (nearly) every RPC, prepared up front by `prepare_hot_queries`
+CQL_USER_BY_ID = 'select * from "et"."user" where "id"=?;'
+CQL_USER_BY_EMAIL = 'select * from "et"."user" where "email"=?;'
+CQL_CAMPAIGN_BY_ID = 'select * from "et"."campaign" where "id"=?;'
+CQL_DATA_SOURCE_BY_ID = 'select * from "et"."dataSource" where "id"=?;'
+CQL_PARTICIPANT_BINDING_COUNT = (
+    'select count(*) from "stats"."campaignParticipantStats" '
+    'where "campaignId"=? and "userId"=?;'
+)
+CQL_UPDATE_HEARTBEAT = (
+    'update "stats"."campaignParticipantStats" '
+    'set "lastHeartbeatTimestamp" = ? '
+    'where "userId" = ? and "campaignId" = ?;'
+)
+HOT_QUERIES = (
+    CQL_USER_BY_ID,
+    CQL_USER_BY_EMAIL,
+    CQL_CAMPAIGN_BY_ID,
+    CQL_DATA_SOURCE_BY_ID,
+    CQL_PARTICIPANT_BINDING_COUNT,
+    CQL_UPDATE_HEARTBEAT,
+)
+
+#: Statements of the ID sequences (see `get_next_id`)
+CQL_SELECT_NEXT_ID = 'select "nextId" from "et"."idSequence" where "tableName"=?;'
+CQL_INSERT_NEXT_ID = (
+    'insert into "et"."idSequence"("tableName", "nextId") values (?,?) if not exists;'
+)
+CQL_UPDATE_NEXT_ID = (
+    'update "et"."idSequence" set "nextId"=? where "tableName"=? if "nextId"=?;'
+)
+
+#: Researcher binding of a user to a campaign, a single-row lookup
+CQL_CAMPAIGN_RESEARCHER = (
+    'select "researcherId" from "et"."campaignResearchers" '
+    'where "campaignId"=? and "researcherId"=?;'
+)
+
+#: Per-data-source stats rows of a participant, one slice of the campaign's partition
+CQL_PARTICIPANT_DATA_SOURCE_STATS = (
+    'select "dataSourceId", "amountOfSamples", "syncTimestamp" '
+    'from "stats"."perDataSourceStats" '
+    'where "campaignId"=? and "userId"=?;'
+)
+
+#: Statements on a participant's data table, formatted with the campaign and
+#: user IDs (see `prepare_data_query`)
+CQL_INSERT_DATA_RECORD = (
+    'insert into "data"."cmp{campaign_id}_usr{user_id}"'
+    '("dataSourceId", "timestamp", "value") values (?,?,?);'
+)
+CQL_NEXT_K_DATA_RECORDS = (
+    'select * from "data"."cmp{campaign_id}_usr{user_id}" '
+    'where "timestamp">=? and "dataSourceId"=? '
+    'order by "timestamp" asc limit ?;'
+)
+CQL_AMOUNTS_PER_DATA_SOURCE = (
+    'select "dataSourceId", count(*) as "amount", '
+    'max("timestamp") as "lastTimestamp" '
+    'from "data"."cmp{campaign_id}_usr{user_id}" '
+    'where "dataSourceId" in ? group by "dataSourceId";'
+)
+
+#: Row of "et"."user", shaped like the rows the driver returns for `select *`
+UserRow = namedtuple("UserRow", ["id", "email", "name", "sessionKey", "tag"])
+
+#: Rows of the other "et" tables, built from the values just inserted
+CampaignRow = namedtuple(
+    "CampaignRow",
+    [
+        "id",
+        "creatorId",
+        "name",
+        "notes",
+        "configJson",
+        "startTimestamp",
+        "endTimestamp",
+    ],
+)
+DataSourceRow = namedtuple("DataSourceRow", ["id", "creatorId", "name", "iconName"])
+DirectMessageRow = namedtuple(
+    "DirectMessageRow",
+    ["id", "sourceUserId", "targetUserId", "timestamp", "subject", "content", "read"],
+)
+NotificationRow = namedtuple(
+    "NotificationRow",
+    ["id", "timestamp", "subject", "content", "read", "campaignId", "targetUserId"],
+)
+
+#: Statistics of a campaign participant (see `get_participant_stats`)
+ParticipantStats = namedtuple(
+    "ParticipantStats",
+    [
+        "join_timestamp",
+        "last_sync_timestamp",
+        "last_heartbeat_timestamp",
+        "amount_of_data",
+        "data_source_ids",
+        "amounts_of_samples",
+        "sync_timestamps",
+    ],
+)
+
+#: Totals of a campaign participant (see `get_participants_summaries`)
+ParticipantSummary = namedtuple(
+    "ParticipantSummary",
+    [
+        "join_timestamp",
+        "last_sync_timestamp",
+        "last_heartbeat_timestamp",
+        "amount_of_data",
+    ],
+)
+
+# Prepared statements, keyed by CQL text or by (template, campaign ID, user ID)
+# (populated lazily by `prepare` and `prepare_data_query`), least recently used
+# first
+_prepared_statements: "OrderedDict[Any, Any]" = OrderedDict()
+_prepared_statements_lock = threading.Lock()
+
+# Heartbeat timestamps waiting to be written, keyed by (user ID, campaign ID)
+_heartbeat_buffer: Dict[Tuple[int, int], int] = {}
+_heartbeat_lock = threading.Lock()
+_heartbeat_flusher: Optional[threading.Thread] = None
+_heartbeat_flusher_stop: Optional[threading.Event] = None
+
+# Open data file descriptors, keyed by (campaign ID, user ID, data source ID),
+# least recently used first
+_data_fds: "OrderedDict[Tuple[int, int, int], int]" = OrderedDict()
+_data_fds_lock = threading.Lock()
+
 
 # ==============================================================================
 # Database Connection Management
 # ==============================================================================
 
 
-def get_cassandra_session(maintenance: bool = False) -> Optional[Any]:
+def get_cassandra_session() -> Optional[Any]:
     """
-    Get or create a Cassandra database session.
+    Get or create the process-wide Cassandra database session.
 
-    Args:
-        maintenance: If True, creates a separate maintenance session.
-            Defaults to False.
+    The session is thread-safe and shared by the RPC handlers and the
+    background routines alike.
 
     Returns:
         Cassandra session object, or None if connection fails.
     """
+    session = settings.cassandra_session
+    if session is not None:
+        return session
+
     if settings.cassandra_cluster is None:
         settings.cassandra_cluster = Cluster(
             contact_points=DEFAULT_CONTACT_POINTS,
-            executor_threads=2048,
+            executor_threads=settings.DB_EXECUTOR_THREADS,
             connect_timeout=1200,
+            reconnection_policy=ExponentialReconnectionPolicy(
+                base_delay=1.0, max_delay=60.0
+            ),
+            # both profiles send prepared statements straight to a replica
+            # of their partition; a slow request must not hold a handler
+            # thread indefinitely
+            execution_profiles={
+                EXEC_PROFILE_DEFAULT: ExecutionProfile(
+                    load_balancing_policy=TokenAwarePolicy(
+                        DCAwareRoundRobinPolicy(local_dc=DEFAULT_LOCAL_DC)
+                    ),
+                    request_timeout=settings.DB_REQUEST_TIMEOUT_SECONDS,
+                ),
+                EXEC_PROFILE_ANALYTICS: ExecutionProfile(
+                    load_balancing_policy=TokenAwarePolicy(
+                        DCAwareRoundRobinPolicy(local_dc=DEFAULT_LOCAL_DC)
+                    ),
+                    request_timeout=settings.DB_COUNT_TIMEOUT_SECONDS,
+                ),
+            },
+            protocol_version=4,
+            connection_class=DEFAULT_CONNECTION_CLASS,
         )
-        settings.cassandra_session = settings.cassandra_cluster.connect()
-        logger.info("Cassandra session initialized: %s", settings.cassandra_session)
+    # the cluster object is kept across failed attempts, only connect() is retried
+    settings.cassandra_session = settings.cassandra_cluster.connect()
+    logger.info("Cassandra session initialized: %s", settings.cassandra_session)
     return settings.cassandra_session
 
 
+def get_analytics_session() -> Any:
+    """
+    Get or create the session of the long-running counts and aggregations.
+
+    The session has its own connection pools on the same cluster, so the
+    scans of the statistics routines and count requests do not queue up in
+    front of the data writes and lookups of the main session. Statements
+    prepared through `prepare` can be executed on either session.
+
+    Returns:
+        Cassandra session object.
+    """
+    session = settings.cassandra_analytics_session
+    if session is not None:
+        return session
+
+    get_cassandra_session()
+    settings.cassandra_analytics_session = settings.cassandra_cluster.connect()
+    return settings.cassandra_analytics_session
+
+
 def end() -> None:
     """
     Close the Cassandra database connection.
 
-    Shuts down both the session and the cluster.
+    Shuts down the sessions and the cluster, so that the next
+    `get_cassandra_session` call reconnects from scratch.
     """
+    # stopped first, so that it cannot reconnect once the session is closed
+    stop_heartbeat_flusher()
     if settings.cassandra_session:
+        flush_heartbeats()
         settings.cassandra_session.shutdown()
+    if settings.cassandra_analytics_session:
+        settings.cassandra_analytics_session.shutdown()
     if settings.cassandra_cluster:
         settings.cassandra_cluster.shutdown()
+    settings.cassandra_session = None
+    settings.cassandra_analytics_session = None
+    settings.cassandra_cluster = None
+    # prepared statements belong to the closed session
+    _prepared_statements.clear()
     logger.info("Cassandra connection closed")
 
 
+def create_schema(statements: List[str]) -> None:
+    """
+    Create the database schema.
+
+    Statements are grouped into dependency tiers (keyspaces, then tables and
+    types, then indexes and views); the statements of a tier are independent
+    and are executed concurrently, tiers one after the other.
+
+    Args:
+        statements: CQL schema statements, in execution order.
+    """
+    session = get_cassandra_session()
+    tiers: List[List[str]] = [[], [], []]
+    for stmt in statements:
+        words = stmt.lower().split()
+        if words[1] == "keyspace":
+            tiers[0].append(stmt)
+        elif words[1] in ("table", "type"):
+            tiers[1].append(stmt)
+        else:
+            tiers[2].append(stmt)
+
+    for tier in tiers:
+        for success, result in execute_concurrent(
+            session,
+            [(stmt, ()) for stmt in tier],
+            concurrency=settings.SCHEMA_CONCURRENCY,
+            raise_on_first_error=False,
+        ):
+            if not success:
+                raise result
+
+
+def prepare(cql: str) -> Any:
+    """
+    Get the prepared statement for a CQL query, preparing it on first use.
+
+    Prepared statements are parsed by Cassandra once and then only bound
+    with values, instead of being re-parsed on every execution. Queries on
+    the per-participant data tables make one statement per participant, so
+    once more than `settings.MAX_PREPARED_STATEMENTS` are kept, the least
+    recently used one is dropped.
+
+    Args:
+        cql: CQL query text using `?` placeholders.
+
+    Returns:
+        Cassandra prepared statement object.
+    """
+    prepared_statement = _cached_statement(cql)
+    if prepared_statement is None:
+        prepared_statement = _prepare_and_cache(cql, cql)
+    return prepared_statement
+
+
+def prepare_data_query(template: str, campaign_id: int, user_id: int) -> Any:
+    """
+    Get the prepared statement of a query on a participant's data table.
+
+    Statements are looked up by template and IDs, so the CQL text is only
+    formatted when the statement is prepared.
+
+    Args:
+        template: CQL query text with `{campaign_id}` and `{user_id}` fields
+            in the table name (e.g. `CQL_INSERT_DATA_RECORD`).
+        campaign_id: Campaign ID.
+        user_id: User ID.
+
+    Returns:
+        Cassandra prepared statement object.
+    """
+    key = (template, campaign_id, user_id)
+    prepared_statement = _cached_statement(key)
+    if prepared_statement is None:
+        prepared_statement = _prepare_and_cache(
+            key, template.format(campaign_id=campaign_id, user_id=user_id)
+        )
+    return prepared_statement
+
+
+def _cached_statement(key: Any) -> Optional[Any]:
+    """
+    Look up a prepared statement of `prepare` or `prepare_data_query`.
+
+    Args:
+        key: Cache key of the statement.
+
+    Returns:
+        Cassandra prepared statement object, or None if not prepared yet.
+    """
+    with _prepared_statements_lock:
+        prepared_statement = _prepared_statements.get(key)
+        if prepared_statement is not None:
+            _prepared_statements.move_to_end(key)
+        return prepared_statement
+
+
+def _prepare_and_cache(key: Any, cql: str) -> Any:
+    """
+    Prepare a statement and cache it, dropping the least recently used one
+    once more than `settings.MAX_PREPARED_STATEMENTS` are kept.
+
+    Args:
+        key: Cache key of the statement.
+        cql: CQL query text using `?` placeholders.
+
+    Returns:
+        Cassandra prepared statement object.
+    """
+    # prepared outside the lock, a concurrent duplicate is harmless
+    prepared_statement = get_cassandra_session().prepare(cql)
+    with _prepared_statements_lock:
+        _prepared_statements[key] = prepared_statement
+        if len(_prepared_statements) > settings.MAX_PREPARED_STATEMENTS:
+            _prepared_statements.popitem(last=False)
+    return prepared_statement
+
+
+def prepare_hot_queries() -> None:
+    """
+    Prepare the queries on the RPC hot path ahead of the first request.
+
+    Requires the schema to exist.
+    """
+    for cql in HOT_QUERIES:
+        prepare(cql)
+
+
+def _log_query_error(exc: Exception) -> None:
+    """
+    Log the failure of a query whose result is not awaited.
+
+    Args:
+        exc: Exception raised by the query.
+    """
+    logger.error("Asynchronous query failed: %s", exc)
+
+
+def execute_paged(
+    cql: str, params: Tuple[Any, ...], fetch_size: int = settings.DB_FETCH_SIZE
+) -> Iterator[Any]:
+    """
+    Iterate over the rows of a query page by page.
+
+    The next page is requested before the rows of the current one are
+    yielded, so fetching page K+1 overlaps with the caller consuming page K.
+
+    Args:
+        cql: CQL query text using `?` placeholders.
+        params: Values bound to the placeholders.
+        fetch_size: Number of rows per page. Defaults to
+            `settings.DB_FETCH_SIZE`.
+
+    Yields:
+        Result rows.
+    """
+    session = get_cassandra_session()
+    prepared_statement = prepare(cql)
+
+    def fetch_page(paging_state: Optional[bytes]) -> Any:
+        statement = prepared_statement.bind(params)
+        statement.fetch_size = fetch_size
+        return session.execute_async(statement, paging_state=paging_state)
+
+    page_future = fetch_page(None)
+    while page_future is not None:
+        page = page_future.result()
+        rows = page.current_rows
+        page_future = fetch_page(page.paging_state) if page.paging_state else None
+        yield from rows
+
+
+class RowFuture:
+    """
+    Pending single-row query started with `execute_async`.
+
+    Lets callers issue several independent lookups back to back and only
+    block once all of them are in flight.
+    """
+
+    def __init__(
+        self,
+        response_future: Optional[Any],
+        row: Optional[Any] = None,
+        on_row: Optional[Callable[[Optional[Any]], None]] = None,
+    ) -> None:
+        """
+        Args:
+            response_future: Cassandra response future, or None if the
+                result is already known.
+            row: Result to return when there is no response future
+                (e.g. a cached row). Optional.
+            on_row: Called with the row once the query completes. Optional.
+        """
+        self._response_future = response_future
+        self._row = row
+        self._on_row = on_row
+
+    def done(self) -> bool:
+        """
+        Check whether the result is known without waiting (e.g. a cached row).
+
+        Returns:
+            True if `result()` will not block, False otherwise.
+        """
+        return self._response_future is None
+
+    def result(self) -> Optional[Any]:
+        """
+        Wait for the query to complete.
+
+        Returns:
+            The first row of the result, or None if there is none.
+        """
+        if self._response_future is not None:
+            self._row = self._response_future.result().one()
+            self._response_future = None
+            if self._on_row is not None:
+                self._on_row(self._row)
+        return self._row
+
+    async def result_async(self) -> Optional[Any]:
+        """
+        Wait for the query to complete without blocking the event loop.
+
+        Returns:
+            The first row of the result, or None if there is none.
+        """
+        if self._response_future is not None:
+            loop = asyncio.get_running_loop()
+            done = loop.create_future()
+
+            def on_done(_: Any) -> None:
+                # driver callbacks run on the driver's event thread
+                loop.call_soon_threadsafe(_resolve, done)
+
+            self._response_future.add_callbacks(on_done, on_done)
+            await done
+        return self.result()
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    """
+    Mark an asyncio future as done, unless it was cancelled meanwhile.
+
+    Args:
+        future: Future to resolve.
+    """
+    if not future.done():
+        future.set_result(None)
+
+
 def get_next_id(session: Any, table_name: str) -> int:
     """
     Get the next available ID for a table.
 
+    IDs are taken from the table's row in "et"."idSequence" with a
+    lightweight transaction, so that concurrent callers never get the same
+    ID. The sequence of a table is started after its existing rows, which
+    is the only time the table itself is scanned.
+
     Args:
         session: Cassandra session object.
         table_name: Fully qualified table name (e.g., '"et"."user"').
 
     Returns:
-        Next available ID (max ID + 1, or 0 if table is empty).
-    """
-    res = session.execute(f'select max("id") from {table_name};')
-    last_id = res.one()[0]
-    return 0 if last_id is None else last_id + 1
+        Next available ID.
+    """
+    row = session.execute(prepare(CQL_SELECT_NEXT_ID), (table_name,)).one()
+    if row is None:
+        last_id = session.execute(f'select max("id") from {table_name};').one()[0]
+        next_id = 0 if last_id is None else last_id + 1
+        result = session.execute(
+            prepare(CQL_INSERT_NEXT_ID), (table_name, next_id + 1)
+        )
+    else:
+        next_id = row.nextId
+        result = session.execute(
+            prepare(CQL_UPDATE_NEXT_ID), (next_id + 1, table_name, next_id)
+        )
+    while not result.was_applied:
+        # another ID was taken meanwhile, retry from the current value
+        next_id = result.one().nextId
+        result = session.execute(
+            prepare(CQL_UPDATE_NEXT_ID), (next_id + 1, table_name, next_id)
+        )
+    return next_id
 
 
 # ==============================================================================
@@ -87,7 +569,7 @@ def get_next_id(session: Any, table_name: str) -> int:
 # ==============================================================================
 
 
-def create_user(name: str, email: str, session_key: str) -> Optional[Any]:
+def create_user(name: str, email: str, session_key: str) -> Any:
     """
     Create a new user in the database.
 
@@ -97,49 +579,148 @@ def create_user(name: str, email: str, session_key: str) -> Optional[Any]:
         session_key: User's session key (password hash).
 
     Returns:
-        The created user record, or None if creation failed.
+        The created user record, built from the inserted values.
     """
     session = get_cassandra_session()
     next_id = get_next_id(session=session, table_name='"et"."user"')
     session.execute(
-        'insert into "et"."user"("id", "email", "sessionKey", "name") values (%s,%s,%s,%s);',
+        prepare(
+            'insert into "et"."user"("id", "email", "sessionKey", "name") '
+            "values (?,?,?,?);"
+        ),
         (next_id, email, session_key, name),
     )
-    return session.execute(
-        'select * from "et"."user" where "id"=%s;', (next_id,)
-    ).one()
+    db_user = UserRow(
+        id=next_id, email=email, name=name, sessionKey=session_key, tag=None
+    )
+    db_cache.put_user(db_user)
+    return db_user
 
 
-def get_user(
+def get_user_async(
     user_id: Optional[int] = None, email: Optional[str] = None
-) -> Optional[Any]:
+) -> "RowFuture":
     """
-    Get a user from the database.
+    Start fetching a user from the database without blocking.
 
     Args:
         user_id: User's ID. Optional.
         email: User's email address. Optional.
 
     Returns:
-        User record if found, None otherwise.
+        Pending lookup whose `result()` is the user record, or None.
     """
+    db_user = db_cache.get_user(user_id=user_id, email=email)
+    if db_user is not None:
+        return RowFuture(None, row=db_user)
+
     session = get_cassandra_session()
-    db_user = None
 
     if user_id is not None and email is not None:
-        db_user = session.execute(
-            'select * from "et"."user" where "id"=%s and "email"=%s allow filtering;',
-            (user_id, email),
-        ).one()
+        return RowFuture(
+            session.execute_async(
+                prepare(
+                    'select * from "et"."user" '
+                    'where "id"=? and "email"=?;'
+                ),
+                (user_id, email),
+            ),
+            on_row=db_cache.put_user,
+        )
     elif user_id is not None:
-        db_user = session.execute(
-            'select * from "et"."user" where "id"=%s allow filtering;', (user_id,)
-        ).one()
+        return RowFuture(
+            session.execute_async(
+                prepare(CQL_USER_BY_ID),
+                (user_id,),
+            ),
+            on_row=db_cache.put_user,
+        )
     elif email is not None:
-        db_user = session.execute(
-            'select * from "et"."user" where "email"=%s allow filtering;', (email,)
-        ).one()
+        return RowFuture(
+            session.execute_async(
+                prepare(CQL_USER_BY_EMAIL),
+                (email,),
+            ),
+            on_row=db_cache.put_user,
+        )
+
+    return RowFuture(None)
+
 
+def get_user(
+    user_id: Optional[int] = None, email: Optional[str] = None
+) -> Optional[Any]:
+    """
+    Get a user from the database.
+
+    Args:
+        user_id: User's ID. Optional.
+        email: User's email address. Optional.
+
+    Returns:
+        User record if found, None otherwise.
+    """
+    return get_user_async(user_id=user_id, email=email).result()
+
+
+def get_users(user_ids: List[int]) -> Dict[int, Any]:
+    """
+    Get several users by ID with a single query for the uncached ones.
+
+    Args:
+        user_ids: User IDs (duplicates are allowed).
+
+    Returns:
+        Mapping of user ID to user record, for the users that exist.
+    """
+    users = {}
+    missing_ids = []
+    for user_id in set(user_ids):
+        db_user = db_cache.get_user(user_id=user_id)
+        if db_user is None:
+            missing_ids.append(user_id)
+        else:
+            users[user_id] = db_user
+
+    if missing_ids:
+        session = get_cassandra_session()
+        for db_user in session.execute(
+            prepare('select * from "et"."user" where "id" in ?;'), (missing_ids,)
+        ):
+            db_cache.put_user(db_user)
+            users[db_user.id] = db_user
+
+    return users
+
+
+def authenticate(user_id: int, session_key: str) -> Optional[Any]:
+    """
+    Get a user if the session key belongs to them.
+
+    Verified session keys are cached, so repeated calls with the same key
+    cost no session key check against the database.
+
+    Args:
+        user_id: User's ID.
+        session_key: Session key sent by the client.
+
+    Returns:
+        User record if the session key is valid, None otherwise.
+    """
+    db_user = get_user(user_id=user_id)
+    if db_user is None:
+        return None
+    if db_cache.get_session_user_id(session_key) == user_id:
+        return db_user
+
+    if db_user.sessionKey != session_key:
+        # the cached row may predate a session key change in another process
+        db_cache.invalidate_user(db_user)
+        db_user = get_user(user_id=user_id)
+    if db_user is None or db_user.sessionKey != session_key:
+        return None
+
+    db_cache.put_session(session_key, user_id)
     return db_user
 
 
@@ -153,8 +734,10 @@ def set_user_tag(db_user: Any, tag: str = "") -> None:
     """
     session = get_cassandra_session()
     session.execute(
-        'update "et"."user" set "tag"=%s where "id"=%s;', (tag, db_user.id)
+        prepare('update "et"."user" set "tag"=? where "id"=?;'),
+        (tag, db_user.id),
     )
+    db_cache.invalidate_user(db_user)
 
 
 def update_session_key(db_user: Any, session_key: str) -> None:
@@ -167,9 +750,14 @@ def update_session_key(db_user: Any, session_key: str) -> None:
     """
     session = get_cassandra_session()
     session.execute(
-        'update "et"."user" set "sessionKey" = %s where "id" = %s and "email" = %s;',
+        prepare(
+            'update "et"."user" set "sessionKey" = ? where "id" = ? and "email" = ?;'
+        ),
         (session_key, db_user.id, db_user.email),
     )
+    db_cache.invalidate_user(db_user)
+    db_cache.invalidate_session(db_user.sessionKey)
+    db_cache.put_session(session_key, db_user.id)
 
 
 def user_is_bound_to_campaign(db_user: Any, db_campaign: Any) -> bool:
@@ -185,18 +773,126 @@ def user_is_bound_to_campaign(db_user: Any, db_campaign: Any) -> bool:
     """
     session = get_cassandra_session()
     count = session.execute(
-        'select count(*) from "stats"."campaignParticipantStats" '
-        'where "campaignId"=%s and "userId"=%s allow filtering;',
+        prepare(CQL_PARTICIPANT_BINDING_COUNT),
         (db_campaign.id, db_user.id),
     ).one()[0]
     return count > 0
 
 
+def authorize_participant(
+    user_id: int, campaign_id: int, session_key: Optional[str] = None
+) -> Tuple[bool, Optional[Any], Optional[Any]]:
+    """
+    Check that a user exists, is bound to a campaign and owns a session key.
+
+    The user, campaign and participant binding lookups are issued
+    concurrently, so the check costs a single round trip.
+
+    Args:
+        user_id: User's ID.
+        campaign_id: Campaign ID.
+        session_key: If provided, must match the user's session key.
+
+    Returns:
+        Tuple (authorized, db_user, db_campaign).
+    """
+    user_future, campaign_future, binding_future = _participant_lookups(
+        user_id=user_id, campaign_id=campaign_id
+    )
+    db_user = user_future.result()
+    db_campaign = campaign_future.result()
+    authorized = _participant_is_authorized(
+        db_user, db_campaign, binding_future.result(), session_key
+    )
+    return authorized, db_user, db_campaign
+
+
+async def authorize_participant_async(
+    user_id: int, campaign_id: int, session_key: Optional[str] = None
+) -> Tuple[bool, Optional[Any], Optional[Any]]:
+    """
+    Coroutine version of `authorize_participant`.
+
+    Args:
+        user_id: User's ID.
+        campaign_id: Campaign ID.
+        session_key: If provided, must match the user's session key.
+
+    Returns:
+        Tuple (authorized, db_user, db_campaign).
+    """
+    user_future, campaign_future, binding_future = _participant_lookups(
+        user_id=user_id, campaign_id=campaign_id
+    )
+    db_user = await user_future.result_async()
+    db_campaign = await campaign_future.result_async()
+    authorized = _participant_is_authorized(
+        db_user, db_campaign, await binding_future.result_async(), session_key
+    )
+    return authorized, db_user, db_campaign
+
+
+def _participant_lookups(
+    user_id: int, campaign_id: int
+) -> Tuple[RowFuture, RowFuture, RowFuture]:
+    """
+    Start the lookups needed to authorize a participant.
+
+    Args:
+        user_id: User's ID.
+        campaign_id: Campaign ID.
+
+    Returns:
+        Pending user, campaign and binding count lookups.
+    """
+    session = get_cassandra_session()
+    binding_future = RowFuture(
+        session.execute_async(
+            prepare(CQL_PARTICIPANT_BINDING_COUNT),
+            (campaign_id, user_id),
+        )
+    )
+    return (
+        get_user_async(user_id=user_id),
+        get_campaign_async(campaign_id=campaign_id),
+        binding_future,
+    )
+
+
+def _participant_is_authorized(
+    db_user: Optional[Any],
+    db_campaign: Optional[Any],
+    binding_count_row: Any,
+    session_key: Optional[str],
+) -> bool:
+    """
+    Combine the results of `_participant_lookups`.
+
+    Args:
+        db_user: User database object, or None.
+        db_campaign: Campaign database object, or None.
+        binding_count_row: Row holding the participant binding count.
+        session_key: If provided, must match the user's session key.
+
+    Returns:
+        True if the participant is authorized, False otherwise.
+    """
+    return (
+        binding_count_row[0] > 0
+        and db_user is not None
+        and db_campaign is not None
+        and (session_key is None or db_user.sessionKey == session_key)
+    )
+
+
 def bind_participant_to_campaign(db_user: Any, db_campaign: Any) -> bool:
     """
     Bind a user to a campaign as a participant.
 
     Creates the participant stats record and data table if this is a new binding.
+    The data table is only created if the driver's schema metadata does not
+    know it yet (e.g. on a re-binding), as every DDL statement waits for
+    schema agreement across the cluster.
 
     Args:
         db_user: User database object.
@@ -207,16 +903,28 @@ def bind_participant_to_campaign(db_user: Any, db_campaign: Any) -> bool:
     """
     session = get_cassandra_session()
     if not user_is_bound_to_campaign(db_user=db_user, db_campaign=db_campaign):
-        session.execute(
-            'insert into "stats"."campaignParticipantStats"'
-            '("userId", "campaignId", "joinTimestamp") values (%s,%s,%s);',
-            (db_user.id, db_campaign.id, utils.get_timestamp_ms()),
-        )
-        session.execute(
-            f'create table if not exists "data"."cmp{db_campaign.id}_usr{db_user.id}"'
-            '("dataSourceId" int, "timestamp" bigint, "value" blob, '
-            'primary key ("dataSourceId", "timestamp"));'
-        )
+        table_name = f"cmp{db_campaign.id}_usr{db_user.id}"
+        futures = [
+            session.execute_async(
+                prepare(
+                    'insert into "stats"."campaignParticipantStats"'
+                    '("userId", "campaignId", "joinTimestamp") values (?,?,?);'
+                ),
+                (db_user.id, db_campaign.id, utils.get_timestamp_ms()),
+            )
+        ]
+        data_keyspace = session.cluster.metadata.keyspaces.get("data")
+        if data_keyspace is None or table_name not in data_keyspace.tables:
+            futures.append(
+                session.execute_async(
+                    f'create table if not exists "data"."{table_name}"'
+                    '("dataSourceId" int, "timestamp" bigint, "value" blob, '
+                    'primary key ("dataSourceId", "timestamp"));'
+                )
+            )
+        for future in futures:
+            future.result()
+        db_cache.invalidate_participant_count(db_campaign.id)
         return True  # New binding
     return False  # Already bound
 
@@ -232,18 +940,52 @@ def get_campaign_participants(db_campaign: Any) -> List[Any]:
         List of user database objects for all participants.
     """
     session = get_cassandra_session()
-    participants = []
+    user_ids = [
+        row.userId
+        for row in session.execute(
+            prepare(
+                'select "userId" from "stats"."campaignParticipantStats" '
+                'where "campaignId"=?;'
+            ),
+            (db_campaign.id,),
+        )
+    ]
+    db_users = get_users(user_ids)
+    return [db_users[user_id] for user_id in user_ids if user_id in db_users]
+
+
+def get_campaigns_participants(campaign_ids: List[int]) -> Dict[int, List[Any]]:
+    """
+    Get the participants of several campaigns.
 
-    for row in session.execute(
-        'select "userId" from "stats"."campaignParticipantStats" '
-        'where "campaignId"=%s allow filtering;',
-        (db_campaign.id,),
-    ).all():
-        user = get_user(user_id=row.userId)
-        if user is not None:
-            participants.append(user)
+    The bindings of all campaigns are read with a single query, and the
+    participants with a single `get_users` call.
 
-    return participants
+    Args:
+        campaign_ids: Campaign IDs.
+
+    Returns:
+        Lists of user database objects keyed by campaign ID, with an empty
+        list for campaigns without participants.
+    """
+    user_ids_by_campaign: Dict[int, List[int]] = {
+        campaign_id: [] for campaign_id in campaign_ids
+    }
+    if not user_ids_by_campaign:
+        return {}
+    for row in execute_paged(
+        'select "campaignId", "userId" from "stats"."campaignParticipantStats" '
+        'where "campaignId" in ?;',
+        (list(user_ids_by_campaign),),
+    ):
+        user_ids_by_campaign[row.campaignId].append(row.userId)
+    db_users = get_users(
+        [user_id for user_ids in user_ids_by_campaign.values() for user_id in user_ids]
+    )
+    return {
+        campaign_id: [db_users[user_id] for user_id in user_ids if user_id in db_users]
+        for campaign_id, user_ids in user_ids_by_campaign.items()
+    }
 
 
 def get_campaign_researchers(db_campaign: Any) -> List[Any]:
@@ -257,18 +999,18 @@ def get_campaign_researchers(db_campaign: Any) -> List[Any]:
         List of user database objects for all researchers.
     """
     session = get_cassandra_session()
-    researchers = []
-
-    for row in session.execute(
-        'select "researcherId" from "et"."campaignResearchers" '
-        'where "campaignId"=%s allow filtering;',
-        (db_campaign.id,),
-    ).all():
-        user = get_user(user_id=row.researcherId)
-        if user is not None:
-            researchers.append(user)
-
-    return researchers
+    user_ids = [
+        row.researcherId
+        for row in session.execute(
+            prepare(
+                'select "researcherId" from "et"."campaignResearchers" '
+                'where "campaignId"=?;'
+            ),
+            (db_campaign.id,),
+        )
+    ]
+    db_users = get_users(user_ids)
+    return [db_users[user_id] for user_id in user_ids if user_id in db_users]
 
 
 def get_campaign_participants_count(db_campaign: Any) -> int:
@@ -284,13 +1026,47 @@ def get_campaign_participants_count(db_campaign: Any) -> int:
     session = get_cassandra_session()
     return len(
         session.execute(
-            'select "userId" from "stats"."campaignParticipantStats" '
-            'where "campaignId"=%s allow filtering;',
+            prepare(
+                'select "userId" from "stats"."campaignParticipantStats" '
+                'where "campaignId"=?;'
+            ),
             (db_campaign.id,),
         ).all()
     )
 
 
+def get_participants_counts(campaign_ids: List[int]) -> Dict[int, int]:
+    """
+    Get the number of participants of several campaigns.
+
+    Counts missing from the cache are read with a single grouped query.
+
+    Args:
+        campaign_ids: Campaign IDs.
+
+    Returns:
+        Number of participants keyed by campaign ID.
+    """
+    counts = db_cache.get_participant_counts(campaign_ids)
+    missing_ids = list({i for i in campaign_ids if i not in counts})
+    if missing_ids:
+        session = get_cassandra_session()
+        rows = session.execute(
+            prepare(
+                'select "campaignId", count(*) as "count" '
+                'from "stats"."campaignParticipantStats" '
+                'where "campaignId" in ? group by "campaignId";'
+            ),
+            (missing_ids,),
+        )
+        # Campaigns without participants have no row
+        fetched = dict.fromkeys(missing_ids, 0)
+        fetched.update((row.campaignId, row.count) for row in rows)
+        db_cache.put_participant_counts(fetched)
+        counts.update(fetched)
+    return counts
+
+
 def add_researcher_to_campaign(db_campaign: Any, db_researcher_user: Any) -> None:
     """
     Add a researcher to a campaign.
@@ -301,8 +1077,10 @@ def add_researcher_to_campaign(db_campaign: Any, db_researcher_user: Any) -> Non
     """
     session = get_cassandra_session()
     session.execute(
-        'insert into "et"."campaignResearchers"("campaignId", "researcherId") '
-        "values(%s,%s);",
+        prepare(
+            'insert into "et"."campaignResearchers"("campaignId", "researcherId") '
+            "values(?,?);"
+        ),
         (db_campaign.id, db_researcher_user.id),
     )
 
@@ -317,8 +1095,10 @@ def remove_researcher_from_campaign(db_campaign: Any, db_researcher_user: Any) -
     """
     session = get_cassandra_session()
     session.execute(
-        'delete from "et"."campaignResearchers" '
-        'where "campaignId"=%s and "researcherId"=%s;',
+        prepare(
+            'delete from "et"."campaignResearchers" '
+            'where "campaignId"=? and "researcherId"=?;'
+        ),
         (db_campaign.id, db_researcher_user.id),
     )
 
@@ -357,28 +1137,35 @@ def create_or_update_campaign(
     if db_campaign is None:
         # Create new campaign
         next_id = get_next_id(session=session, table_name='"et"."campaign"')
+        db_campaign = CampaignRow(
+            id=next_id,
+            creatorId=db_creator_user.id,
+            name=name,
+            notes=notes,
+            configJson=configurations,
+            startTimestamp=start_timestamp,
+            endTimestamp=end_timestamp,
+        )
         session.execute(
-            'insert into "et"."campaign"'
-            '("id", "creatorId", "name", "notes", "configJson", '
-            '"startTimestamp", "endTimestamp") values (%s,%s,%s,%s,%s,%s,%s);',
-            (
-                next_id,
-                db_creator_user.id,
-                name,
-                notes,
-                configurations,
-                start_timestamp,
-                end_timestamp,
+            prepare(
+                'insert into "et"."campaign"'
+                '("id", "creatorId", "name", "notes", "configJson", '
+                '"startTimestamp", "endTimestamp") values (?,?,?,?,?,?,?);'
             ),
+            db_campaign,
         )
-        return get_campaign(campaign_id=next_id, db_researcher_user=db_creator_user)
+        # the new campaign is returned as inserted, without reading it back
+        db_cache.put_campaign(db_campaign)
+        return db_campaign
 
     elif db_campaign.creatorId == db_creator_user.id:
         # Update existing campaign
         session.execute(
-            'update "et"."campaign" set "name" = %s, "notes" = %s, '
-            '"configJson" = %s, "startTimestamp" = %s, "endTimestamp" = %s '
-            'where "creatorId"=%s and "id"=%s;',
+            prepare(
+                'update "et"."campaign" set "name" = ?, "notes" = ?, '
+                '"configJson" = ?, "startTimestamp" = ?, "endTimestamp" = ? '
+                'where "creatorId"=? and "id"=?;'
+            ),
             (
                 name,
                 notes,
@@ -389,11 +1176,36 @@ def create_or_update_campaign(
                 db_campaign.id,
             ),
         )
+        db_cache.invalidate_campaign(db_campaign.id)
         return db_campaign
 
     return None
 
 
+def get_campaign_async(campaign_id: int) -> RowFuture:
+    """
+    Start fetching a campaign from the database without blocking.
+
+    Args:
+        campaign_id: Campaign ID.
+
+    Returns:
+        Pending lookup whose `result()` is the campaign record, or None.
+    """
+    db_campaign = db_cache.get_campaign(campaign_id)
+    if db_campaign is not None:
+        return RowFuture(None, row=db_campaign)
+
+    session = get_cassandra_session()
+    return RowFuture(
+        session.execute_async(
+            prepare(CQL_CAMPAIGN_BY_ID),
+            (campaign_id,),
+        ),
+        on_row=db_cache.put_campaign,
+    )
+
+
 def get_campaign(
     campaign_id: int, db_researcher_user: Optional[Any] = None
 ) -> Optional[Any]:
@@ -407,33 +1219,30 @@ def get_campaign(
     Returns:
         Campaign database object if found, None otherwise.
     """
-    session = get_cassandra_session()
-
+    campaign_future = get_campaign_async(campaign_id=campaign_id)
     if db_researcher_user is None:
-        db_campaign = session.execute(
-            'select * from "et"."campaign" where "id"=%s allow filtering;',
-            (campaign_id,),
-        ).one()
-    else:
-        db_campaign = session.execute(
-            'select * from "et"."campaign" '
-            'where "id"=%s and "creatorId"=%s allow filtering;',
+        return campaign_future.result()
+    if campaign_future.done():
+        # Cached campaign: its creator needs no researcher lookup
+        db_campaign = campaign_future.result()
+        if db_campaign is None or db_campaign.creatorId == db_researcher_user.id:
+            return db_campaign
+
+    # The researcher check is in flight together with the campaign lookup,
+    # so access is verified in a single round trip
+    session = get_cassandra_session()
+    researcher_future = RowFuture(
+        session.execute_async(
+            prepare(CQL_CAMPAIGN_RESEARCHER),
             (campaign_id, db_researcher_user.id),
-        ).one()
-
-        if db_campaign is None:
-            # Check if user is a researcher
-            is_researcher = (
-                session.execute(
-                    'select count(*) from "et"."campaignResearchers" '
-                    'where "campaignId"=%s and "researcherId"=%s;',
-                    (campaign_id, db_researcher_user.id),
-                ).one()[0]
-                > 0
-            )
-            if is_researcher:
-                db_campaign = get_campaign(campaign_id=campaign_id)
-
+        )
+    )
+    db_campaign = campaign_future.result()
+    is_researcher = researcher_future.result() is not None
+    if db_campaign is None or not (
+        db_campaign.creatorId == db_researcher_user.id or is_researcher
+    ):
+        return None
     return db_campaign
 
 
@@ -446,9 +1255,10 @@ def delete_campaign(db_campaign: Any) -> None:
     """
     session = get_cassandra_session()
     session.execute(
-        'delete from "et"."campaign" where "creatorId"=%s and "id"=%s;',
+        prepare('delete from "et"."campaign" where "creatorId"=? and "id"=?;'),
         (db_campaign.creatorId, db_campaign.id),
     )
+    db_cache.invalidate_campaign(db_campaign.id)
 
 
 def get_campaigns(
@@ -466,19 +1276,23 @@ def get_campaigns(
     """
     session = get_cassandra_session()
 
-    if db_creator_user is None:
-        db_campaigns = session.execute('select * from "et"."campaign";').all()
-    else:
-        db_campaigns = session.execute(
-            'select * from "et"."campaign" where "creatorId"=%s allow filtering;',
-            (db_creator_user.id,),
-        ).all()
-
+    # Ended campaigns are filtered out by Cassandra rather than transferred;
+    # the table is read as a whole (or one creator's partition) either way
+    conditions = []
+    params: List[Any] = []
+    if db_creator_user is not None:
+        conditions.append('"creatorId"=?')
+        params.append(db_creator_user.id)
     if active_only:
-        now_ts = int(time.time() * 1000)
-        db_campaigns = [c for c in db_campaigns if c.endTimestamp > now_ts]
+        conditions.append('"endTimestamp">?')
+        params.append(utils.get_timestamp_ms())
 
-    return db_campaigns
+    cql = 'select * from "et"."campaign"'
+    if conditions:
+        cql += f' where {" and ".join(conditions)}'
+    if active_only:
+        cql += " allow filtering"
+    return session.execute(prepare(f"{cql};"), tuple(params)).all()
 
 
 def get_researcher_campaigns(db_researcher_user: Any) -> List[Any]:
@@ -492,18 +1306,19 @@ def get_researcher_campaigns(db_researcher_user: Any) -> List[Any]:
         List of campaign database objects.
     """
     session = get_cassandra_session()
-    campaigns = []
-
-    for row in session.execute(
-        'select "campaignId" from "et"."campaignResearchers" '
-        'where "researcherId"=%s allow filtering;',
-        (db_researcher_user.id,),
-    ).all():
-        campaign = get_campaign(campaign_id=row.campaignId)
-        if campaign is not None:
-            campaigns.append(campaign)
-
-    return campaigns
+    # all campaign lookups are in flight at once
+    campaign_futures = [
+        get_campaign_async(campaign_id=row.campaignId)
+        for row in session.execute(
+            prepare(
+                'select "campaignId" from "et"."campaignResearchers" '
+                'where "researcherId"=?;'
+            ),
+            (db_researcher_user.id,),
+        )
+    ]
+    db_campaigns = (campaign_future.result() for campaign_future in campaign_futures)
+    return [db_campaign for db_campaign in db_campaigns if db_campaign is not None]
 
 
 # ==============================================================================
@@ -511,28 +1326,58 @@ def get_researcher_campaigns(db_researcher_user: Any) -> List[Any]:
 # ==============================================================================
 
 
-def create_data_source(
-    db_creator_user: Any, name: str, icon_name: str
-) -> Optional[Any]:
+def create_data_source(
+    db_creator_user: Any, name: str, icon_name: str
+) -> Optional[Any]:
+    """
+    Create a new data source.
+
+    Args:
+        db_creator_user: Creator user database object.
+        name: Data source name.
+        icon_name: Icon filename for the data source.
+
+    Returns:
+        The created data source database object.
+    """
+    session = get_cassandra_session()
+    next_id = get_next_id(session=session, table_name='"et"."dataSource"')
+    db_data_source = DataSourceRow(
+        id=next_id, creatorId=db_creator_user.id, name=name, iconName=icon_name
+    )
+    session.execute(
+        prepare(
+            'insert into "et"."dataSource"("id", "creatorId", "name", "iconName") '
+            "values (?,?,?,?);"
+        ),
+        db_data_source,
+    )
+    db_cache.put_data_source(db_data_source)
+    return db_data_source
+
+
+def get_data_source_async(data_source_id: int) -> RowFuture:
     """
-    Create a new data source.
+    Start fetching a data source by ID without blocking.
 
     Args:
-        db_creator_user: Creator user database object.
-        name: Data source name.
-        icon_name: Icon filename for the data source.
+        data_source_id: Data source ID.
 
     Returns:
-        The created data source database object.
+        Pending lookup whose `result()` is the data source record, or None.
     """
+    db_data_source = db_cache.get_data_source(data_source_id=data_source_id)
+    if db_data_source is not None:
+        return RowFuture(None, row=db_data_source)
+
     session = get_cassandra_session()
-    next_id = get_next_id(session=session, table_name='"et"."dataSource"')
-    session.execute(
-        'insert into "et"."dataSource"("id", "creatorId", "name", "iconName") '
-        "values (%s,%s,%s,%s);",
-        (next_id, db_creator_user.id, name, icon_name),
+    return RowFuture(
+        session.execute_async(
+            prepare(CQL_DATA_SOURCE_BY_ID),
+            (data_source_id,),
+        ),
+        on_row=db_cache.put_data_source,
     )
-    return get_data_source(data_source_id=next_id)
 
 
 def get_data_source(
@@ -548,29 +1393,57 @@ def get_data_source(
     Returns:
         Data source database object if found, None otherwise.
     """
-    session = get_cassandra_session()
-    db_data_source = None
+    db_data_source = db_cache.get_data_source(
+        data_source_id=data_source_id, name=data_source_name
+    )
+    if db_data_source is not None:
+        return db_data_source
 
+    session = get_cassandra_session()
     if data_source_id is not None and data_source_name is not None:
         db_data_source = session.execute(
-            'select * from "et"."dataSource" '
-            'where "id"=%s and "name"=%s allow filtering;',
+            prepare(
+                'select * from "et"."dataSource" '
+                'where "id"=? and "name"=?;'
+            ),
             (data_source_id, data_source_name),
         ).one()
     elif data_source_id is not None:
-        db_data_source = session.execute(
-            'select * from "et"."dataSource" where "id"=%s allow filtering;',
-            (data_source_id,),
-        ).one()
+        db_data_source = get_data_source_async(data_source_id=data_source_id).result()
     elif data_source_name is not None:
         db_data_source = session.execute(
-            'select * from "et"."dataSource" where "name"=%s allow filtering;',
+            prepare('select * from "et"."dataSource" where "name"=?;'),
             (data_source_name,),
         ).one()
 
+    db_cache.put_data_source(db_data_source)
     return db_data_source
 
 
+def get_data_sources(data_source_ids: List[int]) -> Dict[int, Any]:
+    """
+    Get several data sources by ID, looking up the uncached ones concurrently.
+
+    Args:
+        data_source_ids: Data source IDs (duplicates are allowed).
+
+    Returns:
+        Mapping of data source ID to data source record, for those that exist.
+    """
+    # the ID index serves single lookups only, IN restrictions would need
+    # filtering; cached data sources are resolved without a query
+    data_source_futures = [
+        get_data_source_async(data_source_id=data_source_id)
+        for data_source_id in set(data_source_ids)
+    ]
+    data_sources = {}
+    for data_source_future in data_source_futures:
+        db_data_source = data_source_future.result()
+        if db_data_source is not None:
+            data_sources[db_data_source.id] = db_data_source
+    return data_sources
+
+
 def get_all_data_sources() -> List[Any]:
     """
     Get all data sources from the database.
@@ -579,7 +1452,24 @@ def get_all_data_sources() -> List[Any]:
         List of all data source database objects.
     """
     session = get_cassandra_session()
-    return session.execute('select * from "et"."dataSource";').all()
+    return session.execute(prepare('select * from "et"."dataSource";')).all()
+
+
+@lru_cache(maxsize=settings.CAMPAIGN_CONFIG_CACHE_SIZE)
+def get_config_data_source_ids(config_json: str) -> Tuple[int, ...]:
+    """
+    Get the data source IDs of a campaign configuration.
+
+    The configuration only changes when the campaign is updated, so it is
+    parsed once per distinct JSON text.
+
+    Args:
+        config_json: Campaign's `configJson`.
+
+    Returns:
+        Data source IDs, in configuration order.
+    """
+    return tuple(config["data_source_id"] for config in json.loads(s=config_json))
 
 
 def get_campaign_data_sources(db_campaign: Any) -> List[Any]:
@@ -592,17 +1482,13 @@ def get_campaign_data_sources(db_campaign: Any) -> List[Any]:
     Returns:
         List of data source database objects.
     """
-    data_sources = []
-    config_jsons = json.loads(s=db_campaign.configJson)
-
-    for config_json in config_jsons:
-        db_data_source = get_data_source(
-            data_source_id=config_json["data_source_id"]
-        )
-        if db_data_source is not None:
-            data_sources.append(db_data_source)
-
-    return data_sources
+    data_source_ids = get_config_data_source_ids(db_campaign.configJson)
+    db_data_sources = get_data_sources(list(data_source_ids))
+    return [
+        db_data_sources[data_source_id]
+        for data_source_id in data_source_ids
+        if data_source_id in db_data_sources
+    ]
 
 
 # ==============================================================================
@@ -629,12 +1515,76 @@ def store_data_record(
     """
     session = get_cassandra_session()
     session.execute(
-        f'insert into "data"."cmp{db_campaign.id}_usr{db_user.id}"'
-        '("dataSourceId", "timestamp", "value") values (%s,%s,%s);',
+        prepare_data_query(CQL_INSERT_DATA_RECORD, db_campaign.id, db_user.id),
         (db_data_source.id, timestamp, value),
     )
 
 
+def store_data_record_batches(
+    batches: List[Tuple[int, int, int, List[Tuple[int, bytes]]]]
+) -> List[Optional[Exception]]:
+    """
+    Store records of several data sources with one unlogged batch each.
+
+    Each batch belongs to a single partition, so it is applied by a single
+    replica set; the batches are executed concurrently, so that writing
+    them costs about one round trip rather than one per batch.
+
+    Args:
+        batches: List of (campaign ID, user ID, data source ID, records)
+            tuples, with records as (timestamp, value) tuples.
+
+    Returns:
+        For each batch, None if it was written, or the error it failed with.
+    """
+    statements = [
+        (
+            _data_record_batch(
+                campaign_id=campaign_id,
+                user_id=user_id,
+                data_source_id=data_source_id,
+                records=records,
+            ),
+            None,
+        )
+        for campaign_id, user_id, data_source_id, records in batches
+    ]
+    return [
+        None if success else result
+        for success, result in execute_concurrent(
+            get_cassandra_session(),
+            statements,
+            concurrency=settings.RECORD_BATCH_CONCURRENCY,
+            raise_on_first_error=False,
+        )
+    ]
+
+
+def _data_record_batch(
+    campaign_id: int,
+    user_id: int,
+    data_source_id: int,
+    records: List[Tuple[int, bytes]],
+) -> BatchStatement:
+    """
+    Build the unlogged batch inserting records of one data source.
+
+    Args:
+        campaign_id: Campaign ID.
+        user_id: User ID.
+        data_source_id: Data source ID.
+        records: List of (timestamp, value) tuples.
+
+    Returns:
+        Batch statement.
+    """
+    insert_statement = prepare_data_query(CQL_INSERT_DATA_RECORD, campaign_id, user_id)
+    batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+    for timestamp, value in records:
+        batch.add(insert_statement, (data_source_id, timestamp, value))
+    return batch
+
+
 def store_data_records(
     db_user: Any,
     db_campaign: Any,
@@ -645,6 +1595,11 @@ def store_data_records(
     """
     Store multiple data records.
 
+    Records are grouped by data source; each group is written with unlogged
+    batches of at most `settings.RECORD_BATCH_MAX_SIZE` records, and all
+    batches are executed concurrently. Records of unknown data sources are
+    skipped.
+
     Args:
         db_user: User database object.
         db_campaign: Campaign database object.
@@ -652,30 +1607,51 @@ def store_data_records(
         data_source_id_list: List of data source IDs.
         value_list: List of values as bytes.
     """
-    data_sources_cache: dict = {}
-
+    records_per_data_source: Dict[int, List[Tuple[int, bytes]]] = {}
     for timestamp, data_source_id, value in zip(
         timestamp_list, data_source_id_list, value_list
     ):
-        if data_source_id not in data_sources_cache:
-            db_data_source = get_data_source(data_source_id=data_source_id)
-            if db_data_source is None:
-                continue
-            data_sources_cache[data_source_id] = db_data_source
-
-        if data_sources_cache[data_source_id] is not None:
-            store_data_record(
-                db_user=db_user,
-                db_campaign=db_campaign,
-                db_data_source=data_sources_cache[data_source_id],
-                timestamp=timestamp,
-                value=value,
+        records_per_data_source.setdefault(data_source_id, []).append(
+            (timestamp, value)
+        )
+
+    # the data sources are validated with concurrent lookups
+    data_source_futures = [
+        get_data_source_async(data_source_id=data_source_id)
+        for data_source_id in records_per_data_source
+    ]
+    batches = []
+    for data_source_future in data_source_futures:
+        db_data_source = data_source_future.result()
+        if db_data_source is None:
+            continue
+        records = records_per_data_source[db_data_source.id]
+        for start in range(0, len(records), settings.RECORD_BATCH_MAX_SIZE):
+            batch = _data_record_batch(
+                campaign_id=db_campaign.id,
+                user_id=db_user.id,
+                data_source_id=db_data_source.id,
+                records=records[start : start + settings.RECORD_BATCH_MAX_SIZE],
             )
+            batches.append((batch, None))
+
+    for success, result in execute_concurrent(
+        get_cassandra_session(),
+        batches,
+        concurrency=settings.RECORD_BATCH_CONCURRENCY,
+        raise_on_first_error=False,
+    ):
+        if not success:
+            raise result
 
 
-def get_file(db_campaign: Any, db_user: Any, db_data_source: Any) -> Any:
+def get_fd(db_campaign: Any, db_user: Any, db_data_source: Any) -> int:
     """
-    Get or create a file handle for storing data records.
+    Get a file descriptor for appending data records to a data source's file.
+
+    Descriptors are kept open and reused; once more than
+    `settings.MAX_OPEN_DATA_FILES` are open, the least recently used one is
+    closed. A new file starts with a CSV header.
 
     Args:
         db_campaign: Campaign database object.
@@ -683,31 +1659,49 @@ def get_file(db_campaign: Any, db_user: Any, db_data_source: Any) -> Any:
         db_data_source: Data source database object.
 
     Returns:
-        File handle for appending data.
-    """
-    root_dir = "/home/kobiljon/Desktop/easytrack/services/data"
-    file_path = (
-        f"{root_dir}/cmp{db_campaign.id}_usr{db_user.id}_ds{db_data_source.id}.csv"
-    )
+        Raw file descriptor opened for appending.
+    """
+    key = (db_campaign.id, db_user.id, db_data_source.id)
+    with _data_fds_lock:
+        fd = _data_fds.get(key)
+        if fd is not None:
+            _data_fds.move_to_end(key)
+            return fd
+
+        file_path = os.path.join(
+            settings.DATA_FILES_DIR,
+            f"cmp{db_campaign.id}_usr{db_user.id}_ds{db_data_source.id}.csv",
+        )
+        fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        if os.fstat(fd).st_size == 0:
+            os.write(fd, b"timestamp,value\n")
+        _data_fds[key] = fd
+        if len(_data_fds) > settings.MAX_OPEN_DATA_FILES:
+            _, lru_fd = _data_fds.popitem(last=False)
+            os.close(lru_fd)
+        return fd
 
-    if exists(file_path):
-        return open(file_path, "a")
-    else:
-        file_handle = open(file_path, "w")
-        file_handle.write("timestamp,value\n")
-        return file_handle
+
+def close_data_files() -> None:
+    """
+    Close all file descriptors opened by `get_fd`.
+    """
+    with _data_fds_lock:
+        for fd in _data_fds.values():
+            os.close(fd)
+        _data_fds.clear()
 
 
-def store_data_record_to_file(file: Any, timestamp: int, value: Any) -> None:
+def store_data_record_to_file(fd: int, timestamp: int, value: Any) -> None:
     """
     Write a data record to a file.
 
     Args:
-        file: File handle to write to.
+        fd: File descriptor to write to (see `get_fd`).
         timestamp: Record timestamp.
         value: Record value.
     """
-    file.write(f"{timestamp},{value}\n")
+    os.write(fd, f"{timestamp},{value}\n".encode())
 
 
 def store_data_records_to_file(
@@ -720,6 +1714,8 @@ def store_data_records_to_file(
     """
     Store multiple data records to files.
 
+    The records of each data source are appended with a single write.
+
     Args:
         db_user: User database object.
         db_campaign: Campaign database object.
@@ -727,21 +1723,23 @@ def store_data_records_to_file(
         data_source_id_list: List of data source IDs.
         value_list: List of values.
     """
-    files: dict = {}
-
+    lines_per_data_source: Dict[int, List[str]] = {}
     for timestamp, data_source_id, value in zip(
         timestamp_list, data_source_id_list, value_list
     ):
-        if data_source_id not in files:
-            db_data_source = get_data_source(data_source_id=data_source_id)
-            files[data_source_id] = get_file(
-                db_campaign=db_campaign,
-                db_user=db_user,
-                db_data_source=db_data_source,
-            )
-        store_data_record_to_file(
-            file=files[data_source_id], timestamp=timestamp, value=value
+        lines_per_data_source.setdefault(data_source_id, []).append(
+            f"{timestamp},{value}\n"
+        )
+
+    db_data_sources = get_data_sources(list(lines_per_data_source))
+    for data_source_id, lines in lines_per_data_source.items():
+        db_data_source = db_data_sources.get(data_source_id)
+        if db_data_source is None:
+            continue
+        fd = get_fd(
+            db_campaign=db_campaign, db_user=db_user, db_data_source=db_data_source
         )
+        os.write(fd, "".join(lines).encode())
 
 
 def get_next_k_data_records(
@@ -766,10 +1764,8 @@ def get_next_k_data_records(
     """
     session = get_cassandra_session()
     return session.execute(
-        f'select * from "data"."cmp{db_campaign.id}_usr{db_user.id}" '
-        f'where "timestamp">=%s and "dataSourceId"=%s '
-        f'order by "timestamp" asc limit {k} allow filtering;',
-        (from_timestamp, db_data_source.id),
+        prepare_data_query(CQL_NEXT_K_DATA_RECORDS, db_campaign.id, db_user.id),
+        (from_timestamp, db_data_source.id, k),
     ).all()
 
 
@@ -779,10 +1775,13 @@ def get_filtered_data_records(
     db_data_source: Any,
     from_timestamp: Optional[int] = None,
     till_timestamp: Optional[int] = None,
-) -> List[Any]:
+) -> Iterator[Any]:
     """
     Get data records filtered by timestamp range.
 
+    Records are fetched page by page while they are consumed, so a long
+    time range is never held in memory as a whole.
+
     Args:
         db_user: User database object.
         db_campaign: Campaign database object.
@@ -791,43 +1790,30 @@ def get_filtered_data_records(
         till_timestamp: End timestamp (exclusive). Optional.
 
     Returns:
-        List of data record objects.
-    """
-    session = get_cassandra_session()
-    table_name = f'"data"."cmp{db_campaign.id}_usr{db_user.id}"'
-
-    if from_timestamp is not None and till_timestamp is not None:
-        data_records = session.execute(
-            f'select * from {table_name} where "dataSourceId"=%s '
-            f'and "timestamp">=%s and "timestamp"<%s '
-            f'order by "timestamp" allow filtering;',
-            (db_data_source.id, from_timestamp, till_timestamp),
-        ).all()
-    elif from_timestamp is not None:
-        data_records = session.execute(
-            f'select * from {table_name} where "dataSourceId"=%s '
-            f'and "timestamp">=%s order by "timestamp" allow filtering;',
-            (db_data_source.id, from_timestamp),
-        ).all()
-    elif till_timestamp is not None:
-        data_records = session.execute(
-            f'select * from {table_name} where "dataSourceId"=%s '
-            f'and "timestamp"<%s order by "timestamp" allow filtering;',
-            (db_data_source.id, till_timestamp),
-        ).all()
-    else:
-        data_records = session.execute(
-            f'select * from {table_name} where "dataSourceId"=%s '
-            f'order by "timestamp" allow filtering;',
-            (db_data_source.id,),
-        ).all()
-
-    return data_records
+        Lazy iterator of data record objects, oldest first.
+    """
+    conditions = ['"dataSourceId"=?']
+    params: List[Any] = [db_data_source.id]
+    if from_timestamp is not None:
+        conditions.append('"timestamp">=?')
+        params.append(from_timestamp)
+    if till_timestamp is not None:
+        conditions.append('"timestamp"<?')
+        params.append(till_timestamp)
+
+    return execute_paged(
+        f'select * from "data"."cmp{db_campaign.id}_usr{db_user.id}" '
+        f'where {" and ".join(conditions)} order by "timestamp";',
+        tuple(params),
+    )
 
 
 def dump_data(db_campaign: Any, db_user: Any) -> str:
     """
-    Dump campaign data for a user to a file.
+    Dump campaign data for a user to a CSV file.
+
+    Rows are streamed page by page into the file, one line each:
+    data source ID, timestamp, and the value as 0x-prefixed hex.
 
     Args:
         db_campaign: Campaign database object.
@@ -836,19 +1822,22 @@ def dump_data(db_campaign: Any, db_user: Any) -> str:
     Returns:
         Path to the dumped file.
     """
-    session = get_cassandra_session()
-
     file_path = utils.get_download_file_path(
-        f"cmp{db_campaign.id}_usr{db_user.id}.bin.tmp"
-    )
-    session.execute(
-        f'copy (select "id", "timestamp", "value", "dataSourceId" '
-        f'from "data"."cmp{db_campaign.id}_usr{db_user.id}" allow filtering) '
-        f"to %s with binary;",
-        (file_path,),
+        f"cmp{db_campaign.id}_usr{db_user.id}.csv.tmp"
     )
-
-    session.close()
+    with open(file_path, "w", newline="") as dump_file:
+        lines: List[str] = []
+        for row in execute_paged(
+            'select "dataSourceId", "timestamp", "value" '
+            f'from "data"."cmp{db_campaign.id}_usr{db_user.id}";',
+            (),
+        ):
+            value = "" if row.value is None else "0x" + row.value.hex()
+            lines.append(f"{row.dataSourceId},{row.timestamp},{value}\n")
+            if len(lines) >= settings.DB_FETCH_SIZE:
+                dump_file.write("".join(lines))
+                lines.clear()
+        dump_file.write("".join(lines))
     return file_path
 
 
@@ -877,49 +1866,52 @@ def create_direct_message(
     """
     session = get_cassandra_session()
     next_id = get_next_id(session=session, table_name='"et"."directMessage"')
+    db_direct_message = DirectMessageRow(
+        id=next_id,
+        sourceUserId=db_source_user.id,
+        targetUserId=db_target_user.id,
+        timestamp=utils.get_timestamp_ms(),
+        subject=subject,
+        content=content,
+        read=False,
+    )
     session.execute(
-        'insert into "et"."directMessage"'
-        '("id", "sourceUserId", "targetUserId", "timestamp", "subject", "content") '
-        "values (%s,%s,%s,%s,%s,%s);",
-        (
-            next_id,
-            db_source_user.id,
-            db_target_user.id,
-            utils.get_timestamp_ms(),
-            subject,
-            content,
+        prepare(
+            'insert into "et"."directMessage"'
+            '("id", "sourceUserId", "targetUserId", "timestamp", "subject", '
+            '"content", "read") values (?,?,?,?,?,?,?);'
         ),
+        db_direct_message,
     )
-    return session.execute(
-        'select * from "et"."directMessage" where "id"=%s;', (next_id,)
-    ).one()
+    return db_direct_message
 
 
-def get_unread_direct_messages(db_user: Any) -> List[Any]:
+def get_unread_direct_messages(db_user: Any) -> Iterator[Any]:
     """
     Get unread direct messages for a user and mark them as read.
 
+    Messages are read page by page and marked as read as they are consumed.
+
     Args:
         db_user: User database object.
 
-    Returns:
-        List of unread direct message database objects.
+    Yields:
+        Unread direct message database objects.
     """
-    session = get_cassandra_session()
-    db_direct_messages = session.execute(
-        'select * from "et"."directMessage" '
-        'where "targetUserId"=%s and "read"=FALSE allow filtering;',
-        (db_user.id,),
-    ).all()
-
-    for db_direct_message in db_direct_messages:
-        session.execute(
-            'update "et"."directMessage" set "read"=TRUE '
-            'where "targetUserId"=%s and "sourceUserId"=%s and "id"=%s;',
-            (db_user.id, db_direct_message.sourceUserId, db_direct_message.id),
-        )
-
-    return db_direct_messages
+    yield from _marked_as_read(
+        execute_paged(
+            'select * from "et"."directMessage" '
+            'where "targetUserId"=? and "read"=FALSE allow filtering;',
+            (db_user.id,),
+        ),
+        'update "et"."directMessage" set "read"=TRUE '
+        'where "targetUserId"=? and "sourceUserId"=? and "id"=?;',
+        lambda db_direct_message: (
+            db_user.id,
+            db_direct_message.sourceUserId,
+            db_direct_message.id,
+        ),
+    )
 
 
 def create_notification(
@@ -943,52 +1935,112 @@ def create_notification(
     session = get_cassandra_session()
     next_id = get_next_id(session=session, table_name='"et"."notification"')
 
-    for db_participant in get_campaign_participants(db_campaign=db_campaign):
-        session.execute(
+    db_notifications = [
+        NotificationRow(
+            id=next_id,
+            timestamp=timestamp,
+            subject=subject,
+            content=content,
+            read=False,
+            campaignId=db_campaign.id,
+            targetUserId=db_participant.id,
+        )
+        for db_participant in get_campaign_participants(db_campaign=db_campaign)
+    ]
+
+    # one insert per participant, sent concurrently
+    for success, result in execute_concurrent_with_args(
+        session,
+        prepare(
             'insert into "et"."notification"'
             '("id", "timestamp", "subject", "content", "read", '
-            '"campaignId", "targetUserId") values (%s,%s,%s,%s,%s,%s,%s)',
-            (
-                next_id,
-                timestamp,
-                subject,
-                content,
-                False,
-                db_campaign.id,
-                db_participant.id,
-            ),
-        )
+            '"campaignId", "targetUserId") values (?,?,?,?,?,?,?)'
+        ),
+        db_notifications,
+        concurrency=settings.NOTIFICATION_CONCURRENCY,
+        raise_on_first_error=False,
+    ):
+        if not success:
+            raise result
 
-    return session.execute(
-        'select * from "et"."notification" where "id"=%s allow filtering;', (next_id,)
-    ).all()
+    # the notifications are returned as inserted, without reading them back
+    return db_notifications
 
 
-def get_unread_notifications(db_user: Any) -> List[Any]:
+def get_unread_notifications(db_user: Any) -> Iterator[Any]:
     """
     Get unread notifications for a user and mark them as read.
 
+    Notifications are read page by page and marked as read as they are
+    consumed.
+
     Args:
         db_user: User database object.
 
-    Returns:
-        List of unread notification database objects.
+    Yields:
+        Unread notification database objects.
     """
-    session = get_cassandra_session()
-    db_notifications = session.execute(
-        'select * from "et"."notification" '
-        'where "targetUserId"=%s and "read"=FALSE allow filtering;',
-        (db_user.id,),
-    ).all()
+    yield from _marked_as_read(
+        execute_paged(
+            'select * from "et"."notification" '
+            'where "targetUserId"=? and "read"=FALSE allow filtering;',
+            (db_user.id,),
+        ),
+        'update "et"."notification" set "read"=TRUE '
+        'where "campaignId"=? and "targetUserId"=? and "id"=?;',
+        lambda db_notification: (
+            db_notification.campaignId,
+            db_user.id,
+            db_notification.id,
+        ),
+    )
 
-    for db_notification in db_notifications:
-        session.execute(
-            'update "et"."notification" set "read"=TRUE '
-            'where "campaignId"=%s and "targetUserId"=%s and "id"=%s;',
-            (db_notification.campaignId, db_user.id, db_notification.id),
-        )
 
-    return db_notifications
+def _marked_as_read(
+    rows: Iterator[Any],
+    update_cql: str,
+    key_of: Callable[[Any], Tuple[Any, ...]],
+) -> Iterator[Any]:
+    """
+    Pass rows through, marking each one as read once it is consumed.
+
+    The updates are sent without waiting for them, as one unlogged batch
+    per partition for every `settings.DB_FETCH_SIZE` consumed rows, and for
+    the remaining rows once the iteration ends or is abandoned.
+
+    Args:
+        rows: Rows to mark as read.
+        update_cql: Update statement of a single row.
+        key_of: Returns the values bound to `update_cql` for a row, partition
+            key first.
+
+    Yields:
+        The rows of `rows`.
+    """
+    session = get_cassandra_session()
+    update_statement = prepare(update_cql)
+    batches: Dict[Any, BatchStatement] = {}
+    num_pending = 0
+
+    def send_batches() -> None:
+        for batch in batches.values():
+            session.execute_async(batch).add_errback(_log_query_error)
+        batches.clear()
+
+    try:
+        for row in rows:
+            key = key_of(row)
+            batch = batches.get(key[0])
+            if batch is None:
+                batch = batches[key[0]] = BatchStatement(batch_type=BatchType.UNLOGGED)
+            batch.add(update_statement, key)
+            num_pending += 1
+            yield row
+            if num_pending >= settings.DB_FETCH_SIZE:
+                send_batches()
+                num_pending = 0
+    finally:
+        send_batches()
 
 
 # ==============================================================================
@@ -1009,8 +2061,10 @@ def get_participant_join_timestamp(db_user: Any, db_campaign: Any) -> Optional[i
     """
     session = get_cassandra_session()
     res = session.execute(
-        'select "joinTimestamp" from "stats"."campaignParticipantStats" '
-        'where "userId"=%s and "campaignId"=%s allow filtering;',
+        prepare(
+            'select "joinTimestamp" from "stats"."campaignParticipantStats" '
+            'where "userId"=? and "campaignId"=?;'
+        ),
         (db_user.id, db_campaign.id),
     ).one()
     return None if res is None else res.joinTimestamp
@@ -1029,8 +2083,10 @@ def get_participant_last_sync_timestamp(db_user: Any, db_campaign: Any) -> int:
     """
     session = get_cassandra_session()
     res = session.execute(
-        'select max("syncTimestamp") from "stats"."perDataSourceStats" '
-        'where "campaignId"=%s and "userId"=%s allow filtering;',
+        prepare(
+            'select max("syncTimestamp") from "stats"."perDataSourceStats" '
+            'where "campaignId"=? and "userId"=?;'
+        ),
         (db_campaign.id, db_user.id),
     ).one()[0]
     return 0 if res is None else res
@@ -1049,8 +2105,10 @@ def get_participant_heartbeat_timestamp(db_user: Any, db_campaign: Any) -> int:
     """
     session = get_cassandra_session()
     res = session.execute(
-        'select "lastHeartbeatTimestamp" from "stats"."campaignParticipantStats" '
-        'where "userId" = %s and "campaignId" = %s allow filtering;',
+        prepare(
+            'select "lastHeartbeatTimestamp" from "stats"."campaignParticipantStats" '
+            'where "userId" = ? and "campaignId" = ?;'
+        ),
         (db_user.id, db_campaign.id),
     ).one()
     return 0 if res is None else res.lastHeartbeatTimestamp
@@ -1069,8 +2127,10 @@ def get_participants_amount_of_data(db_user: Any, db_campaign: Any) -> int:
     """
     session = get_cassandra_session()
     amount_of_samples = session.execute(
-        'select sum("amountOfSamples") from "stats"."perDataSourceStats" '
-        'where "campaignId"=%s and "userId"=%s allow filtering;',
+        prepare(
+            'select sum("amountOfSamples") from "stats"."perDataSourceStats" '
+            'where "campaignId"=? and "userId"=?;'
+        ),
         (db_campaign.id, db_user.id),
     ).one()[0]
     return 0 if amount_of_samples is None else amount_of_samples
@@ -1078,64 +2138,294 @@ def get_participants_amount_of_data(db_user: Any, db_campaign: Any) -> int:
 
 def get_participants_per_data_source_stats(
     db_user: Any, db_campaign: Any
-) -> List[Tuple[Any, int, int]]:
+) -> Tuple[List[int], List[int], List[int]]:
     """
-    Get per-data-source statistics for a participant.
+    Get per-data-source statistics for a participant, as parallel columns.
 
     Args:
         db_user: User database object.
         db_campaign: Campaign database object.
 
     Returns:
-        List of tuples (data_source, amount_of_samples, sync_timestamp).
+        Tuple of lists (data_source_ids, amounts_of_samples, sync_timestamps),
+        one entry per campaign data source.
     """
     session = get_cassandra_session()
+    # the participant's stats rows of all data sources form a single slice
+    # of the campaign's partition, read with one query
+    stats_future = session.execute_async(
+        prepare(CQL_PARTICIPANT_DATA_SOURCE_STATS), (db_campaign.id, db_user.id)
+    )
     db_data_sources = get_campaign_data_sources(db_campaign=db_campaign)
-    res_stats = []
+    return _per_data_source_columns(db_data_sources, list(stats_future.result()))
+
+
+def _per_data_source_columns(
+    db_data_sources: List[Any], stats_rows: List[Any]
+) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Arrange a participant's per-data-source stats rows as parallel columns.
+
+    Args:
+        db_data_sources: Data sources of the campaign.
+        stats_rows: Rows of `CQL_PARTICIPANT_DATA_SOURCE_STATS`.
+
+    Returns:
+        Tuple of lists (data_source_ids, amounts_of_samples, sync_timestamps),
+        one entry per data source; data sources without a row count as 0.
+    """
+    stats_by_data_source_id = {row.dataSourceId: row for row in stats_rows}
+    data_source_ids, amounts_of_samples, sync_timestamps = [], [], []
 
     for db_data_source in db_data_sources:
-        # Get amount of samples
-        res = session.execute(
-            'select "amountOfSamples" from "stats"."perDataSourceStats" '
-            'where "campaignId"=%s and "userId"=%s and "dataSourceId"=%s '
-            "allow filtering;",
-            (db_campaign.id, db_user.id, db_data_source.id),
-        ).one()
-        amount_of_samples = (
+        res = stats_by_data_source_id.get(db_data_source.id)
+        data_source_ids.append(db_data_source.id)
+        amounts_of_samples.append(
             0 if res is None or res.amountOfSamples is None else res.amountOfSamples
         )
-
-        # Get sync timestamp
-        res = session.execute(
-            'select "syncTimestamp" from "stats"."perDataSourceStats" '
-            'where "campaignId"=%s and "userId"=%s and "dataSourceId"=%s '
-            "allow filtering;",
-            (db_campaign.id, db_user.id, db_data_source.id),
-        ).one()
-        sync_timestamp = (
+        sync_timestamps.append(
             0 if res is None or res.syncTimestamp is None else res.syncTimestamp
         )
 
-        res_stats.append((db_data_source, amount_of_samples, sync_timestamp))
+    return data_source_ids, amounts_of_samples, sync_timestamps
+
+
+def get_participant_stats(db_user: Any, db_campaign: Any) -> Optional[ParticipantStats]:
+    """
+    Get all statistics of a participant with two concurrent queries.
+
+    The participant's row of "campaignParticipantStats" holds the join and
+    heartbeat timestamps, and the participant's slice of
+    "perDataSourceStats" everything else, so the totals are computed from
+    the same rows as the per-data-source columns.
+
+    Args:
+        db_user: User database object.
+        db_campaign: Campaign database object.
+
+    Returns:
+        Participant statistics, or None if the user is not bound to the
+        campaign.
+    """
+    session = get_cassandra_session()
+    participant_future = session.execute_async(
+        prepare(
+            'select "joinTimestamp", "lastHeartbeatTimestamp" '
+            'from "stats"."campaignParticipantStats" '
+            'where "campaignId"=? and "userId"=?;'
+        ),
+        (db_campaign.id, db_user.id),
+    )
+    stats_future = session.execute_async(
+        prepare(CQL_PARTICIPANT_DATA_SOURCE_STATS), (db_campaign.id, db_user.id)
+    )
+    db_data_sources = get_campaign_data_sources(db_campaign=db_campaign)
+
+    participant_row = participant_future.result().one()
+    stats_rows = list(stats_future.result())
+    if participant_row is None:
+        return None
+
+    data_source_ids, amounts_of_samples, sync_timestamps = _per_data_source_columns(
+        db_data_sources, stats_rows
+    )
+    return ParticipantStats(
+        join_timestamp=participant_row.joinTimestamp or 0,
+        last_sync_timestamp=max(
+            (row.syncTimestamp for row in stats_rows if row.syncTimestamp is not None),
+            default=0,
+        ),
+        last_heartbeat_timestamp=participant_row.lastHeartbeatTimestamp or 0,
+        amount_of_data=sum(row.amountOfSamples or 0 for row in stats_rows),
+        data_source_ids=data_source_ids,
+        amounts_of_samples=amounts_of_samples,
+        sync_timestamps=sync_timestamps,
+    )
+
+
+def get_participants_summaries(
+    db_campaign: Any, user_ids: List[int]
+) -> Dict[int, ParticipantSummary]:
+    """
+    Get the totals of several participants of a campaign at once.
+
+    Both stats tables are partitioned by campaign, so all participants are
+    read with two concurrent single-partition queries, instead of four
+    queries per participant.
+
+    Args:
+        db_campaign: Campaign database object.
+        user_ids: IDs of the participants.
+
+    Returns:
+        Mapping of user ID to participant totals, for the users bound to
+        the campaign.
+    """
+    session = get_cassandra_session()
+    participants_future = session.execute_async(
+        prepare(
+            'select "userId", "joinTimestamp", "lastHeartbeatTimestamp" '
+            'from "stats"."campaignParticipantStats" '
+            'where "campaignId"=? and "userId" in ?;'
+        ),
+        (db_campaign.id, user_ids),
+    )
+    stats_future = session.execute_async(
+        prepare(
+            'select "userId", "amountOfSamples", "syncTimestamp" '
+            'from "stats"."perDataSourceStats" '
+            'where "campaignId"=? and "userId" in ?;'
+        ),
+        (db_campaign.id, user_ids),
+    )
+
+    amounts_of_data: Dict[int, int] = {}
+    last_sync_timestamps: Dict[int, int] = {}
+    for row in stats_future.result():
+        amounts_of_data[row.userId] = amounts_of_data.get(row.userId, 0) + (
+            row.amountOfSamples or 0
+        )
+        last_sync_timestamps[row.userId] = max(
+            last_sync_timestamps.get(row.userId, 0), row.syncTimestamp or 0
+        )
 
-    return res_stats
+    return {
+        row.userId: ParticipantSummary(
+            join_timestamp=row.joinTimestamp or 0,
+            last_sync_timestamp=last_sync_timestamps.get(row.userId, 0),
+            last_heartbeat_timestamp=row.lastHeartbeatTimestamp or 0,
+            amount_of_data=amounts_of_data.get(row.userId, 0),
+        )
+        for row in participants_future.result()
+    }
 
 
 def update_user_heartbeat_timestamp(db_user: Any, db_campaign: Any) -> None:
     """
     Update the heartbeat timestamp for a participant.
 
+    The timestamp is buffered in memory and written by a background thread
+    (see `flush_heartbeats`); a newer heartbeat of the same participant
+    replaces a pending one.
+
     Args:
         db_user: User database object.
         db_campaign: Campaign database object.
     """
-    session = get_cassandra_session()
-    session.execute(
-        'update "stats"."campaignParticipantStats" '
-        'set "lastHeartbeatTimestamp" = %s '
-        'where "userId" = %s and "campaignId" = %s;',
-        (utils.get_timestamp_ms(), db_user.id, db_campaign.id),
-    )
+    global _heartbeat_flusher, _heartbeat_flusher_stop
+
+    with _heartbeat_lock:
+        _heartbeat_buffer[(db_user.id, db_campaign.id)] = utils.get_timestamp_ms()
+        if _heartbeat_flusher is None:
+            _heartbeat_flusher_stop = threading.Event()
+            _heartbeat_flusher = threading.Thread(
+                target=_heartbeat_flush_routine,
+                args=(_heartbeat_flusher_stop,),
+                name="heartbeat-flusher",
+                daemon=True,
+            )
+            _heartbeat_flusher.start()
+
+
+def stop_heartbeat_flusher() -> None:
+    """
+    Stop the background flushing of heartbeats, if it was started.
+
+    Heartbeats buffered afterwards start it again.
+    """
+    global _heartbeat_flusher, _heartbeat_flusher_stop
+
+    with _heartbeat_lock:
+        flusher, _heartbeat_flusher = _heartbeat_flusher, None
+        stop, _heartbeat_flusher_stop = _heartbeat_flusher_stop, None
+    if flusher is not None:
+        stop.set()
+        flusher.join()
+
+
+def flush_heartbeats() -> None:
+    """
+    Write all buffered heartbeat timestamps to the database.
+
+    Heartbeats are grouped by campaign, the partition key of
+    "stats"."campaignParticipantStats", and written with single-partition
+    unlogged batches of at most `settings.HEARTBEAT_BATCH_SIZE` statements,
+    executed concurrently. Heartbeats that could not be written are put
+    back into the buffer, unless a newer one arrived meanwhile.
+
+    Raises:
+        Exception: The first error a batch failed with.
+    """
+    global _heartbeat_buffer
+
+    with _heartbeat_lock:
+        heartbeats, _heartbeat_buffer = _heartbeat_buffer, {}
+    if not heartbeats:
+        return
+
+    heartbeats_per_campaign: Dict[int, List[Tuple[int, int]]] = {}
+    for (user_id, campaign_id), timestamp in heartbeats.items():
+        heartbeats_per_campaign.setdefault(campaign_id, []).append(
+            (user_id, timestamp)
+        )
+
+    chunks = []
+    for campaign_id, campaign_heartbeats in heartbeats_per_campaign.items():
+        for start in range(0, len(campaign_heartbeats), settings.HEARTBEAT_BATCH_SIZE):
+            chunks.append(
+                (
+                    campaign_id,
+                    campaign_heartbeats[start : start + settings.HEARTBEAT_BATCH_SIZE],
+                )
+            )
+
+    try:
+        update_statement = prepare(CQL_UPDATE_HEARTBEAT)
+        batches = []
+        for campaign_id, chunk in chunks:
+            batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+            for user_id, timestamp in chunk:
+                batch.add(update_statement, (timestamp, user_id, campaign_id))
+            batches.append((batch, None))
+        results = execute_concurrent(
+            get_cassandra_session(),
+            batches,
+            concurrency=settings.HEARTBEAT_BATCH_CONCURRENCY,
+            raise_on_first_error=False,
+        )
+    except Exception as exc:  # nothing was written
+        results = [(False, exc)] * len(chunks)
+
+    error = None
+    unwritten = {}
+    for (campaign_id, chunk), (success, result) in zip(chunks, results):
+        if not success:
+            error = error or result
+            for user_id, timestamp in chunk:
+                unwritten[(user_id, campaign_id)] = timestamp
+    if error is None:
+        return
+
+    with _heartbeat_lock:
+        for key, timestamp in unwritten.items():
+            # a heartbeat buffered meanwhile is newer and wins
+            if _heartbeat_buffer.get(key, timestamp) <= timestamp:
+                _heartbeat_buffer[key] = timestamp
+    raise error
+
+
+def _heartbeat_flush_routine(stop: threading.Event) -> None:
+    """
+    Periodically flush buffered heartbeats (runs in a daemon thread).
+
+    Args:
+        stop: Event ending the routine once set.
+    """
+    while not stop.wait(settings.HEARTBEAT_FLUSH_INTERVAL_SECONDS):
+        try:
+            flush_heartbeats()
+        except Exception as exc:  # keep flushing after transient DB errors
+            logger.error("Failed to flush heartbeats: %s", exc)
 
 
 def remove_participant_from_campaign(db_user: Any, db_campaign: Any) -> None:
@@ -1148,10 +2438,13 @@ def remove_participant_from_campaign(db_user: Any, db_campaign: Any) -> None:
     """
     session = get_cassandra_session()
     session.execute(
-        'delete from "stats"."campaignParticipantStats" '
-        'where "userId" = %s and "campaignId" = %s;',
+        prepare(
+            'delete from "stats"."campaignParticipantStats" '
+            'where "userId" = ? and "campaignId" = ?;'
+        ),
         (db_user.id, db_campaign.id),
     )
+    db_cache.invalidate_participant_count(db_campaign.id)
 
 
 def get_participants_data_source_sync_timestamps(
@@ -1170,8 +2463,10 @@ def get_participants_data_source_sync_timestamps(
     """
     session = get_cassandra_session()
     res = session.execute(
-        'select "syncTimestamp" from "stats"."perDataSourceStats" '
-        'where "campaignId"=%s and "userId"=%s and "dataSourceId"=%s allow filtering;',
+        prepare(
+            'select "syncTimestamp" from "stats"."perDataSourceStats" '
+            'where "campaignId"=? and "userId"=? and "dataSourceId"=?;'
+        ),
         (db_campaign.id, db_user.id, db_data_source.id),
     )
     return 0 if res is None else res.syncTimestamp
@@ -1197,52 +2492,38 @@ def get_filtered_amount_of_data(
     Returns:
         Number of matching data records.
     """
-    session = get_cassandra_session()
-    amount = 0
-
+    session = get_analytics_session()
     if db_user is None:
         # All users
-        participants = get_campaign_participants(db_campaign=db_campaign)
-
-        if db_data_source is None:
-            # All data sources
-            for db_participant_user in participants:
-                amount += session.execute(
-                    f'select count(*) from "data"."{db_campaign.id}-{db_participant_user.id}" '
-                    f'where "timestamp">=%s and "timestamp"<%s allow filtering;',
-                    (from_timestamp, till_timestamp),
-                    timeout=60000,
-                ).one()[0]
-        else:
-            # Single data source
-            for db_participant_user in participants:
-                amount += session.execute(
-                    f'select count(*) from "data"."{db_campaign.id}-{db_participant_user.id}" '
-                    f'where "dataSourceId"=%s and "timestamp">=%s and "timestamp"<%s '
-                    f"allow filtering;",
-                    (db_data_source.id, from_timestamp, till_timestamp),
-                    timeout=60000,
-                ).one()[0]
+        user_ids = [
+            db_participant.id
+            for db_participant in get_campaign_participants(db_campaign=db_campaign)
+        ]
     else:
-        # Single user
-        table_name = f'"data"."cmp{db_campaign.id}_usr{db_user.id}"'
-
-        if db_data_source is None:
-            # All data sources
-            amount += session.execute(
-                f"select count(*) from {table_name} "
-                f'where "timestamp">=%s and "timestamp"<%s;',
-                (from_timestamp, till_timestamp),
-                timeout=60000,
-            ).one()[0]
-        else:
-            # Single data source
-            amount += session.execute(
-                f"select count(*) from {table_name} "
-                f'where "dataSourceId"=%s and "timestamp">=%s and "timestamp"<%s '
-                f"allow filtering;",
-                (db_data_source.id, from_timestamp, till_timestamp),
-                timeout=60000,
-            ).one()[0]
+        user_ids = [db_user.id]
 
+    if db_data_source is None:
+        # All data sources
+        condition = '"timestamp">=? and "timestamp"<? allow filtering'
+        params: Tuple[Any, ...] = (from_timestamp, till_timestamp)
+    else:
+        # Single data source
+        condition = '"dataSourceId"=? and "timestamp">=? and "timestamp"<?'
+        params = (db_data_source.id, from_timestamp, till_timestamp)
+
+    # the participants' tables are counted concurrently
+    count_futures = [
+        session.execute_async(
+            prepare(
+                f'select count(*) from "data"."cmp{db_campaign.id}_usr{user_id}" '
+                f"where {condition};"
+            ),
+            params,
+            execution_profile=EXEC_PROFILE_ANALYTICS,
+        )
+        for user_id in user_ids
+    ]
+    amount = 0
+    for count_future in count_futures:
+        amount += count_future.result().one()[0]
     return amount
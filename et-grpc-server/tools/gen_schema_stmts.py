@@ -0,0 +1,65 @@
+"""
+Generate `tools/schema_stmts.py` from `assets/schema.cql`.
+
+The server bootstraps the database from the pre-split statement list
+instead of reading and splitting the CQL file at every start. Re-run
+this script whenever `assets/schema.cql` changes:
+
+    python tools/gen_schema_stmts.py
+"""
+import os
+
+#: Directory containing this script
+TOOLS_DIR: str = os.path.dirname(os.path.abspath(__file__))
+
+#: Source CQL schema
+SCHEMA_PATH: str = os.path.join(os.path.dirname(TOOLS_DIR), "assets", "schema.cql")
+
+#: Generated Python module
+OUTPUT_PATH: str = os.path.join(TOOLS_DIR, "schema_stmts.py")
+
+
+def _to_literal(stmt: str) -> str:
+    """
+    Format a statement as a Python string literal, keeping its layout.
+
+    Args:
+        stmt: CQL statement.
+
+    Returns:
+        Triple-quoted literal if the statement allows it, `repr` otherwise.
+    """
+    if '"""' in stmt or "\\" in stmt or stmt.endswith('"'):
+        return repr(stmt)
+    return f'"""{stmt}"""'
+
+
+def main() -> None:
+    """
+    Split the CQL schema into statements and write them as a Python list.
+    """
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as schema_file:
+        statements = [
+            stmt.strip() for stmt in schema_file.read().split(";") if stmt.strip()
+        ]
+
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as output_file:
+        output_file.write(
+            '"""\n'
+            "Database schema statements.\n"
+            "\n"
+            "Generated from assets/schema.cql by tools/gen_schema_stmts.py,\n"
+            "do not edit by hand.\n"
+            '"""\n'
+            "from typing import List\n"
+            "\n"
+            "#: CQL statements of the database schema, in execution order\n"
+            "STATEMENTS: List[str] = [\n"
+        )
+        for stmt in statements:
+            output_file.write(f"    {_to_literal(stmt)},\n")
+        output_file.write("]\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Coalescing writer for single data records.
+
+`submitDataRecord` delivers one record per RPC. Instead of one INSERT per
+record, records are queued per (campaign, user, data source) and written
+by a background thread as single-partition unlogged batches, once a queue
+holds `settings.RECORD_BATCH_MAX_SIZE` records or every
+`settings.RECORD_FLUSH_INTERVAL_MS` milliseconds, whichever comes first.
+The batches of one flush are sent concurrently, and batches that fail are
+retried with exponential backoff before they are given up on.
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from tools import db_mgr as db
+from tools import settings
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+#: Key of a writer: (campaign ID, user ID, data source ID)
+WriterKey = Tuple[int, int, int]
+
+
+class BatchWriter:
+    """
+    Queue of pending records of one (campaign, user, data source).
+    """
+
+    def __init__(self) -> None:
+        self.records: "queue.Queue[Tuple[int, bytes]]" = queue.Queue(
+            maxsize=settings.RECORD_QUEUE_MAX_SIZE
+        )
+        self.last_submit_time = time.monotonic()
+        #: Batches whose last write failed; retried before newer records
+        self.failed_batches: List[List[Tuple[int, bytes]]] = []
+        self.failed_attempts = 0
+        self.retry_time = 0.0
+
+    def take_batches(self, now: float) -> List[List[Tuple[int, bytes]]]:
+        """
+        Take the batches to write now.
+
+        Failed batches come first, once their retry is due; until then, the
+        queued records stay queued, so that producers are throttled while
+        the database is failing.
+
+        Args:
+            now: Current `time.monotonic()` value.
+
+        Returns:
+            Batches of at most `settings.RECORD_BATCH_MAX_SIZE` records.
+        """
+        if self.failed_batches:
+            if now < self.retry_time:
+                return []
+            batches, self.failed_batches = self.failed_batches, []
+        else:
+            batches = []
+        while True:
+            records = self.drain(settings.RECORD_BATCH_MAX_SIZE)
+            if not records:
+                return batches
+            batches.append(records)
+
+    def drain(self, max_records: int) -> List[Tuple[int, bytes]]:
+        """
+        Take up to `max_records` queued records without blocking.
+
+        Args:
+            max_records: Maximum number of records to take.
+
+        Returns:
+            List of (timestamp, value) tuples, oldest first.
+        """
+        records = []
+        try:
+            while len(records) < max_records:
+                records.append(self.records.get_nowait())
+        except queue.Empty:
+            pass
+        return records
+
+
+class WriterPool:
+    """
+    Set of batch writers drained by a single background thread.
+    """
+
+    def __init__(self) -> None:
+        self._writers: Dict[WriterKey, BatchWriter] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="record-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        campaign_id: int,
+        user_id: int,
+        data_source_id: int,
+        timestamp: int,
+        value: bytes,
+        block: bool = True,
+    ) -> None:
+        """
+        Queue a record for writing.
+
+        If the writer's queue is full, the call either blocks, which
+        throttles producers when the database falls behind, or fails.
+
+        Args:
+            campaign_id: Campaign ID.
+            user_id: User ID.
+            data_source_id: Data source ID.
+            timestamp: Record timestamp in milliseconds.
+            value: Record value as bytes.
+            block: Whether to wait for room in a full queue.
+
+        Raises:
+            queue.Full: If the queue is full and `block` is False.
+        """
+        key = (campaign_id, user_id, data_source_id)
+        with self._lock:
+            writer = self._writers.get(key)
+            if writer is None:
+                writer = self._writers[key] = BatchWriter()
+            writer.last_submit_time = time.monotonic()
+        writer.records.put((timestamp, value), block=block)
+        if writer.records.qsize() >= settings.RECORD_BATCH_MAX_SIZE:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """
+        Write all queued records, sending the batches of all writers concurrently.
+
+        Failed batches are kept for a retry with exponential backoff, and
+        only dropped (and logged) after `settings.RECORD_WRITE_MAX_ATTEMPTS`
+        failed attempts.
+        """
+        with self._lock:
+            writers = list(self._writers.items())
+        now = time.monotonic()
+        pending = [
+            (key, writer, records)
+            for key, writer in writers
+            for records in writer.take_batches(now)
+        ]
+        if not pending:
+            return
+
+        try:
+            errors = db.store_data_record_batches(
+                [key + (records,) for key, _, records in pending]
+            )
+        except Exception as exc:  # e.g. no session; keep the writer alive
+            errors = [exc] * len(pending)
+
+        last_errors: Dict[WriterKey, Exception] = {}
+        for (key, writer, records), error in zip(pending, errors):
+            if error is not None:
+                writer.failed_batches.append(records)
+                last_errors[key] = error
+
+        for key, writer in {key: writer for key, writer, _ in pending}.items():
+            if not writer.failed_batches:
+                writer.failed_attempts = 0
+                continue
+            writer.failed_attempts += 1
+            num_records = sum(len(records) for records in writer.failed_batches)
+            if writer.failed_attempts >= settings.RECORD_WRITE_MAX_ATTEMPTS:
+                logger.error(
+                    "Dropping %d records of cmp%s_usr%s (ds %s) after %d attempts: %s",
+                    num_records,
+                    *key,
+                    writer.failed_attempts,
+                    last_errors[key],
+                )
+                writer.failed_batches = []
+                writer.failed_attempts = 0
+                continue
+            delay = min(
+                settings.RECORD_RETRY_INITIAL_DELAY_SECONDS
+                * 2 ** (writer.failed_attempts - 1),
+                settings.RECORD_RETRY_MAX_DELAY_SECONDS,
+            )
+            writer.retry_time = now + delay
+            logger.warning(
+                "Failed to write %d records of cmp%s_usr%s (ds %s), "
+                "retrying in %.1fs: %s",
+                num_records,
+                *key,
+                delay,
+                last_errors[key],
+            )
+
+    def _close_idle_writers(self) -> None:
+        """
+        Forget writers that have not received records for a while.
+        """
+        idle_since = time.monotonic() - settings.RECORD_WRITER_IDLE_SECONDS
+        with self._lock:
+            for key, writer in list(self._writers.items()):
+                if (
+                    writer.last_submit_time < idle_since
+                    and writer.records.empty()
+                    and not writer.failed_batches
+                ):
+                    del self._writers[key]
+
+    def _run(self) -> None:
+        """
+        Flush queued records periodically, or early when a queue fills up.
+        """
+        while True:
+            self._wakeup.wait(settings.RECORD_FLUSH_INTERVAL_MS / 1000)
+            self._wakeup.clear()
+            self.flush()
+            self._close_idle_writers()
+
+
+# Created lazily, so that each server process starts its own writer thread
+_writer_pool: Optional[WriterPool] = None
+_writer_pool_lock = threading.Lock()
+
+
+def get_writer_pool() -> WriterPool:
+    """
+    Get the process-wide writer pool, starting it on first use.
+
+    Returns:
+        Writer pool.
+    """
+    global _writer_pool
+
+    if _writer_pool is None:
+        with _writer_pool_lock:
+            if _writer_pool is None:
+                _writer_pool = WriterPool()
+    return _writer_pool
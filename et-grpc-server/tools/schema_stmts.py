@@ -0,0 +1,97 @@
+"""
+Database schema statements.
+
+Generated from assets/schema.cql by tools/gen_schema_stmts.py,
+do not edit by hand.
+"""
+from typing import List
+
+#: CQL statements of the database schema, in execution order
+STATEMENTS: List[str] = [
+    """create keyspace if not exists "et" with replication = {'class': 'SimpleStrategy', 'replication_factor': 2}""",
+    """create keyspace if not exists "data" with replication = {'class': 'SimpleStrategy', 'replication_factor': 2}""",
+    """create keyspace if not exists "stats" with replication = {'class': 'SimpleStrategy', 'replication_factor': 2}""",
+    """create table if not exists "et"."user"
+(
+    "id"         int,
+    "email"      text,
+    "name"       text,
+    "sessionKey" text,
+    "tag"        text,
+    primary key ("id", "email")
+)""",
+    """create table if not exists "et"."campaign"
+(
+    "id"             int,
+    "name"           text,
+    "notes"          text,
+    "configJson"     text,
+    "startTimestamp" bigint,
+    "endTimestamp"   bigint,
+    "creatorId"      int,
+    primary key ("creatorId", "id")
+)""",
+    """create table if not exists "et"."campaignResearchers"
+(
+    "campaignId"   int,
+    "researcherId" int,
+    primary key ("campaignId", "researcherId")
+)""",
+    """create table if not exists "et"."dataSource"
+(
+    "id"        int,
+    "name"      text,
+    "iconName"  text,
+    "creatorId" int,
+    primary key ("name", "id")
+)""",
+    """create table if not exists "stats"."campaignParticipantStats"
+(
+    "joinTimestamp"          bigint,
+    "lastHeartbeatTimestamp" bigint,
+    "campaignId"             int,
+    "userId"                 int,
+    primary key ("campaignId", "userId")
+)""",
+    """create table if not exists "stats"."perDataSourceStats"
+(
+    "amountOfSamples" int,
+    "syncTimestamp"   bigint,
+    "campaignId"      int,
+    "userId"          int,
+    "dataSourceId"    int,
+    primary key ("campaignId", "userId", "dataSourceId")
+)""",
+    """create table if not exists "et"."directMessage"
+(
+    "id"           int,
+    "timestamp"    bigint,
+    "subject"      text,
+    "content"      text,
+    "read"         boolean,
+    "sourceUserId" int,
+    "targetUserId" int,
+    primary key ("targetUserId", "sourceUserId", "id")
+)""",
+    """create table if not exists "et"."notification"
+(
+    "id"           int,
+    "timestamp"    bigint,
+    "subject"      text,
+    "content"      text,
+    "read"         boolean,
+    "campaignId"   int,
+    "targetUserId" int,
+    primary key ("campaignId", "targetUserId", "id")
+)""",
+    """create table if not exists "et"."idSequence"
+(
+    "tableName" text,
+    "nextId"    int,
+    primary key ("tableName")
+)""",
+    """create index if not exists "userByEmail" on "et"."user" ("email")""",
+    """create index if not exists "campaignById" on "et"."campaign" ("id")""",
+    """create index if not exists "campaignResearchersByResearcherId" on "et"."campaignResearchers" ("researcherId")""",
+    """create index if not exists "dataSourceById" on "et"."dataSource" ("id")""",
+]
@@ -6,7 +6,8 @@ and shared state for the EasyTrack gRPC server.
 """
 import os
 import tempfile
-from typing import Any, Optional, Set, List
+from collections import deque
+from typing import Any, Deque, List, Optional
 
 # ==============================================================================
 # Directory Settings
@@ -15,6 +16,15 @@ from typing import Any, Optional, Set, List
 #: Directory for temporary download files
 download_dir: str = os.path.join(tempfile.gettempdir(), "easytrack_grpc_server")
 
+#: Directory of the per data source CSV files (see `db_mgr.get_fd`)
+DATA_FILES_DIR: str = "/home/kobiljon/Desktop/easytrack/services/data"
+
+#: Maximum number of data files kept open for appending
+MAX_OPEN_DATA_FILES: int = 4096
+
+#: Size of the chunks a dump file is streamed in, in bytes
+DUMP_CHUNK_SIZE: int = 1 << 20
+
 #: Directory containing this settings file
 settings_dir: str = os.path.dirname(__file__)
 
@@ -34,18 +44,108 @@ cassandra_cluster: Optional[Any] = None
 #: Cassandra session object
 cassandra_session: Optional[Any] = None
 
+#: Cassandra session of counts and aggregations (see `db_mgr.get_analytics_session`)
+cassandra_analytics_session: Optional[Any] = None
+
+#: First delay between attempts to reach the database at start-up, in seconds
+DB_CONNECT_INITIAL_DELAY_SECONDS: float = 0.1
+
+#: Upper bound of the doubling delay between connection attempts, in seconds
+DB_CONNECT_MAX_DELAY_SECONDS: float = 5.0
+
+#: Number of driver threads running response callbacks and paging
+DB_EXECUTOR_THREADS: int = max(8, (os.cpu_count() or 1) * 2)
+
+#: Time after which a database request fails, in seconds
+DB_REQUEST_TIMEOUT_SECONDS: float = 5.0
+
+#: Time after which a count over a participant's data table fails, in seconds
+DB_COUNT_TIMEOUT_SECONDS: float = 60.0
+
+#: Number of rows fetched per page by paged queries
+DB_FETCH_SIZE: int = 500
+
+#: Maximum number of prepared statements kept (see `db_mgr.prepare`)
+MAX_PREPARED_STATEMENTS: int = 4096
+
+#: Maximum number of rows kept per in-process cache (see `tools.db_cache`)
+DB_CACHE_MAX_SIZE: int = 10000
+
+#: Time after which cached rows expire, in seconds
+DB_CACHE_TTL_SECONDS: float = 30.0
+
+#: Maximum number of parsed campaign configurations kept in memory
+CAMPAIGN_CONFIG_CACHE_SIZE: int = 1024
+
+#: Maximum number of verified session keys kept in memory
+AUTH_CACHE_MAX_SIZE: int = 50000
+
+#: Time after which a verified session key is checked against the DB again
+AUTH_CACHE_TTL_SECONDS: float = 300.0
+
+#: Maximum number of schema statements executed concurrently at bootstrap
+SCHEMA_CONCURRENCY: int = 16
+
+#: Maximum number of record batches of one request or writer flush written concurrently
+RECORD_BATCH_CONCURRENCY: int = 8
+
+#: Maximum number of notification inserts of one request in flight
+NOTIFICATION_CONCURRENCY: int = 100
+
+#: Interval between writes of buffered heartbeat timestamps, in seconds
+HEARTBEAT_FLUSH_INTERVAL_SECONDS: float = 0.2
+
+#: Maximum number of heartbeat updates per unlogged batch
+HEARTBEAT_BATCH_SIZE: int = 100
+
+#: Maximum number of heartbeat batches written concurrently
+HEARTBEAT_BATCH_CONCURRENCY: int = 16
+
+#: Maximum number of single data records written per batch
+RECORD_BATCH_MAX_SIZE: int = 256
+
+#: Longest time a single data record waits before being written, in milliseconds
+RECORD_FLUSH_INTERVAL_MS: int = 50
+
+#: Maximum number of queued records per (campaign, user, data source)
+RECORD_QUEUE_MAX_SIZE: int = 10000
+
+#: Time after which a record writer without new records is dropped, in seconds
+RECORD_WRITER_IDLE_SECONDS: float = 60.0
+
+#: Number of attempts to write a batch of single data records before it is dropped
+RECORD_WRITE_MAX_ATTEMPTS: int = 5
+
+#: Initial delay before a failed batch of single data records is retried, in seconds
+RECORD_RETRY_INITIAL_DELAY_SECONDS: float = 0.1
+
+#: Maximum delay between retries of a failed batch of single data records, in seconds
+RECORD_RETRY_MAX_DELAY_SECONDS: float = 5.0
+
 # ==============================================================================
 # Server Settings
 # ==============================================================================
 
+#: Suffix turning a username into the email address of its account
+USERNAME_EMAIL_SUFFIX: str = "@easytrack.com"
+
 #: Minimum length for username validation
 MIN_USERNAME_LENGTH: int = 4
 
 #: Minimum length for password validation
 MIN_PASSWORD_LENGTH: int = 4
 
-#: Maximum number of gRPC server worker threads
-MAX_GRPC_WORKERS: int = 1000
+#: Maximum number of gRPC server worker threads per process. The blocking
+#: handlers mostly wait on Cassandra, so a few threads per core keep the CPU
+#: busy; more threads only add context switches and stack memory.
+MAX_GRPC_WORKERS: int = int(
+    os.environ.get("GRPC_MAX_WORKERS", min(1000, (os.cpu_count() or 4) * 8))
+)
+
+#: Maximum number of RPCs in flight (running or queued for a worker thread);
+#: the asyncio ingestion handlers need no worker thread, hence not derived
+#: from `MAX_GRPC_WORKERS`
+MAX_CONCURRENT_RPCS: int = 4000
 
 #: Maximum message size for gRPC (2GB - 1 byte)
 MAX_MESSAGE_LENGTH: int = 2147483647
@@ -53,15 +153,41 @@ MAX_MESSAGE_LENGTH: int = 2147483647
 #: Maximum number of data records to retrieve in a single request
 MAX_K_RECORDS: int = 500
 
-#: gRPC keepalive time in milliseconds (15 minutes)
-GRPC_KEEPALIVE_TIME_MS: int = 900000
+#: Values larger than this many bytes are replaced by their size when simplified
+MAX_SIMPLIFIED_VALUE_SIZE: int = 500
+
+#: gRPC keepalive time in milliseconds (1 minute), after which an idle
+#: connection is pinged so that dead clients are detected; clients may ping
+#: as often as `GRPC_MIN_PING_INTERVAL_MS` without a too_many_pings GOAWAY
+GRPC_KEEPALIVE_TIME_MS: int = int(os.environ.get("GRPC_KEEPALIVE_TIME_MS", 60000))
 
-#: gRPC keepalive timeout in milliseconds (5 seconds)
-GRPC_KEEPALIVE_TIMEOUT_MS: int = 5000
+#: gRPC keepalive timeout in milliseconds (20 seconds)
+GRPC_KEEPALIVE_TIMEOUT_MS: int = 20000
 
 #: Minimum time between gRPC pings in milliseconds
 GRPC_MIN_PING_INTERVAL_MS: int = 5000
 
+#: Port the gRPC server listens on
+GRPC_SERVER_PORT: int = 50051
+
+#: Number of gRPC server processes sharing the port via SO_REUSEPORT
+GRPC_SERVER_PROCESSES: int = int(
+    os.environ.get("GRPC_SERVER_PROCESSES", os.cpu_count() or 1)
+)
+
+#: Time in-flight RPCs get to complete on SIGTERM, in seconds
+GRPC_SHUTDOWN_GRACE_SECONDS: float = 5.0
+
+#: Credentials expiring within this time are refreshed before use, in seconds
+OAUTH_REFRESH_MARGIN_SECONDS: float = 60.0
+
+#: Time before expiry at which credentials are refreshed in the background, in seconds
+OAUTH_BACKGROUND_REFRESH_SECONDS: float = 300.0
+
+#: Maximum number of emails sent per Gmail API batch request (50 per Gmail's
+#: guidelines, larger batches get rate limited)
+GMAIL_BATCH_SIZE: int = 50
+
 # ==============================================================================
 # Threading Settings
 # ==============================================================================
@@ -69,8 +195,9 @@ GRPC_MIN_PING_INTERVAL_MS: int = 5000
 #: Number of insert worker threads
 num_of_insert_threads: int = 5
 
-#: Job queues for each insert thread
-thr_jobs: List[Set[Any]] = [set() for _ in range(num_of_insert_threads)]
+#: Job queues for each insert thread; `append` and `popleft` are atomic, so
+#: producers and the consumer need no lock
+thr_jobs: List[Deque[Any]] = [deque() for _ in range(num_of_insert_threads)]
 
 # ==============================================================================
 # Legacy Database Connection (deprecated)
@@ -10,9 +10,12 @@ import hashlib
 import logging
 import os
 import pickle
+import re
+import threading
 import time
 from email.mime.text import MIMEText
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from google.auth.transport import requests as oauth_requests
 from google.auth.transport.requests import Request
@@ -27,23 +30,160 @@ from tools import settings
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+# Gmail credentials and API client, loaded once and reused by every email;
+# the client is not thread-safe, so it is only used under the lock
+_credentials: Optional[Any] = None
+_gmail_service: Optional[Any] = None
+_gmail_service_credentials: Optional[Any] = None
+_gmail_lock = threading.RLock()
+_credentials_refresher: Optional[threading.Thread] = None
+_credentials_refresher_stop: Optional[threading.Event] = None
+
+# Whether the download directory is known to exist
+_download_dir_ready = False
+_download_dir_lock = threading.Lock()
+
+# Placeholders of the email templates
+_TEMPLATE_MARKERS = re.compile("(campaign_html_element|table_rows)")
+
+# Email templates split on their placeholders, keyed by path, with the
+# modification time of the file they were read from
+_templates: Dict[str, Tuple[float, List[str]]] = {}
+_templates_lock = threading.Lock()
+
+# Table rows of the warning emails, filled in with `str.format_map`
+_PROBLEMATIC_USER_ROW = """<tr>
+                    <td class="id_column">{user_id}</td>
+                    <td class="name_column" title="{email}">{name}</td>
+                    <td class="duration_column">{day_no} days</td>
+                    <td class="amount_column">{amount_of_data} samples</td>
+                    <td class="heartbeat_column">{last_heartbeat_time}</td>
+                    <td class="sync_time_column">{last_sync_time}</td>
+                </tr>"""
+_MISSING_EMA_ROW = """<tr>
+                    <td>{user_id}</td>
+                    <td title="{email}">{name}</td>
+                    <td>{data_source_name}</td>
+                    <td>{amount_of_emas}</td>
+                    <td>≥{last_submission}</td>
+                </tr>"""
+
 
 def get_credentials() -> Any:
     """
     Get or refresh Google OAuth credentials.
 
-    Loads credentials from a pickle file if available, or initiates
-    an OAuth flow to obtain new credentials.
+    Credentials are kept in memory once loaded. They are only loaded from
+    the pickle file (or obtained through an OAuth flow) on first use, after
+    which a background thread refreshes them ahead of their expiry. They
+    are only refreshed here if that did not happen in time, i.e. when they
+    expire within `settings.OAUTH_REFRESH_MARGIN_SECONDS`.
 
     Returns:
         Google OAuth credentials object.
     """
-    credentials = None
-    if os.path.exists("token.pickle"):
+    global _credentials, _credentials_refresher, _credentials_refresher_stop
+
+    with _gmail_lock:
+        if _credentials is not None and not _expires_soon(_credentials):
+            return _credentials
+        _credentials = _load_credentials(_credentials)
+        if _credentials_refresher is None:
+            _credentials_refresher_stop = threading.Event()
+            _credentials_refresher = threading.Thread(
+                target=_credentials_refresh_routine,
+                args=(_credentials_refresher_stop,),
+                name="oauth-refresher",
+                daemon=True,
+            )
+            _credentials_refresher.start()
+        return _credentials
+
+
+def stop_credentials_refresher() -> None:
+    """
+    Stop the background refresh of the credentials, if it was started.
+    """
+    global _credentials_refresher, _credentials_refresher_stop
+
+    with _gmail_lock:
+        refresher, _credentials_refresher = _credentials_refresher, None
+        stop, _credentials_refresher_stop = _credentials_refresher_stop, None
+    if refresher is not None:
+        stop.set()
+        refresher.join()
+
+
+def _credentials_refresh_routine(stop: threading.Event) -> None:
+    """
+    Refresh the in-memory credentials
+    `settings.OAUTH_BACKGROUND_REFRESH_SECONDS` before they expire, so that
+    sending an email never waits for the token endpoint.
+
+    Args:
+        stop: Event ending the routine once set.
+    """
+    while not stop.is_set():
+        with _gmail_lock:
+            expiry = _credentials.expiry
+            refresh_token = _credentials.refresh_token
+        if expiry is None:
+            # credentials without expiry never need a refresh
+            return
+        if not refresh_token:
+            # nothing to refresh with; the next email obtains new credentials,
+            # which are picked up here after a while
+            stop.wait(settings.OAUTH_BACKGROUND_REFRESH_SECONDS)
+            continue
+        remaining = (expiry - datetime.datetime.utcnow()).total_seconds()
+        if stop.wait(max(0.0, remaining - settings.OAUTH_BACKGROUND_REFRESH_SECONDS)):
+            return
+
+        try:
+            with _gmail_lock:
+                if _credentials.refresh_token:
+                    _credentials.refresh(Request())
+                    _save_credentials(_credentials)
+        except Exception as exc:  # keep the refresher alive
+            logger.error("Failed to refresh Google OAuth credentials: %s", exc)
+            stop.wait(settings.OAUTH_REFRESH_MARGIN_SECONDS)
+
+
+def _expires_soon(credentials: Any) -> bool:
+    """
+    Check whether credentials are invalid or about to expire.
+
+    Args:
+        credentials: Google OAuth credentials object.
+
+    Returns:
+        True if the credentials should be refreshed, False otherwise.
+    """
+    if not credentials.valid:
+        return True
+    if credentials.expiry is None:
+        return False
+    # google-auth keeps expiry as a naive UTC datetime
+    remaining = credentials.expiry - datetime.datetime.utcnow()
+    return remaining.total_seconds() < settings.OAUTH_REFRESH_MARGIN_SECONDS
+
+
+def _load_credentials(credentials: Optional[Any]) -> Any:
+    """
+    Load, refresh or obtain Google OAuth credentials.
+
+    Args:
+        credentials: Credentials held in memory, or None to load them from
+            the pickle file.
+
+    Returns:
+        Valid Google OAuth credentials object.
+    """
+    if credentials is None and os.path.exists("token.pickle"):
         with open("token.pickle", "rb") as token:
             credentials = pickle.load(token)
-    if not credentials or not credentials.valid:
-        if credentials and credentials.expired and credentials.refresh_token:
+    if not credentials or _expires_soon(credentials):
+        if credentials and credentials.refresh_token:
             credentials.refresh(Request())
         else:
             flow = InstalledAppFlow.from_client_secrets_file(
@@ -51,11 +191,28 @@ def get_credentials() -> Any:
                 ["https://www.googleapis.com/auth/gmail.send"],
             )
             credentials = flow.run_local_server(port=0)
-        with open("token.pickle", "wb") as token:
-            pickle.dump(credentials, token)
+        _save_credentials(credentials)
     return credentials
 
 
+def _save_credentials(credentials: Any) -> None:
+    """
+    Store credentials in the pickle file, for the next process start.
+
+    The file is written next to the previous one and swapped in once
+    complete, so a crash mid-write cannot leave a truncated file behind
+    (which would force a new interactive OAuth flow).
+
+    Args:
+        credentials: Google OAuth credentials object.
+    """
+    with open("token.pickle.tmp", "wb") as token:
+        pickle.dump(credentials, token, protocol=pickle.HIGHEST_PROTOCOL)
+        token.flush()
+        os.fsync(token.fileno())
+    os.replace("token.pickle.tmp", "token.pickle")
+
+
 def get_timestamp_ms() -> int:
     """
     Get the current timestamp in milliseconds.
@@ -63,7 +220,7 @@ def get_timestamp_ms() -> int:
     Returns:
         Current Unix timestamp in milliseconds.
     """
-    return int(round(time.time() * 1000))
+    return time.time_ns() // 1_000_000
 
 
 def send_email(user_id: str, message: Dict[str, Any]) -> None:
@@ -76,18 +233,76 @@ def send_email(user_id: str, message: Dict[str, Any]) -> None:
         message: Message dictionary containing the email data.
     """
     try:
-        service = build(
-            serviceName="gmail", version="v1", credentials=get_credentials()
-        )
-        sent_message = (
-            service.users().messages().send(userId=user_id, body=message).execute()
-        )
+        with _gmail_lock:
+            sent_message = (
+                _get_gmail_service()
+                .users()
+                .messages()
+                .send(userId=user_id, body=message)
+                .execute()
+            )
         logger.info("Message Id: %s", sent_message["id"])
-        service.close()
     except errors.HttpError as error:
         logger.error("An error occurred while sending email: %s", error)
 
 
+def send_emails_batch(user_id: str, messages: List[Dict[str, Any]]) -> None:
+    """
+    Send several email messages via Gmail API, with one HTTP batch request
+    per `settings.GMAIL_BATCH_SIZE` messages.
+
+    Args:
+        user_id: User's email address. The special value "me"
+            can be used to indicate the authenticated user.
+        messages: Message dictionaries, as returned by `create_message`.
+    """
+
+    def _log_sent_message(
+        request_id: str, sent_message: Any, error: Optional[Exception]
+    ) -> None:
+        """Log the outcome of one message of a batch."""
+        if error is not None:
+            logger.error("An error occurred while sending email: %s", error)
+        else:
+            logger.info("Message Id: %s", sent_message["id"])
+
+    try:
+        with _gmail_lock:
+            service = _get_gmail_service()
+            for start in range(0, len(messages), settings.GMAIL_BATCH_SIZE):
+                batch = service.new_batch_http_request(callback=_log_sent_message)
+                for message in messages[start : start + settings.GMAIL_BATCH_SIZE]:
+                    batch.add(
+                        service.users().messages().send(userId=user_id, body=message)
+                    )
+                batch.execute()
+    except errors.HttpError as error:
+        logger.error("An error occurred while sending emails: %s", error)
+
+
+def _get_gmail_service() -> Any:
+    """
+    Get the Gmail API client, building it again only when the credentials
+    object is replaced (refreshing updates the credentials in place).
+
+    Must be called with `_gmail_lock` held.
+
+    Returns:
+        Gmail API service object.
+    """
+    global _gmail_service, _gmail_service_credentials
+
+    credentials = get_credentials()
+    if _gmail_service is None or _gmail_service_credentials is not credentials:
+        if _gmail_service is not None:
+            _gmail_service.close()
+        _gmail_service = build(
+            serviceName="gmail", version="v1", credentials=credentials
+        )
+        _gmail_service_credentials = credentials
+    return _gmail_service
+
+
 def create_message(
     sender: str, to: str, subject: str, message_text: str
 ) -> Dict[str, str]:
@@ -114,6 +329,115 @@ def create_message(
     }
 
 
+def create_messages(
+    sender: str, to_addresses: List[str], subject: str, message_text: str
+) -> List[Dict[str, str]]:
+    """
+    Create one message per receiver for an email with the same content.
+
+    The MIME message is serialized once; only the `To` header differs
+    between the messages.
+
+    Args:
+        sender: Email address of the sender.
+        to_addresses: Email addresses of the receivers.
+        subject: The subject of the email message.
+        message_text: The text of the email message (HTML supported).
+
+    Returns:
+        A list of dictionaries containing base64url encoded email objects,
+        in the order of `to_addresses`.
+    """
+    message = MIMEText(message_text, "html")
+    message["from"] = sender
+    message["subject"] = subject
+    message_bytes = message.as_string().encode(encoding="utf8")
+    return [
+        {
+            "raw": base64.urlsafe_b64encode(
+                f"to: {to}\n".encode(encoding="utf8") + message_bytes
+            ).decode(encoding="utf8")
+        }
+        for to in to_addresses
+    ]
+
+
+def _timestamp_to_readable_string(timestamp_ms: int) -> str:
+    """
+    Convert a timestamp to a human-readable format, e.g. "12/25 (Mon), 03:30 PM".
+
+    Args:
+        timestamp_ms: Timestamp in milliseconds, or 0 if unknown.
+
+    Returns:
+        Formatted local time, or "N/A".
+    """
+    if timestamp_ms == 0:
+        return "N/A"
+    # the format has minute resolution, so timestamps are formatted per minute
+    return _minute_to_readable_string(timestamp_ms // 60_000)
+
+
+@lru_cache(maxsize=2048)
+def _minute_to_readable_string(minute: int) -> str:
+    """
+    Format a minute since the epoch (see `_timestamp_to_readable_string`).
+
+    Args:
+        minute: Minutes since the epoch.
+
+    Returns:
+        Formatted local time.
+    """
+    return datetime.datetime.fromtimestamp(minute * 60).strftime(
+        "%m/%d (%a), %I:%M %p"
+    )
+
+
+def _campaign_html_element(db_campaign: Any) -> str:
+    """
+    Create the campaign header of a warning email.
+
+    Args:
+        db_campaign: Campaign database object.
+
+    Returns:
+        HTML element linking to the campaign's dashboard page.
+    """
+    return f'<h3>Campaign : <a href="http://etdb.myvnc.com/campaign/?id={db_campaign["id"]}" style="text-decoration: none;">{db_campaign["name"]}</a></h3>'
+
+
+def _render_email_template(path: str, **values: str) -> str:
+    """
+    Fill in the placeholders of an email template.
+
+    Templates are read once and split on their placeholders, so rendering
+    is a single join. A template is read again when its file changes.
+
+    Args:
+        path: Path of the HTML template.
+        **values: Text of each placeholder (`campaign_html_element`,
+            `table_rows`).
+
+    Returns:
+        Rendered HTML.
+    """
+    modified_time = os.stat(path).st_mtime
+    with _templates_lock:
+        cached = _templates.get(path)
+        if cached is None or cached[0] != modified_time:
+            with open(path, "r") as template_file:
+                cached = (
+                    modified_time,
+                    _TEMPLATE_MARKERS.split(template_file.read()),
+                )
+            _templates[path] = cached
+    # placeholders are at the odd indices of the split template
+    return "".join(
+        values[part] if index % 2 else part for index, part in enumerate(cached[1])
+    )
+
+
 def get_problematic_users_email_message(
     destination_email_addresses: List[str],
     db_campaign: Any,
@@ -128,91 +452,62 @@ def get_problematic_users_email_message(
         db_participants: List of participant database objects.
 
     Returns:
-        List of email message dictionaries ready to be sent.
-    """
-
-    def _create_warning_row(
-        user_id: int,
-        email: str,
-        name: str,
-        day_no: int,
-        amount_of_data: str,
-        last_heartbeat_time: str,
-        last_sync_time: str,
-    ) -> str:
-        """Create an HTML table row for a problematic user."""
-        return f"""<tr>
-                    <td class="id_column">{user_id}</td>
-                    <td class="name_column" title="{email}">{name}</td>
-                    <td class="duration_column">{day_no} days</td>
-                    <td class="amount_column">{amount_of_data} samples</td>
-                    <td class="heartbeat_column">{last_heartbeat_time}</td>
-                    <td class="sync_time_column">{last_sync_time}</td>
-                </tr>"""
+        List of email message dictionaries ready to be sent, empty if there
+        is no participant to report or no one to report to.
+    """
+    if not destination_email_addresses or not db_participants:
+        return []
 
-    def _calculate_day_number(join_timestamp: int) -> int:
+    def _calculate_day_number(join_timestamp: int, today: datetime.date) -> int:
         """Calculate the number of days since joining."""
-        then = datetime.datetime.fromtimestamp(float(join_timestamp) / 1000).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        then += datetime.timedelta(days=1)
-
-        now = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        now += datetime.timedelta(days=1)
+        return (today - datetime.date.fromtimestamp(join_timestamp // 1000)).days
 
-        return (now - then).days
+    # the current date is read once for all participants
+    today = datetime.date.today()
 
-    def _timestamp_to_readable_string(timestamp_ms: int) -> str:
-        """Convert timestamp to human-readable format."""
-        if timestamp_ms == 0:
-            return "N/A"
-        return datetime.datetime.fromtimestamp(float(timestamp_ms) / 1000).strftime(
-            "%m/%d (%a), %I:%M %p"
-        )
+    # Stats of all participants, read at once
+    summaries = db.get_participants_summaries(
+        db_campaign=db_campaign,
+        user_ids=[db_user["id"] for db_user in db_participants],
+    )
+    no_summary = db.ParticipantSummary(0, 0, 0, 0)
+    participant_summaries = [
+        summaries.get(db_user["id"], no_summary) for db_user in db_participants
+    ]
 
-    rows = []
-    for db_user in db_participants:
-        rows.append(
-            _create_warning_row(
-                user_id=db_user["id"],
-                email=db_user["email"],
-                name=db_user["name"],
-                day_no=_calculate_day_number(
-                    join_timestamp=db.get_participant_join_timestamp(
-                        db_user=db_user, db_campaign=db_campaign
-                    )
+    rows = [
+        _PROBLEMATIC_USER_ROW.format_map(
+            {
+                "user_id": db_user["id"],
+                "email": db_user["email"],
+                "name": db_user["name"],
+                "day_no": _calculate_day_number(
+                    join_timestamp=summary.join_timestamp, today=today
                 ),
-                amount_of_data=f"{db.get_participants_amount_of_data(db_user=db_user, db_campaign=db_campaign):,} samples",
-                last_heartbeat_time=_timestamp_to_readable_string(
-                    timestamp_ms=db.get_participant_heartbeat_timestamp(
-                        db_user=db_user, db_campaign=db_campaign
-                    )
+                "amount_of_data": f"{summary.amount_of_data:,} samples",
+                "last_heartbeat_time": _timestamp_to_readable_string(
+                    timestamp_ms=summary.last_heartbeat_timestamp
                 ),
-                last_sync_time=_timestamp_to_readable_string(
-                    timestamp_ms=db.get_participant_last_sync_timestamp(
-                        db_user=db_user, db_campaign=db_campaign
-                    )
+                "last_sync_time": _timestamp_to_readable_string(
+                    timestamp_ms=summary.last_sync_timestamp
                 ),
-            )
+            }
         )
+        for db_user, summary in zip(db_participants, participant_summaries)
+    ]
 
-    with open("static/problematic_users_email_template.html", "r") as template_file:
-        template_content = template_file.read()
-        message_text = template_content.replace(
-            "campaign_html_element",
-            f'<h3>Campaign : <a href="http://etdb.myvnc.com/campaign/?id={db_campaign["id"]}" style="text-decoration: none;">{db_campaign["name"]}</a></h3>',
-        )
-        message_text = message_text.replace("table_rows", ",".join(rows))
+    message_text = _render_email_template(
+        "static/problematic_users_email_template.html",
+        campaign_html_element=_campaign_html_element(db_campaign),
+        table_rows=",".join(rows),
+    )
 
-    return [
-        create_message(
-            sender="easytracknoreply@gmail.com",
-            to=to,
-            subject="[ET warning] problematic participants detected",
-            message_text=message_text,
-        )
-        for to in destination_email_addresses
-    ]
+    return create_messages(
+        sender="easytracknoreply@gmail.com",
+        to_addresses=destination_email_addresses,
+        subject="[ET warning] problematic participants detected",
+        message_text=message_text,
+    )
 
 
 def get_missing_ema_email_messages(
@@ -229,69 +524,53 @@ def get_missing_ema_email_messages(
         warn_users: List of tuples (db_user, db_data_source, amount_of_data, last_submission).
 
     Returns:
-        List of email message dictionaries ready to be sent.
-    """
-
-    def _create_warning_row(
-        user_id: int,
-        email: str,
-        name: str,
-        data_source_name: str,
-        amount_of_emas: int,
-        last_submission: str,
-    ) -> str:
-        """Create an HTML table row for a missing EMA warning."""
-        return f"""<tr>
-                    <td>{user_id}</td>
-                    <td title="{email}">{name}</td>
-                    <td>{data_source_name}</td>
-                    <td>{amount_of_emas}</td>
-                    <td>≥{last_submission}</td>
-                </tr>"""
-
-    rows = []
-    for db_user, db_data_source, amount_of_data, last_submission in warn_users:
-        rows.append(
-            _create_warning_row(
-                user_id=db_user["id"],
-                email=db_user["email"],
-                name=db_user["name"],
-                data_source_name=db_data_source["name"],
-                amount_of_emas=amount_of_data,
-                last_submission=last_submission,
-            )
+        List of email message dictionaries ready to be sent, empty if there
+        is no user to warn about or no one to warn.
+    """
+    if not destination_email_addresses or not warn_users:
+        return []
+
+    rows = [
+        _MISSING_EMA_ROW.format_map(
+            {
+                "user_id": db_user["id"],
+                "email": db_user["email"],
+                "name": db_user["name"],
+                "data_source_name": db_data_source["name"],
+                "amount_of_emas": amount_of_data,
+                "last_submission": last_submission,
+            }
         )
+        for db_user, db_data_source, amount_of_data, last_submission in warn_users
+    ]
 
-    with open("static/missing_ema_email_template.html", "r") as template_file:
-        template_content = template_file.read()
-        message_text = template_content.replace(
-            "campaign_html_element",
-            f'<h3>Campaign : <a href="http://etdb.myvnc.com/campaign/?id={db_campaign["id"]}" style="text-decoration: none;">{db_campaign["name"]}</a></h3>',
-        )
-        message_text = message_text.replace("table_rows", "\n".join(rows))
+    message_text = _render_email_template(
+        "static/missing_ema_email_template.html",
+        campaign_html_element=_campaign_html_element(db_campaign),
+        table_rows="\n".join(rows),
+    )
 
-    return [
-        create_message(
-            sender="easytracknoreply@gmail.com",
-            to=to,
-            subject="[ET warning] EMA submission issue(s) detected",
-            message_text=message_text,
-        )
-        for to in destination_email_addresses
-    ]
+    return create_messages(
+        sender="easytracknoreply@gmail.com",
+        to_addresses=destination_email_addresses,
+        subject="[ET warning] EMA submission issue(s) detected",
+        message_text=message_text,
+    )
 
 
-def validate(array: List[Any]) -> bool:
+def validate(array: Iterable[Any]) -> bool:
     """
     Check if all elements in the array are not None.
 
+    Elements are compared by identity, so their `__eq__` is never called.
+
     Args:
-        array: List of values to validate.
+        array: Values to validate.
 
     Returns:
         True if no element is None, False otherwise.
     """
-    return None not in array
+    return not any(value is None for value in array)
 
 
 def load_google_profile(id_token: str) -> Optional[Dict[str, str]]:
@@ -338,7 +617,7 @@ def get_download_file_path(file_name: str) -> str:
     """
     Get the full path for a download file.
 
-    Creates the download directory if it doesn't exist and sets
+    Creates the download directory on first use and an empty file with
     appropriate permissions.
 
     Args:
@@ -347,14 +626,22 @@ def get_download_file_path(file_name: str) -> str:
     Returns:
         Full path to the download file.
     """
-    if not os.path.exists(settings.download_dir):
-        os.mkdir(settings.download_dir)
-        os.chmod(settings.download_dir, 0o777)
+    global _download_dir_ready
+
+    if not _download_dir_ready:
+        with _download_dir_lock:
+            if not os.path.exists(settings.download_dir):
+                os.mkdir(settings.download_dir)
+                os.chmod(settings.download_dir, 0o777)
+            _download_dir_ready = True
 
     file_path = os.path.join(settings.download_dir, file_name)
-    with open(file_path, "w+") as fp:
-        pass  # Just create the file
-    os.chmod(file_path, 0o777)
+    fd = os.open(file_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o777)
+    try:
+        # the mode given to open() is narrowed by the umask
+        os.fchmod(fd, 0o777)
+    finally:
+        os.close(fd)
 
     return file_path
 
@@ -366,7 +653,7 @@ def now_us() -> int:
     Returns:
         Current Unix timestamp in microseconds.
     """
-    return int(time.time() * 1000 * 1000)
+    return time.time_ns() // 1000
 
 
 def md5(value: str) -> str:
@@ -380,3 +667,21 @@ def md5(value: str) -> str:
         Hexadecimal MD5 hash string.
     """
     return hashlib.md5(value.encode()).hexdigest()
+
+
+def new_session_key(email: str) -> str:
+    """
+    Generate a session key for a user.
+
+    The key is a 128-bit BLAKE2b digest of the email address and the current
+    time, as long as the MD5 based keys issued before.
+
+    Args:
+        email: User's email address.
+
+    Returns:
+        Hexadecimal session key.
+    """
+    hasher = hashlib.blake2b(email.encode(), digest_size=16)
+    hasher.update(time.time_ns().to_bytes(8, "little"))
+    return hasher.hexdigest()
@@ -1,34 +1,76 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
+import threading
+from itertools import chain
 
 from cassandra import ConsistencyLevel
 from cassandra.auth import PlainTextAuthProvider
 from cassandra.cluster import (EXEC_PROFILE_DEFAULT, Cluster, ExecutionProfile,
-                               Session)
-from cassandra.policies import RoundRobinPolicy
-from cassandra.query import BatchStatement
+                               ResponseFuture, Session)
+from cassandra.policies import DCAwareRoundRobinPolicy, TokenAwarePolicy
+from cassandra.query import BatchStatement, BatchType, PreparedStatement
+
+logger = logging.getLogger(__name__)
 
 cassandra_contact_points: [str] = []
+# directory of the values too large to be stored in Cassandra, if any
+blob_storage_dir: str | None = None
+
+# number of writes (rows or batches) of an upload in flight at once
+MAX_WRITES_IN_FLIGHT = 128
+# small rows of an upload are grouped into batches of about this many bytes
+# of values; larger rows are written on their own
+MAX_BATCH_BYTES = 5 * 1024
+# values of at least this many bytes are stored as files in blob_storage_dir,
+# when set, and only their path is stored in Cassandra
+MAX_INLINE_VALUE_BYTES = 100 * 1024
+
+# session shared by the requests of a process, created on first use; a forked
+# worker process does not inherit the driver's threads, so it makes its own
+_session: Session | None = None
+_session_pid: int | None = None
+_session_lock = threading.Lock()
+
+# insert statements of values and of value paths, prepared once per session
+# (see _get_insert_stmts)
+_insert_stmts: tuple[PreparedStatement, PreparedStatement] | None = None
+_insert_stmts_session: Session | None = None
+_insert_stmts_lock = threading.Lock()
 
 
 def parse_envs():
     # cassandra contact points
-    global cassandra_contact_points
-    tmp = os.environ["CASSANDRA_IP_ADDRESSES"].split(",")
-    i = 0
-    while i < len(tmp):
-        tmp[i] = tmp[i].strip()
-        if not tmp[i]:
-            del tmp[i]
-        else:
-            i += 1
-    cassandra_contact_points.clear()
-    cassandra_contact_points.extend(tmp)
-    print(f"Cassandra contact points: {tmp}")
+    global cassandra_contact_points, blob_storage_dir
+    cassandra_contact_points = [
+        address
+        for address in (
+            address.strip()
+            for address in os.environ["CASSANDRA_IP_ADDRESSES"].split(",")
+        )
+        if address
+    ]
+    logger.info("Cassandra contact points: %s", cassandra_contact_points)
+
+    # blob storage directory (optional, all values are stored in Cassandra
+    # otherwise)
+    blob_storage_dir = os.environ.get("BLOB_STORAGE_DIR") or None
 
 
 def get_cassandra_session() -> Session:
+    global _session, _session_pid
+
+    if _session is None or _session_pid != os.getpid():
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                _session = _connect()
+                _session_pid = os.getpid()
+    return _session
+
+
+def _connect() -> Session:
     # prepare ssl context
     # ssl_context = ssl.create_default_context()
     # ssl_context.check_hostname = False
@@ -37,8 +79,10 @@ def get_cassandra_session() -> Session:
     # execution profile (fast writes, ignore read)
     execution_profile = ExecutionProfile(
         request_timeout=600,  # seconds
-        consistency_level=ConsistencyLevel.ONE,  # write consistency level: only 1 node needs to acknowledge
-        load_balancing_policy=RoundRobinPolicy(),
+        consistency_level=ConsistencyLevel.LOCAL_ONE,  # write consistency level: only 1 node of the local DC needs to acknowledge
+        # prepared inserts carry their routing key, so each one goes straight
+        # to a replica of the user's partition
+        load_balancing_policy=TokenAwarePolicy(DCAwareRoundRobinPolicy()),
     )
 
     # initialize a connection to cassandra cluster
@@ -46,6 +90,7 @@ def get_cassandra_session() -> Session:
         contact_points=cassandra_contact_points,
         executor_threads=4,  # number of threads to handle requests
         connect_timeout=10,  # seconds
+        compression=True,  # lz4 (see requirements.txt), negotiated with the nodes
         # ssl_context=ssl_context,
         execution_profiles={EXEC_PROFILE_DEFAULT: execution_profile},
         auth_provider=PlainTextAuthProvider(
@@ -57,16 +102,124 @@ def get_cassandra_session() -> Session:
     return cluster.connect()
 
 
-def save_data_cassandra(
+async def save_data_cassandra(
     cassandra_session: Session,
     user_id: int,
     timestamps_arr: [int],
     values_arr: [bytes],
 ):
-    insert_stmt = cassandra_session.prepare(
-        f"INSERT INTO et.data (user_id, timestamp, value) VALUES (?, ?, ?)"
+    # statements are prepared and large values stored in a worker thread, as
+    # both block
+    statements = await asyncio.to_thread(
+        _write_statements, cassandra_session, user_id, timestamps_arr, values_arr
     )
-    batch_stmt = BatchStatement(consistency_level=ConsistencyLevel.ONE)
+
+    # rows are written one statement or batch each, several of them in flight
+    # at once; the event loop is free while they are
+    in_flight: set[asyncio.Future] = set()
+    for statement, params in statements:
+        if len(in_flight) >= MAX_WRITES_IN_FLIGHT:
+            done, in_flight = await asyncio.wait(
+                in_flight, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                future.result()
+        response_future = cassandra_session.execute_async(statement, params)
+        in_flight.add(_wrap_future(response_future))
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Saved %d data points of user %d", len(values_arr), user_id)
+
+
+def _write_statements(
+    cassandra_session: Session,
+    user_id: int,
+    timestamps_arr: [int],
+    values_arr: [bytes],
+):
+    insert_stmt, insert_path_stmt = _get_insert_stmts(cassandra_session)
+
+    # large values are stored as files, and only their paths in Cassandra
+    path_rows, inline_rows = [], []
     for timestamp, value in zip(timestamps_arr, values_arr):
+        if blob_storage_dir is not None and len(value) >= MAX_INLINE_VALUE_BYTES:
+            path = _store_blob(user_id, timestamp, value)
+            path_rows.append((insert_path_stmt, (user_id, timestamp, path)))
+        else:
+            inline_rows.append((timestamp, value))
+    return chain(path_rows, _group_rows(insert_stmt, user_id, inline_rows))
+
+
+def _wrap_future(response_future: ResponseFuture) -> asyncio.Future:
+    # the driver completes its futures on its own threads
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def set_result(rows):
+        if not future.done():
+            future.set_result(rows)
+
+    def set_exception(exc: BaseException):
+        if not future.done():
+            future.set_exception(exc)
+
+    response_future.add_callbacks(
+        callback=lambda rows: loop.call_soon_threadsafe(set_result, rows),
+        errback=lambda exc: loop.call_soon_threadsafe(set_exception, exc),
+    )
+    return future
+
+
+def _get_insert_stmts(
+    cassandra_session: Session,
+) -> tuple[PreparedStatement, PreparedStatement]:
+    global _insert_stmts, _insert_stmts_session
+
+    # prepared statements belong to the session's cluster, so a new session
+    # prepares the statements again
+    if _insert_stmts_session is not cassandra_session:
+        with _insert_stmts_lock:
+            if _insert_stmts_session is not cassandra_session:
+                _insert_stmts = (
+                    cassandra_session.prepare(
+                        "INSERT INTO et.data (user_id, timestamp, value) VALUES (?, ?, ?)"
+                    ),
+                    cassandra_session.prepare(
+                        "INSERT INTO et.data (user_id, timestamp, value_path) VALUES (?, ?, ?)"
+                    ),
+                )
+                _insert_stmts_session = cassandra_session
+    return _insert_stmts
+
+
+def _store_blob(user_id: int, timestamp: int, value: bytes) -> str:
+    user_dir = os.path.join(blob_storage_dir, str(user_id))
+    os.makedirs(user_dir, exist_ok=True)
+    path = os.path.join(user_dir, str(timestamp))
+    with open(path, "wb") as f:
+        f.write(value)
+    return path
+
+
+def _group_rows(
+    insert_stmt: PreparedStatement,
+    user_id: int,
+    rows: [tuple[int, bytes]],
+):
+    # all rows of an upload share the user_id partition, so small rows are
+    # grouped into unlogged batches that stay on a single replica set
+    batch_stmt, batch_bytes = None, 0
+    for timestamp, value in rows:
+        if len(value) >= MAX_BATCH_BYTES:
+            yield insert_stmt, (user_id, timestamp, value)
+            continue
+        if batch_stmt is not None and batch_bytes + len(value) > MAX_BATCH_BYTES:
+            yield batch_stmt, ()
+            batch_stmt, batch_bytes = None, 0
+        if batch_stmt is None:
+            batch_stmt = BatchStatement(batch_type=BatchType.UNLOGGED)
         batch_stmt.add(insert_stmt, (user_id, timestamp, value))
-    cassandra_session.execute(batch_stmt)
+        batch_bytes += len(value)
+    if batch_stmt is not None:
+        yield batch_stmt, ()